@@ -5,6 +5,8 @@ EchoBird プロジェクトの定数定義
 カテゴリ別に整理して定義しています。
 """
 
+import os
+
 # ==========================================
 # データベース関連定数
 # ==========================================
@@ -75,6 +77,121 @@ DEFAULT_IS_VERIFIED = False
 DEFAULT_IS_PROTECTED = False
 
 
+# ==========================================
+# キャッシュ関連定数
+# ==========================================
+
+# ユーザー別の既読・ブックマーク済みツイート ID キャッシュの最大メモリ量（バイト）
+TWEET_STATE_CACHE_MAX_BYTES = (
+    64 * 1024 * 1024
+)  # 64MB（ツイート ID 1 件あたり 8 バイト）
+
+# 既読位置キャッシュに保持する最大ユーザー数（超えた分は最も長く参照されていないものから破棄）
+READ_WATERMARK_CACHE_MAX_USERS = 10_000
+
+# 未読数キャッシュに保持する最大エントリ数（ユーザー・ターゲットアカウントの組ごとに 1 件）
+UNREAD_COUNT_CACHE_MAX_ENTRIES = 200_000
+
+
+# ==========================================
+# 既読状態関連定数
+# ==========================================
+
+# 既読の個別行を既読位置（ウォーターマーク）に畳み込むジョブの実行間隔（時間）
+READ_COMPACTION_INTERVAL_HOURS = 6
+
+# 畳み込み時に、この日数より古い未読ツイートを既読扱いにして既読位置を進める（任意の有効期限）
+# 0 の場合は無効で、既読位置は既読行が途切れなく続く範囲（最古の未読ツイートの直前）までしか進まない
+READ_WATERMARK_HORIZON_DAYS = 0
+
+
+# ==========================================
+# タイムライン関連定数
+# ==========================================
+
+# タイムライン内ツイート取得 API でマテリアライズドフィードを読み出すかどうか
+# フィードの書き込み・埋め戻しはこの設定に関係なく常に行う（切り替え時の再構築を不要にするため）
+TIMELINE_FEED_ENABLED = os.getenv('TIMELINE_FEED_ENABLED', 'false').lower() == 'true'
+
+
+# ==========================================
+# ランキング関連定数
+# ==========================================
+
+# エンゲージメントスコアの各カウンターの重み
+ENGAGEMENT_WEIGHT_LIKES = 1.0
+ENGAGEMENT_WEIGHT_RETWEETS = 2.0
+ENGAGEMENT_WEIGHT_REPLIES = 1.5
+ENGAGEMENT_WEIGHT_QUOTES = 2.5
+ENGAGEMENT_WEIGHT_VIEWS = 0.01
+
+# 新しさによる減衰: この秒数新しいツイートは、10 倍のエンゲージメントを持つ古いツイートと同スコア
+ENGAGEMENT_SCORE_DECAY_SECONDS = 45000
+
+# sort=top の既定の集計期間（時間）と最大値
+TOP_WINDOW_HOURS_DEFAULT = 24
+TOP_WINDOW_HOURS_MAX = 24 * 30
+
+
+# ==========================================
+# アカウント統計関連定数
+# ==========================================
+
+# 日別の活動集計で日付の区切りに使うタイムゾーン
+ACCOUNT_STATS_TIMEZONE = 'Asia/Tokyo'
+
+# 統計 API で取得する期間（日数）の既定値と最大値
+ACCOUNT_STATS_DAYS_DEFAULT = 30
+ACCOUNT_STATS_DAYS_MAX = 366
+
+
+# ==========================================
+# トレンド関連定数
+# ==========================================
+
+# ハッシュタグの出現数カウンターを集計する時間バケットの幅（秒）
+HASHTAG_BUCKET_SECONDS = 3600
+
+# トレンド API の集計期間の既定値と最大値（時間）
+TREND_WINDOW_DEFAULT = '24h'
+TREND_WINDOW_MAX_HOURS = 24 * 7
+
+# トレンド API で返すハッシュタグ数の既定値と最大値
+TREND_LIMIT_DEFAULT = 10
+TREND_LIMIT_MAX = 50
+
+# 集計期間の最大値より古いカウンターを削除するジョブの実行間隔（時間）
+HASHTAG_COUNT_PRUNE_INTERVAL_HOURS = 24
+
+
+# ==========================================
+# パーティション関連定数
+# ==========================================
+
+# tweets の月別パーティションを当月から何か月先まで作成しておくか
+TWEET_PARTITION_MONTHS_AHEAD = 3
+
+# 先の月のパーティションを作成するジョブの実行間隔（時間）
+TWEET_PARTITION_CHECK_INTERVAL_HOURS = 24
+
+
+# ==========================================
+# 保持期間・アーカイブ関連定数
+# ==========================================
+
+# ツイートを DB に保持する日数の既定値（0 以下は無期限、環境変数 TWEET_RETENTION_DAYS で変更）
+TWEET_RETENTION_DAYS_DEFAULT = 0
+
+# 保持期間を過ぎたツイートをアーカイブ・削除する 1 バッチ（1 ファイル）あたりの件数
+TWEET_ARCHIVE_BATCH_SIZE = 1000
+
+# 保持期間を過ぎたツイートをアーカイブするジョブの実行間隔（時間）
+TWEET_ARCHIVE_INTERVAL_HOURS = 24
+
+# アーカイブからの読み戻し API で 1 リクエストあたりに読み込むアーカイブファイル数の最大値
+TWEET_ARCHIVE_READ_MAX_OBJECTS = 10
+
+
 # ==========================================
 # ステータス関連定数
 # ==========================================
@@ -92,6 +209,9 @@ MEDIA_STATUS_FAILED = 'failed'
 
 # S3 バケット名
 MEDIA_BUCKET_NAME = 'tweet-media'  # ツイートのメディアファイル保存用バケット
+ARCHIVE_BUCKET_NAME = (
+    'tweet-archives'  # 保持期間を過ぎたツイートのアーカイブ保存用バケット
+)
 
 # Twitter アカウントステータス
 TWITTER_ACCOUNT_STATUS_ACTIVE = 'Active'
@@ -110,6 +230,22 @@ API_PREFIX = f'/api/{API_VERSION_V1}'
 API_RESPONSE_HELLO = 'Hello World'
 API_RESPONSE_HEALTH_OK = 'ok'
 
+# エクスポート API で 1 回に取得・変換するツイート数
+EXPORT_CHUNK_SIZE = 500
+
+# 一括既読 API で 1 回に指定できるツイート ID の最大数
+BULK_READ_MAX_TWEET_IDS = 1000
+
+# ツイート検索クエリの最大文字数
+SEARCH_QUERY_MAX_LENGTH = 100
+
+# ストリーミング API（SSE）関連
+TWEET_STREAM_QUEUE_SIZE = (
+    100  # 購読者ごとに保持する未送信通知の上限（超過時は再同期を促す）
+)
+TWEET_STREAM_KEEPALIVE_SECONDS = 15  # 通知がない場合にコメント行を送る間隔（秒）
+TWEET_STREAM_RETRY_MILLISECONDS = 5000  # クライアントの再接続待ち時間（ミリ秒）
+
 # Unix timestamp フィールド名サフィックス
 UNIX_TIMESTAMP_SUFFIX = '_unix'
 CREATED_AT_UNIX = f'created_at{UNIX_TIMESTAMP_SUFFIX}'
@@ -134,8 +270,14 @@ APP_VERSION = '0.1.0'
 TABLE_USERS = 'users'
 TABLE_TWEETS = 'tweets'
 TABLE_READ_TWEETS = 'read_tweets'
+TABLE_READ_WATERMARKS = 'read_watermarks'
 TABLE_BOOKMARKED_TWEETS = 'bookmarked_tweets'
 TABLE_TWITTER_ACCOUNTS = 'twitter_accounts'
 TABLE_TARGET_ACCOUNTS = 'target_accounts'
+TABLE_TARGET_ACCOUNT_DAILY_STATS = 'target_account_daily_stats'
 TABLE_MEDIA = 'media'
 TABLE_TIMELINES = 'timelines'
+TABLE_TIMELINE_ENTRIES = 'timeline_entries'
+TABLE_TWEET_HASHTAGS = 'tweet_hashtags'
+TABLE_HASHTAG_COUNTS = 'hashtag_counts'
+TABLE_TWEET_ARCHIVES = 'tweet_archives'
@@ -22,7 +22,7 @@ from app.routers import (
     users,
 )
 from app.services.tweet_scheduler import TweetScheduler
-from app.utils.s3_client import initialize_media_bucket
+from app.utils.s3_client import initialize_archive_bucket, initialize_media_bucket
 
 # グローバルなスケジューラーインスタンス
 tweet_scheduler = TweetScheduler()
@@ -34,6 +34,8 @@ async def lifespan(_app: FastAPI):
     await init_db()
     # MinIO メディアバケットを初期化
     await initialize_media_bucket()
+    # MinIO アーカイブバケットを初期化
+    await initialize_archive_bucket()
     # スケジューラーを開始
     await tweet_scheduler.start()
     yield
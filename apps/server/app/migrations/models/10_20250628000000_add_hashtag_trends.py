@@ -0,0 +1,53 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "tweet_hashtags" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "tag" VARCHAR(255) NOT NULL,
+    "posted_at" INT NOT NULL,
+    "target_account_id" BIGINT NOT NULL REFERENCES "target_accounts" ("id") ON DELETE CASCADE,
+    "tweet_id" BIGINT NOT NULL REFERENCES "tweets" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_tweet_hasht_tweet_i_ed8c93" UNIQUE ("tweet_id", "tag")
+);
+COMMENT ON TABLE "tweet_hashtags" IS 'ツイートに含まれるハッシュタグを正規化して管理するモデル';
+        CREATE TABLE IF NOT EXISTS "hashtag_counts" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "bucket_start" INT NOT NULL,
+    "tag" VARCHAR(255) NOT NULL,
+    "count" INT NOT NULL DEFAULT 0,
+    "target_account_id" BIGINT NOT NULL REFERENCES "target_accounts" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_hashtag_cou_target__11e789" UNIQUE ("target_account_id", "bucket_start", "tag")
+);
+COMMENT ON TABLE "hashtag_counts" IS 'ターゲットアカウント・時間バケット別のハッシュタグ出現数を管理するモデル';
+        INSERT INTO "tweet_hashtags" ("tweet_id", "tag", "target_account_id", "posted_at")
+        SELECT DISTINCT "tweets"."id", "tags"."tag", "tweets"."target_account_id", "tweets"."posted_at"
+        FROM "tweets"
+        CROSS JOIN LATERAL jsonb_array_elements("tweets"."hashtags") AS "elements"("element")
+        CROSS JOIN LATERAL (
+            SELECT ltrim(btrim(lower(normalize(
+                CASE jsonb_typeof("elements"."element")
+                    WHEN 'string' THEN "elements"."element" #>> '{}'
+                    ELSE "elements"."element" ->> 'text'
+                END,
+                NFKC
+            ))), '#') AS "tag"
+        ) AS "tags"
+        WHERE jsonb_typeof("tweets"."hashtags") = 'array'
+            AND NOT "tweets"."is_quoted"
+            AND "tags"."tag" <> ''
+        ON CONFLICT ("tweet_id", "tag") DO NOTHING;
+        INSERT INTO "hashtag_counts" ("target_account_id", "bucket_start", "tag", "count")
+        SELECT "target_account_id", "posted_at" - "posted_at" % 3600, "tag", count(*)
+        FROM "tweet_hashtags"
+        WHERE "posted_at" >= extract(epoch FROM now())::int - 7 * 86400
+        GROUP BY 1, 2, 3
+        ON CONFLICT ("target_account_id", "bucket_start", "tag") DO NOTHING;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "hashtag_counts";
+        DROP TABLE IF EXISTS "tweet_hashtags";
+    """
@@ -0,0 +1,20 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "tweets" ADD COLUMN IF NOT EXISTS "dedupe_key" VARCHAR(255);
+        UPDATE "tweets" SET "dedupe_key" = CASE
+            WHEN "retweeted_tweet_id" IS NOT NULL AND "retweeted_tweet_id" <> '' THEN "retweeted_tweet_id"
+            WHEN "is_retweet" AND "original_author_username" IS NOT NULL AND "original_author_username" <> ''
+                THEN '@' || lower("original_author_username") || ':'
+                    || left(md5("content"), 20)
+            ELSE "tweet_id"
+        END;
+        CREATE INDEX IF NOT EXISTS "idx_tweets_dedupe__fbec9a" ON "tweets" ("dedupe_key", "posted_at");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_tweets_dedupe__fbec9a";
+        ALTER TABLE "tweets" DROP COLUMN IF EXISTS "dedupe_key";"""
@@ -0,0 +1,122 @@
+from tortoise import BaseDBAsyncClient
+
+# tweets を posted_at の月単位（UTC）でレンジパーティション化する
+# パーティション化したテーブルの一意制約・主キーにはパーティションキーを含める必要があるため、
+# 主キーは (id, posted_at)、ツイート ID の一意制約は (tweet_id, posted_at) とし、
+# tweets を参照する外部キー制約は削除する（参照行の削除はアプリケーションで行う）。
+# 既存データは直近 24 か月分を月別パーティションに、それより古いものを既定パーティションに移し、
+# 3 か月先までのパーティションを作成しておく（以降は定期ジョブで作成する）。
+
+_TWEET_REFERENCES = [
+    ('media', 'media_tweet_id_fkey', 'tweet_id', 'CASCADE'),
+    ('bookmarked_tweets', 'bookmarked_tweets_tweet_id_fkey', 'tweet_id', 'CASCADE'),
+    ('read_tweets', 'read_tweets_tweet_id_fkey', 'tweet_id', 'CASCADE'),
+    ('timeline_entries', 'timeline_entries_tweet_id_fkey', 'tweet_id', 'CASCADE'),
+    ('tweet_hashtags', 'tweet_hashtags_tweet_id_fkey', 'tweet_id', 'CASCADE'),
+    ('tweets', 'tweets_quoted_tweet_ref_id_fkey', 'quoted_tweet_ref_id', 'SET NULL'),
+]
+
+_TWEET_INDEXES = """
+        CREATE INDEX IF NOT EXISTS "idx_tweets_target__9434fe" ON "tweets" ("target_account_id", "posted_at");
+        CREATE INDEX IF NOT EXISTS "idx_tweets_convers_2ab1f4" ON "tweets" ("conversation_id");
+        CREATE INDEX IF NOT EXISTS "idx_tweets_quoted__11cc4f" ON "tweets" ("quoted_tweet_ref_id");
+        CREATE INDEX IF NOT EXISTS "idx_tweets_target__e02a72" ON "tweets" ("target_account_id", "engagement_score");
+        CREATE INDEX IF NOT EXISTS "idx_tweets_dedupe__fbec9a" ON "tweets" ("dedupe_key", "posted_at");
+        CREATE INDEX IF NOT EXISTS "idx_tweets_search__c13b0b" ON "tweets" USING GIN ("search_bigrams");"""
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    drop_references = '\n'.join(
+        f'        ALTER TABLE "{table}" DROP CONSTRAINT IF EXISTS "{name}";'
+        for table, name, _, _ in _TWEET_REFERENCES
+    )
+    return f"""
+        DO $$
+        DECLARE
+            "oldest" INT;
+            "month_start" TIMESTAMP;
+            "current_month" TIMESTAMP := date_trunc('month', now() AT TIME ZONE 'UTC');
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM "pg_partitioned_table" WHERE "partrelid" = '"tweets"'::regclass
+            ) THEN
+                RETURN;
+            END IF;
+
+{drop_references}
+
+            ALTER TABLE "tweets" RENAME TO "tweets_unpartitioned";
+            ALTER SEQUENCE "tweets_id_seq" OWNED BY NONE;
+            CREATE TABLE "tweets" (
+                LIKE "tweets_unpartitioned" INCLUDING DEFAULTS INCLUDING COMMENTS
+            ) PARTITION BY RANGE ("posted_at");
+            CREATE TABLE "tweets_pdefault" PARTITION OF "tweets" DEFAULT;
+
+            SELECT min("posted_at") INTO "oldest" FROM "tweets_unpartitioned";
+            "month_start" := greatest(
+                date_trunc('month', coalesce(
+                    to_timestamp("oldest") AT TIME ZONE 'UTC', "current_month"
+                )),
+                "current_month" - INTERVAL '24 months'
+            );
+            WHILE "month_start" <= "current_month" + INTERVAL '3 months' LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF "tweets" FOR VALUES FROM (%s) TO (%s)',
+                    'tweets_p' || to_char("month_start", 'YYYYMM'),
+                    extract(epoch FROM "month_start")::bigint,
+                    extract(epoch FROM "month_start" + INTERVAL '1 month')::bigint
+                );
+                "month_start" := "month_start" + INTERVAL '1 month';
+            END LOOP;
+
+            INSERT INTO "tweets" SELECT * FROM "tweets_unpartitioned";
+            DROP TABLE "tweets_unpartitioned";
+            ALTER SEQUENCE "tweets_id_seq" OWNED BY "tweets"."id";
+
+            ALTER TABLE "tweets" ADD CONSTRAINT "tweets_pkey" PRIMARY KEY ("id", "posted_at");
+            ALTER TABLE "tweets" ADD CONSTRAINT "uid_tweets_tweet_i_466e51" UNIQUE ("tweet_id", "posted_at");
+            ALTER TABLE "tweets" ADD CONSTRAINT "tweets_target_account_id_fkey"
+                FOREIGN KEY ("target_account_id") REFERENCES "target_accounts" ("id") ON DELETE CASCADE;
+        END $$;
+{_TWEET_INDEXES}"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    # 外部キーを張り直すため、参照先のツイートが存在しない行は削除（引用元は参照解除）する
+    restore_references = '\n'.join(
+        (
+            f'        UPDATE "{table}" SET "{column}" = NULL'
+            if on_delete == 'SET NULL'
+            else f'        DELETE FROM "{table}"'
+        )
+        + f' WHERE "{column}" IS NOT NULL AND NOT EXISTS'
+        f' (SELECT 1 FROM "tweets" "t" WHERE "t"."id" = "{table}"."{column}");\n'
+        f'        ALTER TABLE "{table}" ADD CONSTRAINT "{name}" FOREIGN KEY ("{column}")'
+        f' REFERENCES "tweets" ("id") ON DELETE {on_delete};'
+        for table, name, column, on_delete in _TWEET_REFERENCES
+    )
+    return f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM "pg_partitioned_table" WHERE "partrelid" = '"tweets"'::regclass
+            ) THEN
+                RETURN;
+            END IF;
+
+            ALTER TABLE "tweets" RENAME TO "tweets_partitioned";
+            ALTER SEQUENCE "tweets_id_seq" OWNED BY NONE;
+            CREATE TABLE "tweets" (
+                LIKE "tweets_partitioned" INCLUDING DEFAULTS INCLUDING COMMENTS
+            );
+            INSERT INTO "tweets" SELECT * FROM "tweets_partitioned";
+            DROP TABLE "tweets_partitioned";
+            ALTER SEQUENCE "tweets_id_seq" OWNED BY "tweets"."id";
+
+            ALTER TABLE "tweets" ADD CONSTRAINT "tweets_pkey" PRIMARY KEY ("id");
+            ALTER TABLE "tweets" ADD CONSTRAINT "tweets_tweet_id_key" UNIQUE ("tweet_id");
+            ALTER TABLE "tweets" ADD CONSTRAINT "tweets_target_account_id_fkey"
+                FOREIGN KEY ("target_account_id") REFERENCES "target_accounts" ("id") ON DELETE CASCADE;
+        END $$;
+{_TWEET_INDEXES}
+{restore_references}"""
@@ -0,0 +1,23 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "tweet_archives" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "object_key" VARCHAR(500) NOT NULL UNIQUE,
+    "first_posted_at" INT NOT NULL,
+    "last_posted_at" INT NOT NULL,
+    "tweet_count" INT NOT NULL,
+    "byte_size" INT NOT NULL,
+    "created_at" INT NOT NULL,
+    "target_account_id" BIGINT NOT NULL REFERENCES "target_accounts" ("id") ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS "idx_tweet_archi_target__827c77" ON "tweet_archives" ("target_account_id", "first_posted_at");
+COMMENT ON TABLE "tweet_archives" IS '保持期間を過ぎて DB から削除したツイートのアーカイブファイルを管理するモデル';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "tweet_archives";
+    """
@@ -0,0 +1,18 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "target_accounts" ADD COLUMN IF NOT EXISTS "stored_tweets_count" INT NOT NULL DEFAULT 0;
+UPDATE "target_accounts" SET "stored_tweets_count" = (
+    SELECT COUNT(*) FROM "tweets"
+    WHERE "tweets"."target_account_id" = "target_accounts"."id"
+      AND "tweets"."is_quoted" = False
+);
+"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "target_accounts" DROP COLUMN IF EXISTS "stored_tweets_count";
+    """
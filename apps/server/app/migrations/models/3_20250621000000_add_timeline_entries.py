@@ -0,0 +1,27 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "timeline_entries" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "posted_at" INT NOT NULL,
+    "timeline_id" BIGINT NOT NULL REFERENCES "timelines" ("id") ON DELETE CASCADE,
+    "tweet_id" BIGINT NOT NULL REFERENCES "tweets" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_timeline_en_timelin_d7ba42" UNIQUE ("timeline_id", "tweet_id")
+);
+CREATE INDEX IF NOT EXISTS "idx_timeline_en_timelin_92dc31" ON "timeline_entries" ("timeline_id", "posted_at", "tweet_id");
+COMMENT ON TABLE "timeline_entries" IS 'カスタムタイムラインのマテリアライズドフィードを管理するモデル';
+INSERT INTO "timeline_entries" ("timeline_id", "tweet_id", "posted_at")
+SELECT "timeline_target_accounts"."timeline_id", "tweets"."id", "tweets"."posted_at"
+FROM "timeline_target_accounts"
+JOIN "tweets" ON "tweets"."target_account_id" = "timeline_target_accounts"."targetaccount_id"
+WHERE "tweets"."is_quoted" = False
+ON CONFLICT ("timeline_id", "tweet_id") DO NOTHING;
+"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "timeline_entries";
+    """
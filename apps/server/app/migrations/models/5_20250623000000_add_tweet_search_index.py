@@ -0,0 +1,29 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return r"""
+        ALTER TABLE "tweets" ADD COLUMN IF NOT EXISTS "search_text" TEXT;
+        ALTER TABLE "tweets" ADD COLUMN IF NOT EXISTS "search_bigrams" TEXT[];
+        UPDATE "tweets" SET "search_text" = lower(normalize(
+            CASE
+                WHEN "full_text" IS NULL OR "full_text" = '' OR "full_text" = "content"
+                    THEN "content"
+                ELSE "content" || E'\n' || "full_text"
+            END,
+            NFKC
+        ));
+        UPDATE "tweets" SET "search_bigrams" = ARRAY(
+            SELECT DISTINCT substr("search_text", i, 2)
+            FROM generate_series(1, char_length("search_text") - 1) AS i
+            WHERE substr("search_text", i, 2) !~ '\s'
+            ORDER BY 1
+        );
+        CREATE INDEX IF NOT EXISTS "idx_tweets_search__c13b0b" ON "tweets" USING GIN ("search_bigrams");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_tweets_search__c13b0b";
+        ALTER TABLE "tweets" DROP COLUMN IF EXISTS "search_bigrams";
+        ALTER TABLE "tweets" DROP COLUMN IF EXISTS "search_text";"""
@@ -0,0 +1,27 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "tweets" ADD COLUMN IF NOT EXISTS "engagement_score" DOUBLE PRECISION NOT NULL DEFAULT 0;
+        ALTER TABLE "timeline_entries" ADD COLUMN IF NOT EXISTS "engagement_score" DOUBLE PRECISION NOT NULL DEFAULT 0;
+        UPDATE "tweets" SET "engagement_score" = log(greatest(
+            "likes_count" * 1.0
+            + "retweets_count" * 2.0
+            + "replies_count" * 1.5
+            + "quotes_count" * 2.5
+            + coalesce("views_count", 0) * 0.01,
+            1.0
+        )::double precision) + "posted_at"::double precision / 45000;
+        UPDATE "timeline_entries" SET "engagement_score" = "tweets"."engagement_score"
+        FROM "tweets" WHERE "tweets"."id" = "timeline_entries"."tweet_id";
+        CREATE INDEX IF NOT EXISTS "idx_tweets_target__e02a72" ON "tweets" ("target_account_id", "engagement_score");
+        CREATE INDEX IF NOT EXISTS "idx_timeline_en_timelin_b554c3" ON "timeline_entries" ("timeline_id", "engagement_score", "tweet_id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_timeline_en_timelin_b554c3";
+        DROP INDEX IF EXISTS "idx_tweets_target__e02a72";
+        ALTER TABLE "timeline_entries" DROP COLUMN IF EXISTS "engagement_score";
+        ALTER TABLE "tweets" DROP COLUMN IF EXISTS "engagement_score";"""
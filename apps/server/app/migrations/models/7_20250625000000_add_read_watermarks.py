@@ -0,0 +1,22 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "read_watermarks" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "posted_at" INT NOT NULL,
+    "tweet_id" BIGINT NOT NULL,
+    "updated_at" INT NOT NULL,
+    "target_account_id" BIGINT NOT NULL REFERENCES "target_accounts" ("id") ON DELETE CASCADE,
+    "user_id" BIGINT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_read_waterm_user_id_ff08a9" UNIQUE ("user_id", "target_account_id")
+);
+COMMENT ON TABLE "read_watermarks" IS 'ユーザーのターゲットアカウント別の既読位置（ハイウォーターマーク）を管理するモデル';
+"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "read_watermarks";
+    """
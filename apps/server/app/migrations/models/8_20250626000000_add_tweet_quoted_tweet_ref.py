@@ -0,0 +1,18 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "tweets" ADD COLUMN IF NOT EXISTS "quoted_tweet_ref_id" BIGINT REFERENCES "tweets" ("id") ON DELETE SET NULL;
+        UPDATE "tweets" SET "quoted_tweet_ref_id" = "quoted"."id"
+        FROM "tweets" AS "quoted"
+        WHERE "quoted"."tweet_id" = "tweets"."quoted_tweet_id"
+            AND "tweets"."quoted_tweet_id" IS NOT NULL
+            AND "tweets"."quoted_tweet_ref_id" IS NULL;
+        CREATE INDEX IF NOT EXISTS "idx_tweets_quoted__11cc4f" ON "tweets" ("quoted_tweet_ref_id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_tweets_quoted__11cc4f";
+        ALTER TABLE "tweets" DROP COLUMN IF EXISTS "quoted_tweet_ref_id";"""
@@ -0,0 +1,38 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "target_account_daily_stats" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "day" DATE NOT NULL,
+    "tweet_count" INT NOT NULL DEFAULT 0,
+    "likes_sum" BIGINT NOT NULL DEFAULT 0,
+    "retweets_sum" BIGINT NOT NULL DEFAULT 0,
+    "media_count" INT NOT NULL DEFAULT 0,
+    "updated_at" INT NOT NULL,
+    "target_account_id" BIGINT NOT NULL REFERENCES "target_accounts" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_target_acco_target__531df2" UNIQUE ("target_account_id", "day")
+);
+COMMENT ON TABLE "target_account_daily_stats" IS 'ターゲットアカウントの日別の活動集計（ロールアップ）を管理するモデル';
+        INSERT INTO "target_account_daily_stats" (
+            "target_account_id", "day", "tweet_count", "likes_sum", "retweets_sum", "media_count", "updated_at"
+        )
+        SELECT
+            "target_account_id",
+            (to_timestamp("posted_at") AT TIME ZONE 'Asia/Tokyo')::date,
+            count(*),
+            sum("likes_count"),
+            sum("retweets_count"),
+            count(*) FILTER (WHERE "has_media"),
+            extract(epoch FROM now())::int
+        FROM "tweets"
+        WHERE NOT "is_quoted"
+        GROUP BY 1, 2
+        ON CONFLICT ("target_account_id", "day") DO NOTHING;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "target_account_daily_stats";
+    """
@@ -1,20 +1,32 @@
 # モデルクラスをインポートして公開
 from .bookmarked_tweet import BookmarkedTweet
+from .hashtag_count import HashtagCount
 from .media import Media
 from .read_tweet import ReadTweet
+from .read_watermark import ReadWatermark
 from .target_account import TargetAccount
+from .target_account_daily_stats import TargetAccountDailyStats
 from .timeline import Timeline
+from .timeline_entry import TimelineEntry
 from .tweet import Tweet
+from .tweet_archive import TweetArchive
+from .tweet_hashtag import TweetHashtag
 from .twitter_account import TwitterAccount
 from .user import User
 
 __all__ = [
     'BookmarkedTweet',
+    'HashtagCount',
     'Media',
     'ReadTweet',
+    'ReadWatermark',
     'TargetAccount',
+    'TargetAccountDailyStats',
     'Timeline',
+    'TimelineEntry',
     'Tweet',
+    'TweetArchive',
+    'TweetHashtag',
     'TwitterAccount',
     'User',
 ]
@@ -19,7 +19,10 @@ class BookmarkedTweet(Model):
         'models.User', related_name='bookmarked_tweets', on_delete=CASCADE
     )  # ブックマークしたユーザー
     tweet = ForeignKeyField(
-        'models.Tweet', related_name='bookmarked_by', on_delete=CASCADE
+        'models.Tweet',
+        related_name='bookmarked_by',
+        on_delete=CASCADE,
+        db_constraint=False,
     )  # ブックマークされたツイート
     bookmarked_at = IntField()  # ブックマークした日時（Unix timestamp）
 
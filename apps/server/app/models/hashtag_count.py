@@ -0,0 +1,34 @@
+from tortoise.fields import (
+    CASCADE,
+    BigIntField,
+    CharField,
+    ForeignKeyField,
+    IntField,
+)
+from tortoise.models import Model
+
+from app.constants import FIELD_LENGTH_MEDIUM, TABLE_HASHTAG_COUNTS
+
+
+class HashtagCount(Model):
+    """
+    ターゲットアカウント・時間バケット別のハッシュタグ出現数を管理するモデル
+    取り込み時に加算しておき、トレンド API は期間内のバケットを合算するだけで上位を求める
+    """
+
+    id = BigIntField(primary_key=True)
+    target_account = ForeignKeyField(
+        'models.TargetAccount', related_name='hashtag_counts', on_delete=CASCADE
+    )  # ハッシュタグを使ったアカウント
+    bucket_start = IntField()  # 時間バケットの開始日時（Unix timestamp、投稿日時基準）
+    tag = CharField(max_length=FIELD_LENGTH_MEDIUM)  # 正規化したハッシュタグ
+    count = IntField(default=0)  # バケット内でハッシュタグを含むツイート数
+
+    class Meta:
+        table = TABLE_HASHTAG_COUNTS
+        unique_together = (
+            ('target_account', 'bucket_start', 'tag'),
+        )  # アカウント・バケット・タグごとに 1 行（期間での絞り込みにも使う）
+
+    def __str__(self):
+        return f'{self.target_account_id}@{self.bucket_start}: #{self.tag}={self.count}'
@@ -29,7 +29,10 @@ class Media(Model):
 
     id = BigIntField(primary_key=True)
     tweet = ForeignKeyField(
-        'models.Tweet', related_name='media_items', on_delete=CASCADE
+        'models.Tweet',
+        related_name='media_items',
+        on_delete=CASCADE,
+        db_constraint=False,
     )  # 所属するツイート
 
     # メディア基本情報
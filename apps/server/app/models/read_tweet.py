@@ -19,7 +19,10 @@ class ReadTweet(Model):
         'models.User', related_name='read_tweets', on_delete=CASCADE
     )  # 既読したユーザー
     tweet = ForeignKeyField(
-        'models.Tweet', related_name='read_by', on_delete=CASCADE
+        'models.Tweet',
+        related_name='read_by',
+        on_delete=CASCADE,
+        db_constraint=False,
     )  # 既読されたツイート
     read_at = IntField()  # 既読した日時（Unix timestamp）
 
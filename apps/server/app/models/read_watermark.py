@@ -0,0 +1,46 @@
+from tortoise.fields import (
+    CASCADE,
+    BigIntField,
+    ForeignKeyField,
+    IntField,
+)
+from tortoise.models import Model
+
+from app.constants import TABLE_READ_WATERMARKS
+
+
+class ReadWatermark(Model):
+    """
+    ユーザーのターゲットアカウント別の既読位置（ハイウォーターマーク）を管理するモデル
+    (posted_at, tweet_id) がこの位置以下のツイートはすべて既読として扱い、
+    それより新しいツイートの既読のみ read_tweets に個別の行として保持する
+    """
+
+    id = BigIntField(primary_key=True)
+    user = ForeignKeyField(
+        'models.User', related_name='read_watermarks', on_delete=CASCADE
+    )  # 既読位置を持つユーザー
+    target_account = ForeignKeyField(
+        'models.TargetAccount', related_name='read_watermarks', on_delete=CASCADE
+    )  # 既読位置の対象アカウント
+    posted_at = IntField()  # 既読位置のツイートの投稿日時（Unix timestamp）
+    tweet_id = (
+        BigIntField()
+    )  # 既読位置のツイートの ID（投稿日時が同じ場合のタイブレーカー）
+    updated_at = IntField()  # 既読位置の更新日時（Unix timestamp）
+
+    class Meta:
+        table = TABLE_READ_WATERMARKS
+        unique_together = (
+            ('user', 'target_account'),
+        )  # ユーザー・アカウントごとに 1 つ
+
+    async def save(self, *args, **kwargs):
+        """保存時に updated_at を自動更新"""
+        import time
+
+        self.updated_at = int(time.time())
+        await super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f'{self.user_id}@{self.target_account_id}: {self.posted_at}'
@@ -90,6 +90,9 @@ class TargetAccount(Model):
     favorites_count = IntField(
         default=DEFAULT_COUNT
     )  # いいね数 (twikit: User.favourites_count)
+    stored_tweets_count = IntField(
+        default=DEFAULT_COUNT
+    )  # EchoBird に保存済みのツイート数（引用元ツイートを除く、取り込み時に加算）
 
     # 取得管理
     last_fetched_at = IntField(
@@ -0,0 +1,42 @@
+from tortoise.fields import (
+    CASCADE,
+    BigIntField,
+    DateField,
+    ForeignKeyField,
+    IntField,
+)
+from tortoise.models import Model
+
+from app.constants import TABLE_TARGET_ACCOUNT_DAILY_STATS
+
+
+class TargetAccountDailyStats(Model):
+    """
+    ターゲットアカウントの日別の活動集計（ロールアップ）を管理するモデル
+    ツイートの取り込み時・エンゲージメント更新時に加算し、統計 API はこの行だけを読む
+    """
+
+    id = BigIntField(primary_key=True)
+    target_account = ForeignKeyField(
+        'models.TargetAccount', related_name='daily_stats', on_delete=CASCADE
+    )  # 集計対象のアカウント
+    day = DateField()  # ツイートの投稿日（ACCOUNT_STATS_TIMEZONE での日付）
+    tweet_count = IntField(default=0)  # 保存済みツイート数（引用元ツイートを除く）
+    likes_sum = BigIntField(default=0)  # いいね数の合計
+    retweets_sum = BigIntField(default=0)  # リツイート数の合計
+    media_count = IntField(default=0)  # メディアを含むツイート数
+    updated_at = IntField()  # レコード更新日時（Unix timestamp）
+
+    class Meta:
+        table = TABLE_TARGET_ACCOUNT_DAILY_STATS
+        unique_together = (('target_account', 'day'),)  # アカウント・日付ごとに 1 行
+
+    async def save(self, *args, **kwargs):
+        """保存時に updated_at を自動更新"""
+        import time
+
+        self.updated_at = int(time.time())
+        await super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f'{self.target_account_id}@{self.day}: {self.tweet_count} tweets'
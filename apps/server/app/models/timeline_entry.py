@@ -0,0 +1,48 @@
+from typing import ClassVar
+
+from tortoise.fields import (
+    CASCADE,
+    BigIntField,
+    FloatField,
+    ForeignKeyField,
+    IntField,
+)
+from tortoise.models import Model
+
+from app.constants import TABLE_TIMELINE_ENTRIES
+
+
+class TimelineEntry(Model):
+    """
+    カスタムタイムラインのマテリアライズドフィードを管理するモデル
+    ツイート取り込み時に所属する全タイムラインへ展開（fan-out-on-write）しておくことで、
+    タイムラインの読み出しをアカウント数に依存しない単一インデックスの範囲スキャンにする
+    """
+
+    id = BigIntField(primary_key=True)
+    timeline = ForeignKeyField(
+        'models.Timeline', related_name='entries', on_delete=CASCADE
+    )  # 所属するタイムライン
+    tweet = ForeignKeyField(
+        'models.Tweet',
+        related_name='timeline_entries',
+        on_delete=CASCADE,
+        db_constraint=False,
+    )  # フィードに含まれるツイート
+    posted_at = IntField()  # ツイートの投稿日時（並び替え用に Tweet から複製）
+    engagement_score = FloatField(
+        default=0.0
+    )  # ツイートのエンゲージメントスコア（sort=top 用に Tweet から複製）
+
+    class Meta:
+        table = TABLE_TIMELINE_ENTRIES
+        unique_together = (
+            ('timeline', 'tweet'),
+        )  # 同じタイムラインに同じツイートが重複して入ることを防ぐ
+        indexes: ClassVar = [
+            ('timeline', 'posted_at', 'tweet'),  # タイムライン別の時系列取得用
+            ('timeline', 'engagement_score', 'tweet'),  # タイムライン別の上位取得用
+        ]
+
+    def __str__(self):
+        return f'{self.timeline.name}: {self.tweet.tweet_id}'
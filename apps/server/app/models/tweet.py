@@ -1,10 +1,14 @@
 from typing import ClassVar
 
+from tortoise.contrib.postgres.fields import ArrayField
+from tortoise.contrib.postgres.indexes import GinIndex
 from tortoise.fields import (
     CASCADE,
+    SET_NULL,
     BigIntField,
     BooleanField,
     CharField,
+    FloatField,
     ForeignKeyField,
     IntField,
     JSONField,
@@ -25,17 +29,25 @@ from app.constants import (
     TWITTER_ID_LENGTH,
     URL_MAX_LENGTH,
 )
+from app.utils.engagement_score import compute_engagement_score
+from app.utils.share_dedupe import compute_dedupe_key
+from app.utils.text_search import build_search_document
 
 
 class Tweet(Model):
     """
     Twitter から twikit 経由で取得したツイートデータを管理するモデル
+
+    テーブルは posted_at の月単位でレンジパーティション化している。
+    パーティション化したテーブルは参照先の一意制約にパーティションキーを含める必要があるため、
+    ツイートを参照する外部キーには DB の制約を張らず（db_constraint=False）、
+    ツイート削除時の参照行の削除はアプリケーションで行う（tweet_partitions 参照）。
     """
 
     id = BigIntField(primary_key=True)
     tweet_id = CharField(
-        max_length=TWITTER_ID_LENGTH, unique=True
-    )  # Twitter 側のツイート ID (twikit: Tweet.id)
+        max_length=TWITTER_ID_LENGTH
+    )  # Twitter 側のツイート ID (twikit: Tweet.id、一意性は posted_at との組で保証)
     target_account = ForeignKeyField(
         'models.TargetAccount', related_name='tweets', on_delete=CASCADE
     )  # ツイートの作成者
@@ -71,6 +83,13 @@ class Tweet(Model):
     quoted_tweet_id = CharField(
         max_length=TWITTER_ID_LENGTH, null=True
     )  # 引用元のツイート ID
+    quoted_tweet_ref = ForeignKeyField(
+        'models.Tweet',
+        related_name='quoting_tweets',
+        null=True,
+        on_delete=SET_NULL,
+        db_constraint=False,
+    )  # 引用元ツイートのレコード（select_related で引用元を結合して取得する用）
 
     # リプライ関連
     is_reply = BooleanField(default=DEFAULT_IS_REPLY)  # リプライかどうか
@@ -108,24 +127,62 @@ class Tweet(Model):
         max_length=URL_MAX_LENGTH, null=True
     )  # 元ツイート作者のプロフィール画像 URL（リツイート・引用の場合）
 
+    # 全文検索用（保存時に本文から自動生成）
+    search_text = TextField(
+        null=True
+    )  # NFKC 正規化・小文字化した本文（検索語の部分一致の再確認用）
+    search_bigrams = ArrayField(
+        element_type='text', null=True
+    )  # 正規化した本文の文字 bigram（GIN インデックスで検索候補を絞り込む）
+
+    # sort=top の並び順（保存時にカウンターと投稿日時から自動算出）
+    engagement_score = FloatField(default=0.0)
+
+    # dedupe=true の重複排除キー（保存時に自動算出、同じ元ツイートの共有は同じ値）
+    dedupe_key = CharField(max_length=FIELD_LENGTH_MEDIUM, null=True)
+
     posted_at = IntField()  # Twitter でツイートされた日時（Unix timestamp）
     created_at = IntField()  # レコード作成日時（Unix timestamp）
     updated_at = IntField()  # レコード更新日時（Unix timestamp）
 
     class Meta:
         table = TABLE_TWEETS
+        # パーティションキー（posted_at）を含まない一意制約は張れないため、組で一意にする
+        unique_together = (('tweet_id', 'posted_at'),)
         indexes: ClassVar = [
             ('target_account', 'posted_at'),  # アカウント別の時系列取得用
             ('conversation_id',),  # 会話スレッド取得用
+            ('quoted_tweet_ref',),  # 引用元ツイート削除時の参照解除用
+            ('target_account', 'engagement_score'),  # アカウント別の上位取得用
+            ('dedupe_key', 'posted_at'),  # 同じ元ツイートの共有の重複排除用
+            GinIndex(fields=('search_bigrams',)),  # 全文検索用
         ]
 
     async def save(self, *args, **kwargs):
-        """保存時に updated_at を自動更新"""
+        """保存時に updated_at・全文検索用の列・エンゲージメントスコア・重複排除キーを自動更新"""
         import time
 
         if not self.created_at:
             self.created_at = int(time.time())
         self.updated_at = int(time.time())
+        self.search_text, self.search_bigrams = build_search_document(
+            self.content, self.full_text
+        )
+        self.engagement_score = compute_engagement_score(
+            self.likes_count,
+            self.retweets_count,
+            self.replies_count,
+            self.quotes_count,
+            self.views_count,
+            self.posted_at,
+        )
+        self.dedupe_key = compute_dedupe_key(
+            self.tweet_id,
+            self.retweeted_tweet_id,
+            self.is_retweet,
+            self.original_author_username,
+            self.content,
+        )
         await super().save(*args, **kwargs)
 
     def __str__(self):
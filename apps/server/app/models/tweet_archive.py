@@ -0,0 +1,51 @@
+from typing import ClassVar
+
+from tortoise.fields import (
+    CASCADE,
+    BigIntField,
+    CharField,
+    ForeignKeyField,
+    IntField,
+)
+from tortoise.models import Model
+
+from app.constants import FIELD_LENGTH_LARGE, TABLE_TWEET_ARCHIVES
+
+
+class TweetArchive(Model):
+    """
+    保持期間を過ぎて DB から削除したツイートのアーカイブファイルを管理するモデル
+    ファイルの本体は MinIO のアーカイブ用バケットに置き、期間での検索と読み戻しにこの行を使う
+    """
+
+    id = BigIntField(primary_key=True)
+    target_account = ForeignKeyField(
+        'models.TargetAccount', related_name='tweet_archives', on_delete=CASCADE
+    )  # アーカイブしたツイートのアカウント
+    object_key = CharField(
+        max_length=FIELD_LENGTH_LARGE, unique=True
+    )  # アーカイブ用バケット内のオブジェクトキー
+    first_posted_at = IntField()  # 最も古いツイートの投稿日時（Unix timestamp）
+    last_posted_at = IntField()  # 最も新しいツイートの投稿日時（Unix timestamp）
+    tweet_count = IntField()  # 含まれるツイート数（引用元ツイートを含む）
+    byte_size = IntField()  # 圧縮後のファイルサイズ（バイト）
+    created_at = IntField()  # アーカイブ日時（Unix timestamp）
+
+    class Meta:
+        table = TABLE_TWEET_ARCHIVES
+        indexes: ClassVar = [
+            ('target_account', 'first_posted_at'),  # アカウント別の期間検索用
+        ]
+
+    async def save(self, *args, **kwargs):
+        """保存時に created_at を自動設定"""
+        import time
+
+        if not self.created_at:
+            self.created_at = int(time.time())
+        await super().save(*args, **kwargs)
+
+    def __str__(self):
+        return (
+            f'{self.target_account_id}: {self.object_key} ({self.tweet_count} tweets)'
+        )
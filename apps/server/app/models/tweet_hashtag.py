@@ -0,0 +1,39 @@
+from tortoise.fields import (
+    CASCADE,
+    BigIntField,
+    CharField,
+    ForeignKeyField,
+    IntField,
+)
+from tortoise.models import Model
+
+from app.constants import FIELD_LENGTH_MEDIUM, TABLE_TWEET_HASHTAGS
+
+
+class TweetHashtag(Model):
+    """
+    ツイートに含まれるハッシュタグを正規化して管理するモデル
+    Tweet.hashtags の JSON から取り込み時に 1 タグ 1 行で展開する
+    """
+
+    id = BigIntField(primary_key=True)
+    tweet = ForeignKeyField(
+        'models.Tweet',
+        related_name='hashtag_rows',
+        on_delete=CASCADE,
+        db_constraint=False,
+    )  # ハッシュタグを含むツイート
+    tag = CharField(
+        max_length=FIELD_LENGTH_MEDIUM
+    )  # 正規化したハッシュタグ（NFKC 正規化・小文字化、先頭の # なし）
+    target_account = ForeignKeyField(
+        'models.TargetAccount', related_name='hashtag_rows', on_delete=CASCADE
+    )  # ツイートの作成者（Tweet から複製）
+    posted_at = IntField()  # ツイートの投稿日時（Tweet から複製）
+
+    class Meta:
+        table = TABLE_TWEET_HASHTAGS
+        unique_together = (('tweet', 'tag'),)  # 同じツイートの同じタグは 1 行
+
+    def __str__(self):
+        return f'{self.tweet_id}: #{self.tag}'
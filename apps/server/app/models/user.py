@@ -27,6 +27,12 @@ class User(Model):
     password_hash = CharField(max_length=PASSWORD_HASH_LENGTH)  # パスワードハッシュ
     is_active = BooleanField(default=DEFAULT_IS_ACTIVE)  # アクティブ状態
     is_admin = BooleanField(default=DEFAULT_IS_ADMIN)  # 管理者権限
+    tweet_state_version = IntField(
+        default=0
+    )  # 既読・ブックマーク状態の更新ごとに加算されるバージョン（ETag 算出用）
+    membership_version = IntField(
+        default=0
+    )  # タイムライン・ターゲットアカウントの構成の変更ごとに加算される世代（所属キャッシュ用）
     created_at = IntField()  # レコード作成日時（Unix timestamp）
     updated_at = IntField()  # レコード更新日時（Unix timestamp）
 
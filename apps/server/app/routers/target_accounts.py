@@ -1,9 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, ConfigDict, Field
+import time
+from datetime import date, timedelta
+from typing import Any
 
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel, ConfigDict, Field
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
+
+from app.constants import (
+    ACCOUNT_STATS_DAYS_DEFAULT,
+    ACCOUNT_STATS_DAYS_MAX,
+    TWEET_ARCHIVE_READ_MAX_OBJECTS,
+)
 from app.models.target_account import TargetAccount
+from app.models.target_account_daily_stats import TargetAccountDailyStats
+from app.models.tweet_archive import TweetArchive
 from app.models.twitter_account import TwitterAccount
 from app.models.user import User
+from app.services.account_stats import activity_day, summarize_daily_stats
+from app.services.membership_cache import bump_membership_version
+from app.services.tweet_archive import (
+    delete_archive_objects,
+    get_archive_object_keys,
+    load_archived_tweets,
+)
+from app.services.tweet_partitions import delete_target_account_tweet_dependents
 from app.utils.auth import get_current_user
 from app.utils.twitter_service import TwitterService
 
@@ -105,6 +126,70 @@ class TargetAccountCreateResponse(BaseModel):
     )
 
 
+class TargetAccountDailyStatsResponse(BaseModel):
+    """ターゲットアカウントの日別活動集計レスポンス"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    day: date = Field(..., description='日付（ツイートの投稿日）')
+    tweet_count: int = Field(..., description='ツイート数')
+    likes_sum: int = Field(..., description='いいね数の合計')
+    retweets_sum: int = Field(..., description='リツイート数の合計')
+    media_count: int = Field(..., description='メディアを含むツイート数')
+
+
+class TargetAccountStatsResponse(BaseModel):
+    """ターゲットアカウント統計レスポンス"""
+
+    account_id: int = Field(..., description='ターゲットアカウント ID')
+    since: date = Field(..., description='集計期間の開始日')
+    until: date = Field(..., description='集計期間の終了日（当日）')
+    tweet_count: int = Field(..., description='期間内のツイート数')
+    tweets_per_day: float = Field(..., description='1 日あたりのツイート数')
+    average_likes: float = Field(..., description='1 ツイートあたりのいいね数')
+    average_retweets: float = Field(..., description='1 ツイートあたりのリツイート数')
+    media_ratio: float = Field(..., description='メディアを含むツイートの割合（0〜1）')
+    daily: list[TargetAccountDailyStatsResponse] = Field(
+        ..., description='日別の活動集計（活動のない日は含まない、日付の古い順）'
+    )
+
+
+class TweetArchiveResponse(BaseModel):
+    """ツイートのアーカイブファイル情報レスポンス"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int = Field(..., description='アーカイブ ID')
+    first_posted_at: int = Field(
+        ..., description='含まれるツイートの最も古い投稿日時（Unix timestamp）'
+    )
+    last_posted_at: int = Field(
+        ..., description='含まれるツイートの最も新しい投稿日時（Unix timestamp）'
+    )
+    tweet_count: int = Field(..., description='含まれるツイート数')
+    byte_size: int = Field(..., description='圧縮後のファイルサイズ（バイト）')
+    created_at: int = Field(..., description='アーカイブ日時（Unix timestamp）')
+
+
+class TweetArchiveListResponse(BaseModel):
+    """ツイートのアーカイブ一覧レスポンス"""
+
+    archives: list[TweetArchiveResponse] = Field(
+        ..., description='アーカイブ一覧（投稿日時の古い順）'
+    )
+    total: int = Field(..., description='アーカイブ総数')
+
+
+class ArchivedTweetsResponse(BaseModel):
+    """アーカイブから読み戻したツイート一覧レスポンス"""
+
+    tweets: list[dict[str, Any]] = Field(
+        ...,
+        description='アーカイブ時のツイートの列（media にメディアのメタデータ、投稿日時の古い順）',
+    )
+    archive_count: int = Field(..., description='読み込んだアーカイブファイル数')
+
+
 @router.post('', response_model=TargetAccountCreateResponse)
 async def TargetAccountCreateAPI(
     request: TargetAccountCreateRequest,
@@ -144,6 +229,9 @@ async def TargetAccountCreateAPI(
     )
 
     if success and target_account_info:
+        # 所属関係キャッシュを無効化（アクティブなアカウント一覧が変わるため）
+        await bump_membership_version(current_user.id)
+
         # スケジューラーにターゲットアカウントを追加
         scheduler = get_tweet_scheduler()
         try:
@@ -241,6 +329,7 @@ async def TargetAccountUpdateAPI(
         account.max_tweets_per_fetch = request.max_tweets_per_fetch
 
     await account.save()
+    await bump_membership_version(current_user.id)
 
     # スケジューラーでターゲットアカウントを再スケジュール
     scheduler = get_tweet_scheduler()
@@ -288,7 +377,17 @@ async def TargetAccountDeleteAPI(
         logger = logging.getLogger(__name__)
         logger.error(f'Failed to unschedule account {account_id}: {ex!s}')
 
-    await account.delete()
+    # アーカイブの行は連鎖削除されるため、削除するファイルのキーを先に取得しておく
+    archive_object_keys = await get_archive_object_keys([account.id])
+    # ツイートを参照する行は外部キーで連鎖削除されないため、アカウントと同じトランザクションで
+    # 削除する。アカウントの行をロックし、削除中の取り込みによるツイートの追加を待たせる
+    async with in_transaction():
+        await TargetAccount.select_for_update().filter(id=account.id).first()
+        await delete_target_account_tweet_dependents([account.id])
+        await account.delete()
+    # DB から削除できた後にアーカイブファイルを削除する
+    await delete_archive_objects(archive_object_keys)
+    await bump_membership_version(current_user.id)
 
     return {'message': 'ターゲットアカウントを削除しました'}
 
@@ -339,6 +438,163 @@ async def TargetAccountFetchTweetsAPI(
     }
 
 
+@router.get('/{account_id}/stats', response_model=TargetAccountStatsResponse)
+async def TargetAccountStatsAPI(
+    account_id: int,
+    days: int = Query(
+        ACCOUNT_STATS_DAYS_DEFAULT,
+        ge=1,
+        le=ACCOUNT_STATS_DAYS_MAX,
+        description='当日を含めて遡る集計期間（日数）',
+    ),
+    current_user: User = Depends(get_current_user),
+) -> TargetAccountStatsResponse:
+    """
+    ターゲットアカウント統計取得 API
+
+    指定されたターゲットアカウントの 1 日あたりのツイート数・平均エンゲージメント・
+    メディア付きツイートの割合と、日別の活動集計を取得します。
+    取り込み時に更新される日別集計を読むため、期間の日数分の行のみを参照します。
+    """
+    account = await TargetAccount.filter(
+        id=account_id,
+        user=current_user,
+    ).first()
+
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='指定されたターゲットアカウントが見つかりません',
+        )
+
+    until = activity_day(int(time.time()))
+    since = until - timedelta(days=days - 1)
+    daily_stats = await TargetAccountDailyStats.filter(
+        target_account_id=account.id, day__gte=since
+    ).order_by('day')
+    summary = summarize_daily_stats(daily_stats, days)
+
+    return TargetAccountStatsResponse(
+        account_id=account.id,
+        since=since,
+        until=until,
+        tweet_count=summary.tweet_count,
+        tweets_per_day=summary.tweets_per_day,
+        average_likes=summary.average_likes,
+        average_retweets=summary.average_retweets,
+        media_ratio=summary.media_ratio,
+        daily=[
+            TargetAccountDailyStatsResponse.model_validate(stats)
+            for stats in daily_stats
+        ],
+    )
+
+
+def _archives_in_range(
+    target_account_id: int, since: int | None, until: int | None
+) -> QuerySet:
+    """投稿日時の範囲 [since, until) と重なるアーカイブのクエリセットを生成する"""
+    query = TweetArchive.filter(target_account_id=target_account_id)
+    if since is not None:
+        query = query.filter(last_posted_at__gte=since)
+    if until is not None:
+        query = query.filter(first_posted_at__lt=until)
+    return query.order_by('first_posted_at', 'id')
+
+
+@router.get('/{account_id}/archives', response_model=TweetArchiveListResponse)
+async def TargetAccountArchiveListAPI(
+    account_id: int,
+    since: int | None = Query(
+        None, description='この投稿日時（Unix timestamp）以降のツイートを含むもの'
+    ),
+    until: int | None = Query(
+        None, description='この投稿日時（Unix timestamp）より前のツイートを含むもの'
+    ),
+    current_user: User = Depends(get_current_user),
+) -> TweetArchiveListResponse:
+    """
+    ターゲットアカウントのアーカイブ一覧取得 API
+
+    保持期間を過ぎて DB から削除したツイートのアーカイブファイルのうち、
+    指定された投稿日時の範囲と重なるものを取得します。
+    """
+    account = await TargetAccount.filter(
+        id=account_id,
+        user=current_user,
+    ).first()
+
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='指定されたターゲットアカウントが見つかりません',
+        )
+
+    archives = await _archives_in_range(account.id, since, until)
+    return TweetArchiveListResponse(
+        archives=[TweetArchiveResponse.model_validate(archive) for archive in archives],
+        total=len(archives),
+    )
+
+
+@router.get('/{account_id}/archives/tweets', response_model=ArchivedTweetsResponse)
+async def TargetAccountArchivedTweetsAPI(
+    account_id: int,
+    since: int | None = Query(
+        None, description='この投稿日時（Unix timestamp）以降のツイートを取得'
+    ),
+    until: int | None = Query(
+        None, description='この投稿日時（Unix timestamp）より前のツイートを取得'
+    ),
+    current_user: User = Depends(get_current_user),
+) -> ArchivedTweetsResponse:
+    """
+    アーカイブ済みツイート読み戻し API
+
+    指定された投稿日時の範囲と重なるアーカイブファイルだけを読み込み、
+    範囲内のツイートを返します。読み込むファイル数が多すぎる場合は範囲を狭めてください。
+    """
+    account = await TargetAccount.filter(
+        id=account_id,
+        user=current_user,
+    ).first()
+
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='指定されたターゲットアカウントが見つかりません',
+        )
+
+    archives = await _archives_in_range(account.id, since, until).limit(
+        TWEET_ARCHIVE_READ_MAX_OBJECTS + 1
+    )
+    if len(archives) > TWEET_ARCHIVE_READ_MAX_OBJECTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f'読み込むアーカイブが {TWEET_ARCHIVE_READ_MAX_OBJECTS} 件を超えるため、'
+                '期間を狭めてください'
+            ),
+        )
+
+    tweets = []
+    for archive in archives:
+        archived_tweets = await load_archived_tweets(archive)
+        if archived_tweets is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='アーカイブファイルを取得できませんでした',
+            )
+        tweets.extend(
+            tweet
+            for tweet in archived_tweets
+            if (since is None or tweet['posted_at'] >= since)
+            and (until is None or tweet['posted_at'] < until)
+        )
+
+    return ArchivedTweetsResponse(tweets=tweets, archive_count=len(archives))
+
+
 @router.get('/scheduler/status')
 async def SchedulerStatusAPI(
     current_user: User = Depends(get_current_user),
@@ -1,12 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.constants import (
+    TIMELINE_FEED_ENABLED,
+    TOP_WINDOW_HOURS_DEFAULT,
+    TOP_WINDOW_HOURS_MAX,
+    TREND_LIMIT_DEFAULT,
+    TREND_LIMIT_MAX,
+    TREND_WINDOW_DEFAULT,
+    TWEET_STREAM_KEEPALIVE_SECONDS,
+    TWEET_STREAM_RETRY_MILLISECONDS,
+)
 from app.models.target_account import TargetAccount
 from app.models.timeline import Timeline
+from app.models.timeline_entry import TimelineEntry
 from app.models.tweet import Tweet
 from app.models.user import User
-from app.routers.tweets import TweetResponse, create_tweet_response
+from app.routers.tweets import (
+    TweetFieldset,
+    TweetResponse,
+    create_tweet_responses,
+    create_tweet_rows,
+    get_tweet_fieldset,
+    get_tweet_versions,
+)
+from app.services.hashtag_trends import (
+    get_trending_hashtags,
+    hashtag_bucket,
+    parse_trend_window,
+)
+from app.services.membership_cache import (
+    TimelineMembership,
+    bump_membership_version,
+    get_user_membership,
+)
+from app.services.read_state import count_unread_tweets, filter_unread
+from app.services.timeline_feed import (
+    get_entry_tweets,
+    sync_timeline_entries,
+)
+from app.services.tweet_count import TotalMode, resolve_tweet_total
+from app.services.tweet_pubsub import (
+    TweetNotification,
+    tweet_pubsub,
+)
 from app.utils.auth import get_current_user
+from app.utils.engagement_score import TweetSort, filter_top_window
+from app.utils.etag import (
+    build_etag,
+    is_not_modified,
+    not_modified_response,
+    set_etag_headers,
+)
+from app.utils.fast_json import FastJSONResponse
+from app.utils.pagination import paginate
+from app.utils.share_dedupe import filter_duplicate_shares
 
 router = APIRouter(prefix='/api/v1/timelines', tags=['timelines'])
 
@@ -73,21 +126,55 @@ class TimelineListResponse(BaseModel):
     total: int = Field(..., description='タイムライン総数')
 
 
+class TimelineUnreadCountResponse(BaseModel):
+    """タイムラインの未読ツイート数レスポンス"""
+
+    timeline_id: int = Field(..., description='タイムライン ID')
+    unread_count: int = Field(..., description='未読ツイート数')
+
+
+class TimelineUnreadCountsResponse(BaseModel):
+    """タイムライン別未読ツイート数一覧レスポンス"""
+
+    timelines: list[TimelineUnreadCountResponse] = Field(
+        ..., description='アクティブなタイムライン別の未読ツイート数一覧'
+    )
+
+
+class TimelineTweetResponse(TweetResponse):
+    """タイムライン内のツイート情報レスポンス"""
+
+    shared_by: list[TargetAccountSummary] | None = Field(
+        None,
+        description='同じ元ツイートを共有したアカウント（dedupe=true の場合のみ、共有の新しい順）',
+    )
+
+
 class TimelineTweetsResponse(BaseModel):
     """タイムライン内ツイート一覧レスポンス"""
 
     timeline: TimelineResponse = Field(..., description='タイムライン情報')
-    tweets: list[TweetResponse] = Field(..., description='ツイート一覧')
-    total: int = Field(..., description='総ツイート数')
+    tweets: list[TimelineTweetResponse] = Field(..., description='ツイート一覧')
+    total: int | None = Field(
+        None, description='総ツイート数（include_total=false の場合は null）'
+    )
     page: int = Field(..., description='現在のページ番号')
     page_size: int = Field(..., description='1ページあたりのツイート数')
     has_next: bool = Field(..., description='次のページが存在するかどうか')
+    next_cursor: str | None = Field(
+        None, description='次（より古い）ページを取得するためのカーソル'
+    )
+    prev_cursor: str | None = Field(
+        None, description='前（より新しい）ページを取得するためのカーソル'
+    )
 
 
-async def create_timeline_response(timeline: Timeline) -> TimelineResponse:
-    """Timeline モデルから TimelineResponse を生成する"""
-    # ターゲットアカウント情報を取得
-    target_accounts = await timeline.target_accounts.all()
+def create_timeline_response(timeline: Timeline) -> TimelineResponse:
+    """
+    Timeline モデルから TimelineResponse を生成する
+
+    クエリを発行しないよう、target_accounts は prefetch 済みのものを使う。
+    """
     target_account_summaries = [
         TargetAccountSummary(
             id=account.id,
@@ -96,7 +183,7 @@ async def create_timeline_response(timeline: Timeline) -> TimelineResponse:
             profile_image_url=account.profile_image_url,
             is_active=account.is_active,
         )
-        for account in target_accounts
+        for account in timeline.target_accounts
     ]
 
     return TimelineResponse(
@@ -111,6 +198,32 @@ async def create_timeline_response(timeline: Timeline) -> TimelineResponse:
     )
 
 
+async def _get_timeline_membership(
+    current_user: User, timeline_id: int
+) -> TimelineMembership:
+    """
+    ユーザーのアクティブなタイムラインとその所属関係を所属関係キャッシュから取得する
+
+    Args:
+        current_user: 現在のユーザー
+        timeline_id: タイムライン ID
+
+    Returns:
+        TimelineMembership: タイムラインとそれに所属するターゲットアカウント
+
+    Raises:
+        HTTPException: タイムラインが見つからない（または非アクティブな）場合
+    """
+    membership = await get_user_membership(current_user)
+    timeline_membership = membership.timelines.get(timeline_id)
+    if not timeline_membership:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='指定されたタイムラインが見つかりません',
+        )
+    return timeline_membership
+
+
 @router.post('', response_model=TimelineResponse)
 async def TimelineCreateAPI(
     request: TimelineCreateRequest,
@@ -150,8 +263,15 @@ async def TimelineCreateAPI(
 
     # ターゲットアカウントとの関連付け
     await timeline.target_accounts.add(*target_accounts)
+    await timeline.fetch_related('target_accounts')
+
+    # マテリアライズドフィードに既存ツイートを埋め戻す
+    await sync_timeline_entries(
+        timeline.id, {account.id for account in target_accounts}, set()
+    )
+    await bump_membership_version(current_user.id)
 
-    return await create_timeline_response(timeline)
+    return create_timeline_response(timeline)
 
 
 @router.get('', response_model=TimelineListResponse)
@@ -163,13 +283,12 @@ async def TimelineListAPI(
 
     現在のユーザーが作成したタイムライン一覧を取得します。
     """
+    # タイムラインと全タイムラインのターゲットアカウントをそれぞれ 1 回のクエリで取得する
     timelines = await Timeline.filter(user=current_user).prefetch_related(
         'target_accounts'
     )
 
-    timeline_responses = []
-    for timeline in timelines:
-        timeline_responses.append(await create_timeline_response(timeline))
+    timeline_responses = [create_timeline_response(timeline) for timeline in timelines]
 
     return TimelineListResponse(
         timelines=timeline_responses,
@@ -177,6 +296,45 @@ async def TimelineListAPI(
     )
 
 
+@router.get('/unread-counts', response_model=TimelineUnreadCountsResponse)
+async def TimelineUnreadCountsAPI(
+    current_user: User = Depends(get_current_user),
+) -> TimelineUnreadCountsResponse:
+    """
+    タイムライン別未読ツイート数取得 API
+
+    現在のユーザーのアクティブなタイムラインごとの未読ツイート数を取得します。
+    全タイムラインのターゲットアカウントの未読数を 1 回の集計クエリで数え、
+    タイムラインごとに合算します（既読化・新着ツイートの取り込みまではキャッシュを返します）。
+    タイムライン内ツイート取得 API と同じく、非アクティブなものを含む全アカウントを数えます。
+    """
+    membership = await get_user_membership(current_user)
+    timelines = sorted(membership.timelines.items())
+
+    # 複数のタイムラインに所属するアカウントも 1 回だけ数える
+    unread_counts = await count_unread_tweets(
+        current_user,
+        [
+            account_id
+            for _, timeline_membership in timelines
+            for account_id in timeline_membership.target_account_ids
+        ],
+    )
+
+    return TimelineUnreadCountsResponse(
+        timelines=[
+            TimelineUnreadCountResponse(
+                timeline_id=timeline_id,
+                unread_count=sum(
+                    unread_counts[account_id]
+                    for account_id in timeline_membership.target_account_ids
+                ),
+            )
+            for timeline_id, timeline_membership in timelines
+        ]
+    )
+
+
 @router.get('/{timeline_id}', response_model=TimelineResponse)
 async def TimelineDetailAPI(
     timeline_id: int,
@@ -202,7 +360,7 @@ async def TimelineDetailAPI(
             detail='指定されたタイムラインが見つかりません',
         )
 
-    return await create_timeline_response(timeline)
+    return create_timeline_response(timeline)
 
 
 @router.put('/{timeline_id}', response_model=TimelineResponse)
@@ -261,13 +419,26 @@ async def TimelineUpdateAPI(
                 detail='指定されたターゲットアカウントの一部が見つかりません',
             )
 
+        # 変更前のアカウント構成を控えておく（フィードの差分反映用）
+        previous_account_ids = {account.id for account in timeline.target_accounts}
+
         # 既存の関連を削除し、新しい関連を追加
         await timeline.target_accounts.clear()
         await timeline.target_accounts.add(*target_accounts)
+        await timeline.fetch_related('target_accounts')
+
+        # アカウント構成の差分をマテリアライズドフィードに反映
+        current_account_ids = {account.id for account in target_accounts}
+        await sync_timeline_entries(
+            timeline.id,
+            added_account_ids=current_account_ids - previous_account_ids,
+            removed_account_ids=previous_account_ids - current_account_ids,
+        )
 
     await timeline.save()
+    await bump_membership_version(current_user.id)
 
-    return await create_timeline_response(timeline)
+    return create_timeline_response(timeline)
 
 
 @router.delete('/{timeline_id}')
@@ -292,47 +463,112 @@ async def TimelineDeleteAPI(
         )
 
     await timeline.delete()
+    await bump_membership_version(current_user.id)
 
     return {'message': 'タイムラインを削除しました'}
 
 
+async def _add_shared_by(
+    tweet_rows: list[dict[str, Any]],
+    tweets: list[Tweet],
+    target_accounts: list[TargetAccount],
+) -> None:
+    """
+    重複排除したツイートの dict に、同じ元ツイートを共有したアカウントを 1 回のクエリで付与する
+
+    Args:
+        tweet_rows: create_tweet_rows() で生成したツイートの dict（tweets と同じ順序）
+        tweets: 重複排除済みのツイート一覧
+        target_accounts: タイムラインに含まれるターゲットアカウント
+    """
+    accounts = {account.id: account for account in target_accounts}
+    shares = (
+        await Tweet.filter(
+            dedupe_key__in=list(
+                {tweet.dedupe_key for tweet in tweets if tweet.dedupe_key}
+            ),
+            target_account_id__in=list(accounts),
+            is_quoted=False,
+        )
+        .order_by('-posted_at', '-id')
+        .values_list('dedupe_key', 'target_account_id')
+    )
+
+    # 重複排除キー -> 共有したアカウント ID（共有の新しい順、重複なし）
+    sharing_account_ids: dict[str, list[int]] = {}
+    for dedupe_key, target_account_id in shares:
+        account_ids = sharing_account_ids.setdefault(dedupe_key, [])
+        if target_account_id not in account_ids:
+            account_ids.append(target_account_id)
+
+    for tweet_row, tweet in zip(tweet_rows, tweets, strict=True):
+        tweet_row['shared_by'] = [
+            {
+                'id': account_id,
+                'username': accounts[account_id].username,
+                'display_name': accounts[account_id].display_name,
+                'profile_image_url': accounts[account_id].profile_image_url,
+                'is_active': accounts[account_id].is_active,
+            }
+            for account_id in sharing_account_ids.get(tweet.dedupe_key, [])
+        ]
+
+
 @router.get('/{timeline_id}/tweets', response_model=TimelineTweetsResponse)
 async def TimelineTweetsAPI(
     timeline_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1, description='ページ番号'),
     page_size: int = Query(20, ge=1, le=100, description='1ページあたりのツイート数'),
-) -> TimelineTweetsResponse:
+    cursor: str | None = Query(
+        None,
+        description='キーセットページネーション用のカーソル（指定時は page を無視）',
+    ),
+    include_total: TotalMode = Query(
+        'estimate',
+        description='総数の算出方法（false: 算出しない / estimate: 取り込み時カウンターの合計 / exact: 全件カウント）',
+    ),
+    sort: TweetSort = Query(
+        'latest',
+        description='並び順（latest: 新しい順 / top: エンゲージメントスコア順）',
+    ),
+    window_hours: int = Query(
+        TOP_WINDOW_HOURS_DEFAULT,
+        ge=1,
+        le=TOP_WINDOW_HOURS_MAX,
+        description='sort=top の集計期間（直近何時間のツイートを対象にするか）',
+    ),
+    unread_only: bool = Query(
+        False, description='未読のツイートのみを取得するかどうか'
+    ),
+    dedupe: bool = Query(
+        False,
+        description='同じ元ツイートの複数アカウントによる共有（リツイート）を 1 件にまとめるかどうか',
+    ),
+    fieldset: TweetFieldset = Depends(get_tweet_fieldset),
+) -> TimelineTweetsResponse | Response:
     """
     タイムライン内ツイート取得 API
 
     指定されたタイムラインに含まれるターゲットアカウントからのツイートを取得します。
+    sort=top の場合は直近 window_hours 時間のツイートをエンゲージメントスコア順に返します。
+    unread_only=true の場合は既読にしたツイートを除外します。
+    dedupe=true の場合は同じ元ツイートの共有のうち最も新しいものだけを返し、
+    共有したアカウントの一覧を shared_by に含めます。
+    ETag を返し、If-None-Match が一致する場合は 304 Not Modified を返します。
     """
-    # タイムライン存在確認
-    timeline = (
-        await Timeline.filter(
-            id=timeline_id,
-            user=current_user,
-            is_active=True,
-        )
-        .prefetch_related('target_accounts')
-        .first()
-    )
-
-    if not timeline:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='指定されたタイムラインが見つかりません',
-        )
+    # タイムライン存在確認（所属関係キャッシュから）
+    timeline_membership = await _get_timeline_membership(current_user, timeline_id)
+    timeline = timeline_membership.timeline
 
     # タイムラインに含まれるターゲットアカウントIDを取得
-    target_account_ids = [
-        account.id for account in await timeline.target_accounts.all()
-    ]
+    target_account_ids = timeline_membership.target_account_ids
 
     if not target_account_ids:
         # ターゲットアカウントが設定されていない場合
-        timeline_response = await create_timeline_response(timeline)
+        timeline_response = create_timeline_response(timeline)
         return TimelineTweetsResponse(
             timeline=timeline_response,
             tweets=[],
@@ -342,37 +578,315 @@ async def TimelineTweetsAPI(
             has_next=False,
         )
 
-    # ツイート一覧を取得（ページネーション付き）
-    # is_quoted=False のツイートのみを取得（引用元ツイートを除外）
-    offset = (page - 1) * page_size
-    tweets_query = (
-        Tweet.filter(target_account_id__in=target_account_ids, is_quoted=False)
-        .select_related('target_account')
-        .order_by('-posted_at')
+    # sort=top の場合は期間内のスコア順に並べる
+    # 期間内・未読のみ・重複排除後の件数はカウンターで表せないため、総数は数える
+    sort_field = 'engagement_score' if sort == 'top' else 'posted_at'
+    total_account_ids = (
+        None if sort == 'top' or unread_only or dedupe else target_account_ids
+    )
+
+    if TIMELINE_FEED_ENABLED:
+        # マテリアライズドフィードから (sort_field, tweet_id) の範囲スキャンで取得
+        entries_query = TimelineEntry.filter(timeline_id=timeline.id)
+        if sort == 'top':
+            entries_query = filter_top_window(entries_query, window_hours)
+        if unread_only:
+            entries_query = filter_unread(
+                entries_query, current_user.id, tweet_id_column='tweet_id'
+            )
+        if dedupe:
+            entries_query = filter_duplicate_shares(
+                entries_query, target_account_ids, tweet_id_column='tweet_id'
+            )
+        total_tweets = await resolve_tweet_total(
+            include_total, entries_query, total_account_ids
+        )
+        tweets_page = await paginate(
+            entries_query, sort_field, page, page_size, cursor, id_field='tweet_id'
+        )
+        tweets = await get_entry_tweets(tweets_page.items)
+    else:
+        # ツイート一覧を取得（ページネーション付き）
+        # is_quoted=False のツイートのみを取得（引用元ツイートを除外）
+        tweets_query = Tweet.filter(
+            target_account_id__in=target_account_ids, is_quoted=False
+        ).select_related('target_account', 'quoted_tweet_ref__target_account')
+        if sort == 'top':
+            tweets_query = filter_top_window(tweets_query, window_hours)
+        if unread_only:
+            tweets_query = filter_unread(tweets_query, current_user.id)
+        if dedupe:
+            tweets_query = filter_duplicate_shares(tweets_query, target_account_ids)
+
+        # 総数を取得（既定では取り込み時カウンターの合計を使い、COUNT(*) は発行しない）
+        total_tweets = await resolve_tweet_total(
+            include_total, tweets_query, total_account_ids
+        )
+
+        # ページネーション適用（カーソル指定時は (sort_field, id) でシーク）
+        tweets_page = await paginate(tweets_query, sort_field, page, page_size, cursor)
+        tweets = tweets_page.items
+
+    # ページ内容が変わっていなければメディア・引用元ツイートを取得せずに 304 を返す
+    etag = build_etag(
+        str(request.query_params),
+        current_user.id,
+        current_user.tweet_state_version,
+        timeline.id,
+        current_user.membership_version,
+        total_tweets,
+        tweets_page.has_next,
+        get_tweet_versions(tweets),
     )
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag_headers(response, etag)
+
+    # レスポンス生成（メディア・既読状態などはページ単位で一括取得）
+    tweet_rows = await create_tweet_rows(tweets, current_user, fieldset)
+
+    # 重複排除した場合は、同じ元ツイートを共有したアカウントを付与する
+    if dedupe:
+        await _add_shared_by(tweet_rows, tweets, timeline.target_accounts)
+
+    timeline_response = create_timeline_response(timeline)
+
+    # TimelineTweetsResponse と同じ形式の dict を検証なしで直接シリアライズする
+    return FastJSONResponse(
+        {
+            'timeline': timeline_response.model_dump(mode='json'),
+            'tweets': tweet_rows,
+            'total': total_tweets,
+            'page': page,
+            'page_size': page_size,
+            'has_next': tweets_page.has_next,
+            'next_cursor': tweets_page.next_cursor,
+            'prev_cursor': tweets_page.prev_cursor,
+        },
+        headers=dict(response.headers),
+    )
+
 
-    # 総数を取得
-    total_tweets = await tweets_query.count()
+class TrendingHashtagResponse(BaseModel):
+    """トレンドのハッシュタグ情報レスポンス"""
 
-    # ページネーション適用
-    tweets = await tweets_query.offset(offset).limit(page_size).all()
+    tag: str = Field(..., description='正規化したハッシュタグ（先頭の # なし）')
+    count: int = Field(..., description='集計期間内にハッシュタグを含むツイート数')
 
-    # 次のページが存在するかチェック
-    has_next = offset + page_size < total_tweets
 
-    # レスポンス生成
-    tweet_responses = []
-    for tweet in tweets:
-        tweet_response = await create_tweet_response(tweet, current_user)
-        tweet_responses.append(tweet_response)
+class TimelineTrendsResponse(BaseModel):
+    """タイムラインのトレンド取得レスポンス"""
+
+    timeline_id: int = Field(..., description='タイムライン ID')
+    window: str = Field(..., description='集計期間')
+    since: int = Field(
+        ..., description='集計期間の開始日時（Unix timestamp、時間単位で切り捨て）'
+    )
+    trends: list[TrendingHashtagResponse] = Field(
+        ..., description='出現数の多い順のハッシュタグ一覧'
+    )
+
+
+@router.get('/{timeline_id}/trends', response_model=TimelineTrendsResponse)
+async def TimelineTrendsAPI(
+    timeline_id: int,
+    current_user: User = Depends(get_current_user),
+    window: str = Query(
+        TREND_WINDOW_DEFAULT,
+        description='集計期間（数値 + 単位 h: 時間 / d: 日、例: 24h, 7d）',
+    ),
+    limit: int = Query(
+        TREND_LIMIT_DEFAULT,
+        ge=1,
+        le=TREND_LIMIT_MAX,
+        description='取得するハッシュタグ数',
+    ),
+) -> TimelineTrendsResponse:
+    """
+    タイムラインのトレンド取得 API
+
+    タイムラインに含まれるターゲットアカウントの直近 window のツイートで
+    よく使われているハッシュタグを、出現数の多い順に取得します。
+    取り込み時に加算した時間単位のカウンターを合算するため、ツイートは参照しません。
+    """
+    try:
+        window_seconds = parse_trend_window(window)
+    except ValueError as ex:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='集計期間の指定が不正です',
+        ) from ex
+
+    # タイムライン存在確認（所属関係キャッシュから）
+    timeline_membership = await _get_timeline_membership(current_user, timeline_id)
+
+    # タイムライン内ツイート取得 API と同じターゲットアカウントIDで集計する
+    target_account_ids = timeline_membership.target_account_ids
+
+    since = int(time.time()) - window_seconds
+    trends = await get_trending_hashtags(target_account_ids, since, limit)
+
+    return TimelineTrendsResponse(
+        timeline_id=timeline_membership.timeline.id,
+        window=window,
+        since=hashtag_bucket(since),
+        trends=[TrendingHashtagResponse(**trend) for trend in trends],
+    )
 
-    timeline_response = await create_timeline_response(timeline)
 
-    return TimelineTweetsResponse(
-        timeline=timeline_response,
-        tweets=tweet_responses,
-        total=total_tweets,
-        page=page,
-        page_size=page_size,
-        has_next=has_next,
+class NewTweetSummary(BaseModel):
+    """ストリーミング API で通知する新着ツイートの概要"""
+
+    id: int = Field(..., description='ツイートの内部 ID')
+    tweet_id: str = Field(..., description='Twitter のツイート ID')
+    posted_at: int = Field(..., description='ツイートされた日時（Unix timestamp）')
+
+
+class TimelineStreamTweetsEvent(BaseModel):
+    """ストリーミング API の tweets イベントのデータ"""
+
+    target_account_id: int = Field(
+        ..., description='ツイートを取り込んだターゲットアカウントの ID'
+    )
+    tweets: list[TweetResponse] | list[NewTweetSummary] = Field(
+        ..., description='新着ツイート（hydrate=true の場合は完全なツイート情報）'
+    )
+
+
+def _format_sse_event(event: str, data: str) -> str:
+    """Server-Sent Events のイベント 1 件分の文字列を生成する"""
+    return f'event: {event}\ndata: {data}\n\n'
+
+
+async def _create_stream_event(
+    notification: TweetNotification, current_user: User, hydrate: bool
+) -> str:
+    """新着ツイート通知から tweets イベントを生成する"""
+    # 新しい順に並べる（一覧 API と同じ並び順）
+    tweets = sorted(
+        notification.tweets,
+        key=lambda tweet: (tweet.posted_at, tweet.id),
+        reverse=True,
+    )
+    if hydrate:
+        tweet_items = await create_tweet_responses(tweets, current_user)
+    else:
+        tweet_items = [
+            NewTweetSummary(
+                id=tweet.id, tweet_id=tweet.tweet_id, posted_at=tweet.posted_at
+            )
+            for tweet in tweets
+        ]
+
+    event = TimelineStreamTweetsEvent(
+        target_account_id=notification.target_account_id, tweets=tweet_items
+    )
+    return _format_sse_event('tweets', event.model_dump_json())
+
+
+async def _reload_stream_state(
+    user_id: int, timeline_id: int
+) -> tuple[User, TimelineMembership] | None:
+    """
+    ストリームのユーザーとタイムラインの所属関係を読み込み直す
+
+    Returns:
+        tuple[User, TimelineMembership] | None: (最新のユーザー, タイムラインの所属関係)
+            （ユーザーまたはアクティブなタイムラインが存在しない場合は None）
+    """
+    user = await User.get_or_none(id=user_id)
+    if user is None:
+        return None
+    membership = await get_user_membership(user)
+    timeline_membership = membership.timelines.get(timeline_id)
+    if timeline_membership is None:
+        return None
+    return user, timeline_membership
+
+
+async def _stream_timeline_events(
+    timeline_membership: TimelineMembership, current_user: User, hydrate: bool
+) -> AsyncIterator[str]:
+    """
+    タイムラインの新着ツイート通知を SSE として順次出力する
+
+    消費が追いつかずに通知が破棄された場合は resync イベントを送り、
+    クライアントに一覧 API での再取得を促す。
+    通知・キープアライブのたびにユーザーと所属関係を読み込み直し、
+    既読状態のバージョンを最新に保つ。タイムラインが削除（または非アクティブに）された場合は
+    ストリームを終了し、アカウント構成が変わった場合は購読し直して resync イベントを送る。
+
+    Args:
+        timeline_membership: 接続時のタイムラインの所属関係
+        current_user: 現在のユーザー
+        hydrate: ツイートを完全な情報で送るかどうか
+
+    Yields:
+        str: SSE のイベントまたはコメント行
+    """
+    yield f'retry: {TWEET_STREAM_RETRY_MILLISECONDS}\n\n'
+
+    timeline_id = timeline_membership.timeline.id
+    target_account_ids = timeline_membership.target_account_ids
+    resubscribed = False
+    while True:
+        # クライアント切断時はジェネレーターが中断され、購読も解除される
+        with tweet_pubsub.subscribe(target_account_ids) as subscription:
+            if resubscribed:
+                # 購読し直す間の通知は届かないため、再取得を促す
+                yield _format_sse_event('resync', '{}')
+
+            while True:
+                notification = await subscription.get(TWEET_STREAM_KEEPALIVE_SECONDS)
+
+                state = await _reload_stream_state(current_user.id, timeline_id)
+                if state is None:
+                    return
+                current_user, timeline_membership = state
+                if (
+                    frozenset(timeline_membership.target_account_ids)
+                    != subscription.target_account_ids
+                ):
+                    target_account_ids = timeline_membership.target_account_ids
+                    resubscribed = True
+                    break
+
+                if subscription.overflowed:
+                    subscription.reset_overflow()
+                    yield _format_sse_event('resync', '{}')
+                    continue
+
+                if notification is None:
+                    # 中継サーバーに切断されないよう、通知がない間も定期的にコメント行を送る
+                    yield ': keepalive\n\n'
+                    continue
+
+                yield await _create_stream_event(notification, current_user, hydrate)
+
+
+@router.get('/{timeline_id}/stream')
+async def TimelineStreamAPI(
+    timeline_id: int,
+    current_user: User = Depends(get_current_user),
+    hydrate: bool = Query(
+        False,
+        description='新着ツイートを完全な情報で送るかどうか（false の場合は ID のみ）',
+    ),
+) -> StreamingResponse:
+    """
+    タイムライン新着ツイートストリーミング API
+
+    タイムラインのターゲットアカウントで新しく取り込まれたツイートを
+    Server-Sent Events（tweets イベント）で配信します。
+    通知が破棄された場合は resync イベントを送るため、クライアントは一覧 API で再取得してください。
+    タイムラインのアカウント構成が変わった場合は購読し直して resync イベントを送り、
+    タイムラインが削除された場合はストリームを終了します。
+    """
+    # タイムライン存在確認（所属関係キャッシュから）
+    timeline_membership = await _get_timeline_membership(current_user, timeline_id)
+
+    return StreamingResponse(
+        _stream_timeline_events(timeline_membership, current_user, hydrate),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
     )
@@ -1,22 +1,57 @@
 import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict, Field
-
-from app.constants import MEDIA_STATUS_COMPLETED
+from pydantic_core import to_json
+from tortoise.expressions import Q
+from tortoise.queryset import QuerySet
+
+from app.constants import (
+    BULK_READ_MAX_TWEET_IDS,
+    EXPORT_CHUNK_SIZE,
+    MEDIA_STATUS_COMPLETED,
+    SEARCH_QUERY_MAX_LENGTH,
+    TOP_WINDOW_HOURS_DEFAULT,
+    TOP_WINDOW_HOURS_MAX,
+)
 
 # バックグラウンドタスクの参照を保持するためのセット
 _background_tasks: set[asyncio.Task] = set()
 from app.models.bookmarked_tweet import BookmarkedTweet
 from app.models.media import Media
-from app.models.read_tweet import ReadTweet
-from app.models.target_account import TargetAccount
-from app.models.timeline import Timeline
 from app.models.tweet import Tweet
 from app.models.user import User
+from app.services.membership_cache import get_user_membership
+from app.services.read_state import (
+    ReadWatermarks,
+    filter_unread,
+    get_read_watermarks,
+    mark_range_read,
+    mark_tweets_read,
+)
+from app.services.tweet_count import TotalMode, resolve_tweet_total
+from app.services.tweet_state_cache import (
+    TweetIdSet,
+    bump_tweet_state_version,
+    tweet_state_cache,
+)
 from app.utils.auth import get_current_user
+from app.utils.engagement_score import TweetSort, filter_top_window
+from app.utils.etag import (
+    build_etag,
+    is_not_modified,
+    not_modified_response,
+    set_etag_headers,
+)
+from app.utils.fast_json import FastJSONResponse
 from app.utils.media_downloader import process_single_media
+from app.utils.pagination import decode_cursor, iterate_by_cursor, paginate
 from app.utils.s3_client import get_media_public_url
+from app.utils.text_search import extract_bigrams, parse_search_query
 
 router = APIRouter(prefix='/api/v1/tweets', tags=['tweets'])
 
@@ -118,192 +153,439 @@ class TweetResponse(BaseModel):
     is_bookmarked: bool = Field(False, description='ブックマーク済みかどうか')
 
 
-async def get_tweet_media_info(tweet_id: int) -> list[MediaResponse]:
-    """指定されたツイートのメディア情報を取得"""
-    # ダウンロード状態に関係なく全メディア情報を取得
-    media_items = await Media.filter(tweet_id=tweet_id).all()
+# TweetResponse の全フィールド名
+TWEET_RESPONSE_FIELDS = frozenset(TweetResponse.model_fields)
 
-    media_responses = []
-    for media in media_items:
-        # MinIOにダウンロード済みならMinIO URL、未ダウンロードならTwitterオリジナルURL
-        if media.is_downloaded == MEDIA_STATUS_COMPLETED:
-            media_url = get_media_public_url(media.media_key)
-        else:
-            media_url = media.media_url  # TwitterオリジナルURL
-
-        media_response = MediaResponse(
-            media_key=media.media_key,
-            media_type=media.media_type,
-            media_url=media_url,
-            width=media.width,
-            height=media.height,
-            alt_text=media.alt_text,
-            duration_ms=media.duration_ms,
+# 一覧 API の include パラメータで指定できる関連データと、対応する TweetResponse のフィールド
+TWEET_INCLUDE_FIELDS: dict[str, frozenset[str]] = {
+    'media': frozenset({'media'}),
+    'quoted': frozenset({'quoted_tweet'}),
+    'flags': frozenset({'is_read', 'is_bookmarked'}),
+}
+
+
+@dataclass(frozen=True)
+class TweetFieldset:
+    """一覧 API のレスポンスに含める TweetResponse のフィールド（スパースフィールドセット）"""
+
+    fields: frozenset[str] = TWEET_RESPONSE_FIELDS
+
+    @property
+    def is_full(self) -> bool:
+        """全フィールドを含むかどうか"""
+        return self.fields == TWEET_RESPONSE_FIELDS
+
+    @property
+    def media(self) -> bool:
+        """メディア情報を取得する必要があるかどうか"""
+        return 'media' in self.fields
+
+    @property
+    def quoted(self) -> bool:
+        """引用元ツイートを取得する必要があるかどうか"""
+        return 'quoted_tweet' in self.fields
+
+    @property
+    def is_read(self) -> bool:
+        """既読状態を取得する必要があるかどうか"""
+        return 'is_read' in self.fields
+
+    @property
+    def is_bookmarked(self) -> bool:
+        """ブックマーク状態を取得する必要があるかどうか"""
+        return 'is_bookmarked' in self.fields
+
+
+def _parse_comma_separated(
+    value: str, allowed: frozenset[str], label: str
+) -> frozenset[str]:
+    """カンマ区切りの指定値を検証して集合に変換する"""
+    names = frozenset(name.strip() for name in value.split(',') if name.strip())
+    unknown = names - allowed
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'不明な{label}が指定されています: {", ".join(sorted(unknown))}',
         )
-        media_responses.append(media_response)
+    return names
 
-    return media_responses
 
+def get_tweet_fieldset(
+    include: str | None = Query(
+        None,
+        description='含める関連データ（media, quoted, flags のカンマ区切り。未指定時はすべて）',
+    ),
+    fields: str | None = Query(
+        None,
+        description='含める TweetResponse のフィールド名（カンマ区切り。未指定時はすべて）',
+    ),
+) -> TweetFieldset:
+    """
+    一覧 API の include / fields パラメータからレスポンスに含めるフィールドを決定する
 
-async def create_tweet_response(
-    tweet: Tweet, current_user: User | None = None
-) -> TweetResponse:
-    """TweetモデルからTweetResponseを生成する（メディア情報込み）"""
-    # メディア情報を取得
-    media_info = await get_tweet_media_info(tweet.id)
+    含めない関連データ（メディア・引用元ツイート・既読/ブックマーク状態）は取得自体を省略する。
+    id はカーソルや既読化に必要なため常に含める。
 
-    # 既読・ブックマーク状態を取得（ユーザーが指定されている場合）
-    is_read = False
-    is_bookmarked = False
-    if current_user:
-        read_tweet = await ReadTweet.filter(user=current_user, tweet=tweet).first()
-        is_read = read_tweet is not None
-
-        bookmarked_tweet = await BookmarkedTweet.filter(
-            user=current_user, tweet=tweet
-        ).first()
-        is_bookmarked = bookmarked_tweet is not None
-
-    # 引用元ツイート情報を取得
-    quoted_tweet_response = None
-    if tweet.is_quote and tweet.quoted_tweet_id:
-        quoted_tweet = (
-            await Tweet.filter(tweet_id=tweet.quoted_tweet_id)
-            .select_related('target_account')
-            .first()
+    Raises:
+        HTTPException: 不明な関連データ名・フィールド名が指定された場合
+    """
+    selected = TWEET_RESPONSE_FIELDS
+    if fields is not None:
+        selected = _parse_comma_separated(fields, TWEET_RESPONSE_FIELDS, 'フィールド')
+    if include is not None:
+        includes = _parse_comma_separated(
+            include, frozenset(TWEET_INCLUDE_FIELDS), '関連データ'
         )
-        if quoted_tweet:
-            # 引用元ツイートのメディア情報を取得
-            quoted_media_info = await get_tweet_media_info(quoted_tweet.id)
-            quoted_tweet_response = TweetResponse(
-                id=quoted_tweet.id,
-                tweet_id=quoted_tweet.tweet_id,
-                content=quoted_tweet.content,
-                full_text=quoted_tweet.full_text,
-                lang=quoted_tweet.lang,
-                likes_count=quoted_tweet.likes_count,
-                retweets_count=quoted_tweet.retweets_count,
-                replies_count=quoted_tweet.replies_count,
-                quotes_count=quoted_tweet.quotes_count,
-                views_count=quoted_tweet.views_count,
-                bookmark_count=quoted_tweet.bookmark_count,
-                is_retweet=quoted_tweet.is_retweet,
-                is_quote=quoted_tweet.is_quote,
-                is_quoted=quoted_tweet.is_quoted,
-                retweeted_tweet_id=quoted_tweet.retweeted_tweet_id,
-                quoted_tweet_id=quoted_tweet.quoted_tweet_id,
-                is_reply=quoted_tweet.is_reply,
-                in_reply_to_tweet_id=quoted_tweet.in_reply_to_tweet_id,
-                in_reply_to_user_id=quoted_tweet.in_reply_to_user_id,
-                conversation_id=quoted_tweet.conversation_id,
-                hashtags=quoted_tweet.hashtags,
-                urls=quoted_tweet.urls,
-                user_mentions=quoted_tweet.user_mentions,
-                is_possibly_sensitive=quoted_tweet.is_possibly_sensitive,
-                has_media=quoted_tweet.has_media,
-                posted_at=quoted_tweet.posted_at,
-                created_at=quoted_tweet.created_at,
-                updated_at=quoted_tweet.updated_at,
-                # ターゲットアカウント情報（引用元ツイートの場合は元の作者情報）
-                target_account_id=quoted_tweet.target_account.id,
-                target_account_username=quoted_tweet.original_author_username
-                or quoted_tweet.target_account.username,
-                target_account_display_name=quoted_tweet.original_author_display_name
-                or quoted_tweet.target_account.display_name,
-                target_account_profile_image_url=quoted_tweet.original_author_profile_image_url
-                or quoted_tweet.target_account.profile_image_url,
-                # リツイート・引用ツイート情報
-                original_author_username=quoted_tweet.original_author_username,
-                original_author_display_name=quoted_tweet.original_author_display_name,
-                original_author_profile_image_url=quoted_tweet.original_author_profile_image_url,
-                # メディア情報
-                media=quoted_media_info,
-                # 引用元ツイート（再帰を避けるためNone）
-                quoted_tweet=None,
-                # ユーザー固有の情報
-                is_read=is_read,
-                is_bookmarked=is_bookmarked,
-            )
+        for name, related_fields in TWEET_INCLUDE_FIELDS.items():
+            if name not in includes:
+                selected -= related_fields
+
+    return TweetFieldset(fields=selected | {'id'})
+
+
+def _create_media_row(media: Media) -> dict[str, Any]:
+    """Media モデルから MediaResponse と同じ形式の dict を生成する"""
+    # MinIOにダウンロード済みならMinIO URL、未ダウンロードならTwitterオリジナルURL
+    if media.is_downloaded == MEDIA_STATUS_COMPLETED:
+        media_url = get_media_public_url(media.media_key)
+    else:
+        media_url = media.media_url  # TwitterオリジナルURL
+
+    return {
+        'media_key': media.media_key,
+        'media_type': media.media_type,
+        'media_url': media_url,
+        'width': media.width,
+        'height': media.height,
+        'alt_text': media.alt_text,
+        'duration_ms': media.duration_ms,
+    }
+
+
+async def get_tweets_media_info(
+    tweet_ids: list[int],
+) -> dict[int, list[dict[str, Any]]]:
+    """
+    複数ツイートのメディア情報を 1 クエリでまとめて取得する
+
+    Args:
+        tweet_ids: メディアを取得するツイートの ID 一覧
+
+    Returns:
+        dict: ツイート ID -> メディア情報一覧 のマッピング（メディアがなければ空リスト）
+    """
+    media_map: dict[int, list[dict[str, Any]]] = {
+        tweet_id: [] for tweet_id in tweet_ids
+    }
+    if not tweet_ids:
+        return media_map
+
+    # ダウンロード状態に関係なく全メディア情報を取得
+    media_items = await Media.filter(tweet_id__in=tweet_ids).order_by('id')
+    for media in media_items:
+        media_map.setdefault(media.tweet_id, []).append(_create_media_row(media))
+
+    return media_map
+
+
+def _build_tweet_row(
+    tweet: Tweet,
+    media: list[dict[str, Any]],
+    quoted_tweet: dict[str, Any] | None,
+    is_read: bool,
+    is_bookmarked: bool,
+    fieldset: TweetFieldset,
+    use_original_author: bool = False,
+) -> dict[str, Any]:
+    """
+    取得済みのデータから TweetResponse と同じ形式の dict を組み立てる（DB アクセスは行わない）
 
-    return TweetResponse(
-        id=tweet.id,
-        tweet_id=tweet.tweet_id,
-        content=tweet.content,
-        full_text=tweet.full_text,
-        lang=tweet.lang,
-        likes_count=tweet.likes_count,
-        retweets_count=tweet.retweets_count,
-        replies_count=tweet.replies_count,
-        quotes_count=tweet.quotes_count,
-        views_count=tweet.views_count,
-        bookmark_count=tweet.bookmark_count,
-        is_retweet=tweet.is_retweet,
-        is_quote=tweet.is_quote,
-        is_quoted=tweet.is_quoted,
-        retweeted_tweet_id=tweet.retweeted_tweet_id,
-        quoted_tweet_id=tweet.quoted_tweet_id,
-        is_reply=tweet.is_reply,
-        in_reply_to_tweet_id=tweet.in_reply_to_tweet_id,
-        in_reply_to_user_id=tweet.in_reply_to_user_id,
-        conversation_id=tweet.conversation_id,
-        hashtags=tweet.hashtags,
-        urls=tweet.urls,
-        user_mentions=tweet.user_mentions,
-        is_possibly_sensitive=tweet.is_possibly_sensitive,
-        has_media=tweet.has_media,
-        posted_at=tweet.posted_at,
-        created_at=tweet.created_at,
-        updated_at=tweet.updated_at,
+    ORM から取得した時点で型が確定している値をそのまま詰めるため、pydantic による検証は行わない。
+    キーと値の型は TweetResponse と一致させること。
+
+    Args:
+        tweet: select_related('target_account') 済みのツイート
+        media: ツイートに添付されたメディア情報
+        quoted_tweet: 引用元ツイートの dict
+        is_read: 既読済みかどうか
+        is_bookmarked: ブックマーク済みかどうか
+        fieldset: レスポンスに含めるフィールド
+        use_original_author: ターゲットアカウント情報を元ツイート作者の情報で上書きするか（引用元ツイート用）
+    """
+    target_account = tweet.target_account
+    if use_original_author:
+        # 引用元ツイートの場合は元の作者情報を優先する
+        target_account_username = (
+            tweet.original_author_username or target_account.username
+        )
+        target_account_display_name = (
+            tweet.original_author_display_name or target_account.display_name
+        )
+        target_account_profile_image_url = (
+            tweet.original_author_profile_image_url or target_account.profile_image_url
+        )
+    else:
+        target_account_username = target_account.username
+        target_account_display_name = target_account.display_name
+        target_account_profile_image_url = target_account.profile_image_url
+
+    row = {
+        'id': tweet.id,
+        'tweet_id': tweet.tweet_id,
+        'content': tweet.content,
+        'full_text': tweet.full_text,
+        'lang': tweet.lang,
+        'likes_count': tweet.likes_count,
+        'retweets_count': tweet.retweets_count,
+        'replies_count': tweet.replies_count,
+        'quotes_count': tweet.quotes_count,
+        'views_count': tweet.views_count,
+        'bookmark_count': tweet.bookmark_count,
+        'is_retweet': tweet.is_retweet,
+        'is_quote': tweet.is_quote,
+        'is_quoted': tweet.is_quoted,
+        'retweeted_tweet_id': tweet.retweeted_tweet_id,
+        'quoted_tweet_id': tweet.quoted_tweet_id,
+        'is_reply': tweet.is_reply,
+        'in_reply_to_tweet_id': tweet.in_reply_to_tweet_id,
+        'in_reply_to_user_id': tweet.in_reply_to_user_id,
+        'conversation_id': tweet.conversation_id,
+        'hashtags': tweet.hashtags,
+        'urls': tweet.urls,
+        'user_mentions': tweet.user_mentions,
+        'is_possibly_sensitive': tweet.is_possibly_sensitive,
+        'has_media': tweet.has_media,
+        'posted_at': tweet.posted_at,
+        'created_at': tweet.created_at,
+        'updated_at': tweet.updated_at,
         # ターゲットアカウント情報
-        target_account_id=tweet.target_account.id,
-        target_account_username=tweet.target_account.username,
-        target_account_display_name=tweet.target_account.display_name,
-        target_account_profile_image_url=tweet.target_account.profile_image_url,
+        'target_account_id': target_account.id,
+        'target_account_username': target_account_username,
+        'target_account_display_name': target_account_display_name,
+        'target_account_profile_image_url': target_account_profile_image_url,
         # リツイート・引用ツイート情報
-        original_author_username=tweet.original_author_username,
-        original_author_display_name=tweet.original_author_display_name,
-        original_author_profile_image_url=tweet.original_author_profile_image_url,
+        'original_author_username': tweet.original_author_username,
+        'original_author_display_name': tweet.original_author_display_name,
+        'original_author_profile_image_url': tweet.original_author_profile_image_url,
         # メディア情報
-        media=media_info,
+        'media': media,
         # 引用元ツイート情報
-        quoted_tweet=quoted_tweet_response,
+        'quoted_tweet': quoted_tweet,
         # ユーザー固有の情報
-        is_read=is_read,
-        is_bookmarked=is_bookmarked,
-    )
+        'is_read': is_read,
+        'is_bookmarked': is_bookmarked,
+    }
+    if fieldset.is_full:
+        return row
+    return {name: value for name, value in row.items() if name in fieldset.fields}
+
+
+def get_tweet_versions(tweets: list[Tweet]) -> list[tuple[int, int, int]]:
+    """
+    ETag 算出用に、ツイートごとの (ID, updated_at, ターゲットアカウントの updated_at) を返す
+
+    メディアのダウンロード完了時にはツイートの updated_at も更新されるため、
+    メディア情報の変化もこの値に反映される。
+
+    Args:
+        tweets: select_related('target_account') 済みのツイート一覧
+
+    Returns:
+        list[tuple[int, int, int]]: ツイートの並び順どおりのバージョン情報
+    """
+    return [
+        (tweet.id, tweet.updated_at, tweet.target_account.updated_at)
+        for tweet in tweets
+    ]
+
+
+async def create_tweet_rows(
+    tweets: list[Tweet],
+    current_user: User | None = None,
+    fieldset: TweetFieldset = TweetFieldset(),
+) -> list[dict[str, Any]]:
+    """
+    複数の Tweet モデルから TweetResponse と同じ形式の dict 一覧をまとめて生成する（メディア情報込み）
+
+    ページ内の全ツイートについて、メディア・既読・ブックマーク状態を
+    それぞれ `__in` クエリ 1 回ずつで取得するため、ページサイズに関係なく
+    発行されるクエリ数は一定になる。fieldset に含まれない関連データは取得しない。
+    引用元ツイートは select_related('quoted_tweet_ref__target_account') で
+    結合済みのものをそのまま使い、結合していないものだけ主キーでまとめて取得する。
+    生成した dict は FastJSONResponse でそのままシリアライズできる。
+
+    Args:
+        tweets: select_related('target_account') 済みのツイート一覧
+        current_user: 既読・ブックマーク状態を判定するユーザー
+        fieldset: レスポンスに含めるフィールド（未指定時はすべて）
+
+    Returns:
+        list[dict[str, Any]]: 入力と同じ順序のツイート一覧
+    """
+    if not tweets:
+        return []
+
+    tweet_ids = [tweet.id for tweet in tweets]
+
+    # 引用元ツイートを取得（引用元ツイートの ID -> Tweet）
+    quoted_tweets: dict[int, Tweet] = {}
+    if fieldset.quoted:
+        unloaded_quoted_tweet_ids = set()
+        for tweet in tweets:
+            if not (tweet.is_quote and tweet.quoted_tweet_ref_id):
+                continue
+            # select_related で作者ごと結合済みの場合は追加のクエリを発行しない
+            quoted_tweet = getattr(tweet, '_quoted_tweet_ref', None)
+            if quoted_tweet is not None and hasattr(quoted_tweet, '_target_account'):
+                quoted_tweets[quoted_tweet.id] = quoted_tweet
+            else:
+                unloaded_quoted_tweet_ids.add(tweet.quoted_tweet_ref_id)
+        if unloaded_quoted_tweet_ids:
+            for quoted_tweet in await Tweet.filter(
+                id__in=list(unloaded_quoted_tweet_ids)
+            ).select_related('target_account'):
+                quoted_tweets[quoted_tweet.id] = quoted_tweet
+
+    # ページ内ツイートと引用元ツイートのメディア情報を一括取得
+    media_map: dict[int, list[dict[str, Any]]] = {}
+    if fieldset.media:
+        media_map = await get_tweets_media_info(
+            tweet_ids + [quoted_tweet.id for quoted_tweet in quoted_tweets.values()]
+        )
+
+    # 既読・ブックマーク状態を取得（ユーザーが指定されている場合）
+    # ユーザー別の ID 集合・既読位置のキャッシュを参照するため、キャッシュ済みなら DB アクセスは発生しない
+    read_tweet_ids: TweetIdSet = TweetIdSet()
+    read_watermarks = ReadWatermarks()
+    bookmarked_tweet_ids: TweetIdSet = TweetIdSet()
+    if current_user and fieldset.is_read:
+        read_tweet_ids = await tweet_state_cache.get(current_user.id, 'read')
+        read_watermarks = await get_read_watermarks(current_user)
+    if current_user and fieldset.is_bookmarked:
+        bookmarked_tweet_ids = await tweet_state_cache.get(
+            current_user.id, 'bookmarked'
+        )
+
+    tweet_rows = []
+    for tweet in tweets:
+        is_read = tweet.id in read_tweet_ids or read_watermarks.covers(tweet)
+        is_bookmarked = tweet.id in bookmarked_tweet_ids
+
+        # 引用元ツイート情報を組み立て
+        quoted_tweet_row = None
+        if fieldset.quoted and tweet.is_quote and tweet.quoted_tweet_ref_id:
+            quoted_tweet = quoted_tweets.get(tweet.quoted_tweet_ref_id)
+            if quoted_tweet:
+                quoted_tweet_row = _build_tweet_row(
+                    quoted_tweet,
+                    media=media_map.get(quoted_tweet.id, []),
+                    # 引用元ツイート（再帰を避けるためNone）
+                    quoted_tweet=None,
+                    is_read=is_read,
+                    is_bookmarked=is_bookmarked,
+                    fieldset=fieldset,
+                    use_original_author=True,
+                )
+
+        tweet_rows.append(
+            _build_tweet_row(
+                tweet,
+                media=media_map.get(tweet.id, []),
+                quoted_tweet=quoted_tweet_row,
+                is_read=is_read,
+                is_bookmarked=is_bookmarked,
+                fieldset=fieldset,
+            )
+        )
+
+    return tweet_rows
+
+
+async def create_tweet_responses(
+    tweets: list[Tweet], current_user: User | None = None
+) -> list[TweetResponse]:
+    """
+    複数の Tweet モデルから TweetResponse 一覧をまとめて生成する（メディア情報込み）
+
+    レスポンスモデルとして扱う必要がある場合に使う。JSON として返すだけなら
+    検証を省略できる create_tweet_rows() と FastJSONResponse を使うこと。
+
+    Args:
+        tweets: select_related('target_account') 済みのツイート一覧
+        current_user: 既読・ブックマーク状態を判定するユーザー
+
+    Returns:
+        list[TweetResponse]: 入力と同じ順序のレスポンス一覧
+    """
+    tweet_rows = await create_tweet_rows(tweets, current_user)
+    return [TweetResponse.model_validate(tweet_row) for tweet_row in tweet_rows]
 
 
 class TimelineResponse(BaseModel):
     """タイムライン取得レスポンス"""
 
     tweets: list[TweetResponse] = Field(..., description='ツイート一覧')
-    total: int = Field(..., description='総ツイート数')
+    total: int | None = Field(
+        None, description='総ツイート数（include_total=false の場合は null）'
+    )
     page: int = Field(..., description='現在のページ番号')
     page_size: int = Field(..., description='1ページあたりのツイート数')
     has_next: bool = Field(..., description='次のページが存在するかどうか')
+    next_cursor: str | None = Field(
+        None, description='次（より古い）ページを取得するためのカーソル'
+    )
+    prev_cursor: str | None = Field(
+        None, description='前（より新しい）ページを取得するためのカーソル'
+    )
 
 
 @router.get('/timeline', response_model=TimelineResponse)
 async def TweetTimelineAPI(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1, description='ページ番号'),
     page_size: int = Query(20, ge=1, le=100, description='1ページあたりのツイート数'),
     target_account_id: int | None = Query(
         None, description='特定のターゲットアカウントのツイートのみ取得'
     ),
-) -> TimelineResponse:
+    cursor: str | None = Query(
+        None,
+        description='キーセットページネーション用のカーソル（指定時は page を無視）',
+    ),
+    include_total: TotalMode = Query(
+        'estimate',
+        description='総数の算出方法（false: 算出しない / estimate: 取り込み時カウンターの合計 / exact: 全件カウント）',
+    ),
+    sort: TweetSort = Query(
+        'latest',
+        description='並び順（latest: 新しい順 / top: エンゲージメントスコア順）',
+    ),
+    window_hours: int = Query(
+        TOP_WINDOW_HOURS_DEFAULT,
+        ge=1,
+        le=TOP_WINDOW_HOURS_MAX,
+        description='sort=top の集計期間（直近何時間のツイートを対象にするか）',
+    ),
+    unread_only: bool = Query(
+        False, description='未読のツイートのみを取得するかどうか'
+    ),
+    fieldset: TweetFieldset = Depends(get_tweet_fieldset),
+) -> TimelineResponse | Response:
     """
     タイムライン取得 API
 
     ユーザーに紐づいたターゲットアカウントのツイート一覧を
     時系列順（新しいものから）で取得します。
+    sort=top の場合は直近 window_hours 時間のツイートをエンゲージメントスコア順に返します。
+    unread_only=true の場合は既読にしたツイートを除外します。
+    ETag を返し、If-None-Match が一致する場合は 304 Not Modified を返します。
     """
-    # ユーザーに紐づいたターゲットアカウントのIDを取得
-    target_accounts = await TargetAccount.filter(
-        user=current_user, is_active=True
-    ).all()
+    # ユーザーに紐づいたターゲットアカウントのIDを取得（所属関係キャッシュから）
+    membership = await get_user_membership(current_user)
+    target_account_ids = membership.active_target_account_ids
 
-    if not target_accounts:
+    if not target_account_ids:
         return TimelineResponse(
             tweets=[],
             total=0,
@@ -312,8 +594,6 @@ async def TweetTimelineAPI(
             has_next=False,
         )
 
-    target_account_ids = [account.id for account in target_accounts]
-
     # 特定のターゲットアカウントが指定されている場合
     if target_account_id is not None:
         if target_account_id not in target_account_ids:
@@ -325,34 +605,53 @@ async def TweetTimelineAPI(
 
     # ツイート一覧を取得（ページネーション付き）
     # is_quoted=False のツイートのみを取得（引用元ツイートを除外）
-    offset = (page - 1) * page_size
-    tweets_query = (
-        Tweet.filter(target_account_id__in=target_account_ids, is_quoted=False)
-        .select_related('target_account')
-        .order_by('-posted_at')
+    tweets_query = Tweet.filter(
+        target_account_id__in=target_account_ids, is_quoted=False
+    ).select_related('target_account', 'quoted_tweet_ref__target_account')
+
+    # sort=top の場合は期間内のスコア順に並べる
+    sort_field = 'engagement_score' if sort == 'top' else 'posted_at'
+    if sort == 'top':
+        tweets_query = filter_top_window(tweets_query, window_hours)
+    if unread_only:
+        tweets_query = filter_unread(tweets_query, current_user.id)
+
+    # 総数を取得（既定では取り込み時カウンターの合計を使い、COUNT(*) は発行しない）
+    # 期間内・未読のみの件数はカウンターで表せないため数える
+    total_account_ids = None if sort == 'top' or unread_only else target_account_ids
+    total = await resolve_tweet_total(include_total, tweets_query, total_account_ids)
+
+    # ページネーション適用（カーソル指定時は (sort_field, id) でシーク）
+    tweets_page = await paginate(tweets_query, sort_field, page, page_size, cursor)
+
+    # ページ内容が変わっていなければメディア・引用元ツイートを取得せずに 304 を返す
+    etag = build_etag(
+        str(request.query_params),
+        current_user.id,
+        current_user.tweet_state_version,
+        total,
+        tweets_page.has_next,
+        get_tweet_versions(tweets_page.items),
     )
-
-    # 総数を取得
-    total = await tweets_query.count()
-
-    # ページネーション適用
-    tweets = await tweets_query.offset(offset).limit(page_size).all()
-
-    # レスポンス用にデータを変換
-    tweet_responses = []
-    for tweet in tweets:
-        tweet_response = await create_tweet_response(tweet, current_user)
-        tweet_responses.append(tweet_response)
-
-    # 次のページが存在するかチェック
-    has_next = offset + page_size < total
-
-    return TimelineResponse(
-        tweets=tweet_responses,
-        total=total,
-        page=page,
-        page_size=page_size,
-        has_next=has_next,
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag_headers(response, etag)
+
+    # レスポンス用にデータを変換（メディア・既読状態などはページ単位で一括取得）
+    tweet_rows = await create_tweet_rows(tweets_page.items, current_user, fieldset)
+
+    # TimelineResponse と同じ形式の dict を検証なしで直接シリアライズする
+    return FastJSONResponse(
+        {
+            'tweets': tweet_rows,
+            'total': total,
+            'page': page,
+            'page_size': page_size,
+            'has_next': tweets_page.has_next,
+            'next_cursor': tweets_page.next_cursor,
+            'prev_cursor': tweets_page.prev_cursor,
+        },
+        headers=dict(response.headers),
     )
 
 
@@ -362,14 +661,23 @@ class BookmarkedTweetsResponse(BaseModel):
     tweets: list[TweetResponse] = Field(
         ..., description='ブックマークされたツイート一覧'
     )
-    total: int = Field(..., description='総ブックマーク数')
+    total: int | None = Field(
+        None, description='総ブックマーク数（include_total=false の場合は null）'
+    )
     page: int = Field(..., description='現在のページ番号')
     page_size: int = Field(..., description='1ページあたりのツイート数')
     has_next: bool = Field(..., description='次のページが存在するかどうか')
+    next_cursor: str | None = Field(
+        None, description='次（より古い）ページを取得するためのカーソル'
+    )
+    prev_cursor: str | None = Field(
+        None, description='前（より新しい）ページを取得するためのカーソル'
+    )
 
 
 @router.get('/bookmarked', response_model=BookmarkedTweetsResponse)
 async def BookmarkedTweetsAPI(
+    response: Response,
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1, description='ページ番号'),
     page_size: int = Query(20, ge=1, le=100, description='1ページあたりのツイート数'),
@@ -379,7 +687,16 @@ async def BookmarkedTweetsAPI(
     timeline_id: int | None = Query(
         None, description='特定のタイムラインに所属するアカウントのツイートのみ取得'
     ),
-) -> BookmarkedTweetsResponse:
+    cursor: str | None = Query(
+        None,
+        description='キーセットページネーション用のカーソル（指定時は page を無視）',
+    ),
+    include_total: TotalMode = Query(
+        'estimate',
+        description='総数の算出方法（false: 算出しない / estimate: 取り込み時カウンターの合計 / exact: 全件カウント）',
+    ),
+    fieldset: TweetFieldset = Depends(get_tweet_fieldset),
+) -> BookmarkedTweetsResponse | Response:
     """
     ブックマーク一覧取得 API
 
@@ -396,25 +713,21 @@ async def BookmarkedTweetsAPI(
 
     timeline_target_account_ids = None
 
+    membership = await get_user_membership(current_user)
+
     # timeline_id が指定されている場合
     if timeline_id is not None:
         # タイムラインの存在確認とユーザー所有権チェック
-        timeline = (
-            await Timeline.filter(id=timeline_id, user=current_user, is_active=True)
-            .prefetch_related('target_accounts')
-            .first()
-        )
+        timeline_membership = membership.timelines.get(timeline_id)
 
-        if not timeline:
+        if not timeline_membership:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail='指定されたタイムラインが見つかりません',
             )
 
         # タイムラインに所属するターゲットアカウントのIDを取得
-        timeline_target_account_ids = [
-            account.id for account in timeline.target_accounts if account.is_active
-        ]
+        timeline_target_account_ids = timeline_membership.active_target_account_ids
 
         # タイムラインにアクティブなターゲットアカウントが存在しない場合
         if not timeline_target_account_ids:
@@ -427,21 +740,16 @@ async def BookmarkedTweetsAPI(
             )
 
     # target_account_id が指定されている場合、ユーザーに紐づいたアカウントか確認
-    if target_account_id is not None:
-        # ユーザーに紐づいたターゲットアカウントのIDを取得
-        target_accounts = await TargetAccount.filter(
-            user=current_user, is_active=True
-        ).all()
-        target_account_ids = [account.id for account in target_accounts]
-
-        if target_account_id not in target_account_ids:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail='指定されたターゲットアカウントが見つかりません',
-            )
+    if (
+        target_account_id is not None
+        and target_account_id not in membership.active_target_account_ids
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='指定されたターゲットアカウントが見つかりません',
+        )
 
     # ブックマークされたツイートIDを取得（ページネーション付き）
-    offset = (page - 1) * page_size
     bookmarked_tweets_query = BookmarkedTweet.filter(user=current_user)
 
     # timeline_id が指定されている場合、タイムラインに所属するアカウントでフィルタリング
@@ -457,58 +765,280 @@ async def BookmarkedTweetsAPI(
 
     bookmarked_tweets_query = bookmarked_tweets_query.select_related(
         'tweet__target_account'
-    ).order_by('-bookmarked_at')
+    )
 
-    # 総数を取得
-    total = await bookmarked_tweets_query.count()
+    # 総数を取得（ブックマークはユーザー単位で件数が限られるため estimate でも実数を数える）
+    total = await resolve_tweet_total(include_total, bookmarked_tweets_query, None)
+
+    # ページネーション適用（カーソル指定時は (bookmarked_at, id) でシーク）
+    bookmarked_page = await paginate(
+        bookmarked_tweets_query, 'bookmarked_at', page, page_size, cursor
+    )
 
-    # ページネーション適用
-    bookmarked_tweets = (
-        await bookmarked_tweets_query.offset(offset).limit(page_size).all()
+    # レスポンス用にデータを変換（メディア・既読状態などはページ単位で一括取得）
+    tweet_rows = await create_tweet_rows(
+        [bookmarked_tweet.tweet for bookmarked_tweet in bookmarked_page.items],
+        current_user,
+        fieldset,
     )
 
-    # レスポンス用にデータを変換
-    tweet_responses = []
-    for bookmarked_tweet in bookmarked_tweets:
-        tweet_response = await create_tweet_response(
-            bookmarked_tweet.tweet, current_user
+    # BookmarkedTweetsResponse と同じ形式の dict を検証なしで直接シリアライズする
+    return FastJSONResponse(
+        {
+            'tweets': tweet_rows,
+            'total': total,
+            'page': page,
+            'page_size': page_size,
+            'has_next': bookmarked_page.has_next,
+            'next_cursor': bookmarked_page.next_cursor,
+            'prev_cursor': bookmarked_page.prev_cursor,
+        },
+        headers=dict(response.headers),
+    )
+
+
+async def _resolve_target_account_ids(
+    current_user: User,
+    timeline_id: int | None,
+    target_account_id: int | None,
+) -> list[int]:
+    """
+    エクスポート・検索対象のターゲットアカウント ID を解決する
+
+    Args:
+        current_user: 現在のユーザー
+        timeline_id: 対象のタイムライン ID（指定時はタイムラインに所属するアカウント）
+        target_account_id: 対象のターゲットアカウント ID
+
+    Returns:
+        list[int]: 対象のターゲットアカウント ID 一覧（未指定時はユーザーの全アクティブアカウント）
+
+    Raises:
+        HTTPException: 両方が指定された場合、
+            またはタイムライン・ターゲットアカウントが見つからない場合
+    """
+    # target_account_id と timeline_id の両方が指定されている場合はエラー
+    if target_account_id is not None and timeline_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='target_account_id と timeline_id は同時に指定できません',
         )
-        tweet_responses.append(tweet_response)
 
-    # 次のページが存在するかチェック
-    has_next = offset + page_size < total
+    membership = await get_user_membership(current_user)
+
+    if timeline_id is not None:
+        # タイムラインの存在確認とユーザー所有権チェック
+        timeline_membership = membership.timelines.get(timeline_id)
+        if not timeline_membership:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='指定されたタイムラインが見つかりません',
+            )
+        return list(timeline_membership.active_target_account_ids)
+
+    target_account_ids = membership.active_target_account_ids
 
-    return BookmarkedTweetsResponse(
-        tweets=tweet_responses,
-        total=total,
-        page=page,
-        page_size=page_size,
-        has_next=has_next,
+    if target_account_id is not None:
+        if target_account_id not in target_account_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='指定されたターゲットアカウントが見つかりません',
+            )
+        return [target_account_id]
+
+    return list(target_account_ids)
+
+
+async def _export_tweets_ndjson(
+    query: QuerySet,
+    sort_field: str,
+    current_user: User,
+    bookmarked: bool,
+) -> AsyncIterator[bytes]:
+    """
+    クエリ結果をチャンク単位で取得・一括変換し、NDJSON の行として順次出力する
+
+    Args:
+        query: エクスポート対象のクエリセット
+        sort_field: 並び順に使うフィールド名（posted_at / bookmarked_at）
+        current_user: 現在のユーザー
+        bookmarked: query が BookmarkedTweet のクエリセットかどうか
+
+    Yields:
+        bytes: 1 チャンク分の NDJSON（1 行 1 ツイート）
+    """
+    async for chunk in iterate_by_cursor(query, sort_field, EXPORT_CHUNK_SIZE):
+        tweets = (
+            [bookmarked_tweet.tweet for bookmarked_tweet in chunk]
+            if bookmarked
+            else chunk
+        )
+        tweet_rows = await create_tweet_rows(tweets, current_user)
+        yield b''.join(to_json(tweet_row) + b'\n' for tweet_row in tweet_rows)
+
+
+@router.get('/export')
+async def TweetExportAPI(
+    current_user: User = Depends(get_current_user),
+    timeline_id: int | None = Query(
+        None, description='特定のタイムラインに所属するアカウントのツイートのみ出力'
+    ),
+    target_account_id: int | None = Query(
+        None, description='特定のターゲットアカウントのツイートのみ出力'
+    ),
+    bookmarked: bool = Query(
+        False, description='ブックマークしたツイートのみを出力するかどうか'
+    ),
+) -> StreamingResponse:
+    """
+    ツイートエクスポート API
+
+    タイムライン・ターゲットアカウント・ブックマーク一覧のツイートを
+    新しい順に NDJSON（1 行 1 ツイート、TweetResponse と同じ形式）でストリーミング出力します。
+    サーバー側でキーセットによりチャンク単位で取得・変換するため、件数にかかわらず
+    メモリ使用量は一定です。
+    """
+    # ストリーミング開始前に対象を確定させ、エラーは通常のレスポンスとして返す
+    target_account_ids = await _resolve_target_account_ids(
+        current_user, timeline_id, target_account_id
+    )
+
+    if bookmarked:
+        query = BookmarkedTweet.filter(user=current_user)
+        # ブックマーク一覧は絞り込みが指定された場合のみアカウントで絞り込む
+        if timeline_id is not None or target_account_id is not None:
+            query = query.filter(tweet__target_account_id__in=target_account_ids)
+        query = query.select_related('tweet__target_account')
+        sort_field = 'bookmarked_at'
+    else:
+        # 引用元ツイートは除外
+        query = Tweet.filter(
+            target_account_id__in=target_account_ids, is_quoted=False
+        ).select_related('target_account', 'quoted_tweet_ref__target_account')
+        sort_field = 'posted_at'
+
+    return StreamingResponse(
+        _export_tweets_ndjson(query, sort_field, current_user, bookmarked),
+        media_type='application/x-ndjson',
+        headers={'Content-Disposition': 'attachment; filename="tweets.ndjson"'},
+    )
+
+
+class TweetSearchResponse(BaseModel):
+    """ツイート検索レスポンス"""
+
+    tweets: list[TweetResponse] = Field(
+        ..., description='検索語をすべて含むツイート一覧'
+    )
+    page_size: int = Field(..., description='1ページあたりのツイート数')
+    has_next: bool = Field(..., description='次のページが存在するかどうか')
+    next_cursor: str | None = Field(
+        None, description='次（より古い）ページを取得するためのカーソル'
+    )
+    prev_cursor: str | None = Field(
+        None, description='前（より新しい）ページを取得するためのカーソル'
+    )
+
+
+@router.get('/search', response_model=TweetSearchResponse)
+async def TweetSearchAPI(
+    current_user: User = Depends(get_current_user),
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=SEARCH_QUERY_MAX_LENGTH,
+        description='検索クエリ（空白区切りで AND 検索）',
+    ),
+    timeline_id: int | None = Query(
+        None, description='特定のタイムラインに所属するアカウントのツイートのみ検索'
+    ),
+    target_account_id: int | None = Query(
+        None, description='特定のターゲットアカウントのツイートのみ検索'
+    ),
+    page_size: int = Query(20, ge=1, le=100, description='1ページあたりのツイート数'),
+    cursor: str | None = Query(
+        None, description='キーセットページネーション用のカーソル'
+    ),
+    fieldset: TweetFieldset = Depends(get_tweet_fieldset),
+) -> TweetSearchResponse | Response:
+    """
+    ツイート全文検索 API
+
+    ユーザーのターゲットアカウント（またはタイムライン・特定アカウント）のツイートから、
+    本文に検索語をすべて含むものを新しい順に取得します。
+    全角・半角と大文字・小文字は区別しません。
+    本文の文字 bigram の GIN インデックスで候補を絞り込んでから部分一致を確認するため、
+    単語の区切りがない日本語でも任意の部分文字列で検索できます。
+    """
+    terms = parse_search_query(q)
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='検索語を指定してください',
+        )
+
+    target_account_ids = await _resolve_target_account_ids(
+        current_user, timeline_id, target_account_id
+    )
+
+    # 引用元ツイートは除外
+    tweets_query = Tweet.filter(
+        target_account_id__in=target_account_ids, is_quoted=False
+    ).select_related('target_account', 'quoted_tweet_ref__target_account')
+
+    # 検索語の bigram をすべて含むツイートにインデックスで絞り込む
+    # （1 文字の検索語は bigram を持たないため、部分一致の確認のみで絞り込む）
+    query_bigrams = sorted(
+        {bigram for term in terms for bigram in extract_bigrams(term)}
+    )
+    if query_bigrams:
+        tweets_query = tweets_query.filter(search_bigrams__contains=query_bigrams)
+
+    # bigram の一致だけでは語順が保証されないため、検索語ごとに部分一致を確認する
+    for term in terms:
+        tweets_query = tweets_query.filter(search_text__contains=term)
+
+    tweets_page = await paginate(tweets_query, 'posted_at', 1, page_size, cursor)
+
+    # レスポンス用にデータを変換（メディア・既読状態などはページ単位で一括取得）
+    tweet_rows = await create_tweet_rows(tweets_page.items, current_user, fieldset)
+
+    # TweetSearchResponse と同じ形式の dict を検証なしで直接シリアライズする
+    return FastJSONResponse(
+        {
+            'tweets': tweet_rows,
+            'page_size': page_size,
+            'has_next': tweets_page.has_next,
+            'next_cursor': tweets_page.next_cursor,
+            'prev_cursor': tweets_page.prev_cursor,
+        }
     )
 
 
 @router.get('/{tweet_id}', response_model=TweetResponse)
 async def TweetDetailAPI(
     tweet_id: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-) -> TweetResponse:
+) -> TweetResponse | Response:
     """
     ツイート詳細取得 API
 
     指定されたツイートIDの詳細情報を取得します。
+    ETag を返し、If-None-Match が一致する場合は 304 Not Modified を返します。
     """
     # ユーザーに紐づいたターゲットアカウントのIDを取得
-    target_accounts = await TargetAccount.filter(
-        user=current_user, is_active=True
-    ).all()
-    target_account_ids = [account.id for account in target_accounts]
+    target_account_ids = (
+        await get_user_membership(current_user)
+    ).active_target_account_ids
 
     # ツイートを取得（引用元ツイートは除外）
     tweet = (
         await Tweet.filter(
             tweet_id=tweet_id, target_account_id__in=target_account_ids, is_quoted=False
         )
-        .select_related('target_account')
+        .select_related('target_account', 'quoted_tweet_ref__target_account')
         .first()
     )
 
@@ -518,7 +1048,156 @@ async def TweetDetailAPI(
             detail='指定されたツイートが見つかりません',
         )
 
-    return await create_tweet_response(tweet, current_user)
+    etag = build_etag(
+        current_user.id,
+        current_user.tweet_state_version,
+        get_tweet_versions([tweet]),
+    )
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag_headers(response, etag)
+
+    tweet_rows = await create_tweet_rows([tweet], current_user)
+    return FastJSONResponse(tweet_rows[0], headers=dict(response.headers))
+
+
+def order_thread_tweets(tweets: list[Tweet]) -> list[tuple[Tweet, int]]:
+    """
+    会話内のツイートをリプライの親子関係に沿って並べる
+
+    親（in_reply_to_tweet_id）が会話内に保存されていないツイートを根とし、
+    根から深さ優先で、同じ親を持つツイートは投稿日時の古い順に並べる。
+    親子関係が循環していて根からたどれないツイートは、最後に投稿日時の古い順に深さ 0 で並べる。
+
+    Args:
+        tweets: 同じ会話に属するツイート
+
+    Returns:
+        list[tuple[Tweet, int]]: (ツイート, 根からの深さ) の一覧
+    """
+    tweet_ids = {tweet.tweet_id for tweet in tweets}
+    children: dict[str | None, list[Tweet]] = {}
+    for tweet in tweets:
+        parent_id = tweet.in_reply_to_tweet_id
+        # 親が保存されていない（または自分自身を指す）ツイートは根として扱う
+        if parent_id not in tweet_ids or parent_id == tweet.tweet_id:
+            parent_id = None
+        children.setdefault(parent_id, []).append(tweet)
+
+    # 再帰の深さ制限を避けるため、スタックで深さ優先探索する
+    ordered: list[tuple[Tweet, int]] = []
+    stack = [
+        (tweet, 0)
+        for tweet in sorted(
+            children.get(None, []),
+            key=lambda tweet: (tweet.posted_at, tweet.id),
+            reverse=True,
+        )
+    ]
+    while stack:
+        tweet, depth = stack.pop()
+        ordered.append((tweet, depth))
+        stack.extend(
+            (child, depth + 1)
+            for child in sorted(
+                children.get(tweet.tweet_id, []),
+                key=lambda tweet: (tweet.posted_at, tweet.id),
+                reverse=True,
+            )
+        )
+
+    # 上流のデータ不整合で親子関係が循環している（A→B→A）ツイートも欠落させない
+    visited_ids = {tweet.tweet_id for tweet, _ in ordered}
+    ordered.extend(
+        (tweet, 0)
+        for tweet in sorted(tweets, key=lambda tweet: (tweet.posted_at, tweet.id))
+        if tweet.tweet_id not in visited_ids
+    )
+    return ordered
+
+
+class ThreadTweetResponse(TweetResponse):
+    """会話スレッド内のツイート情報レスポンス"""
+
+    depth: int = Field(..., description='スレッドの根からの深さ（根は 0）')
+
+
+class TweetThreadResponse(BaseModel):
+    """会話スレッド取得レスポンス"""
+
+    conversation_id: str = Field(..., description='会話 ID')
+    tweets: list[ThreadTweetResponse] = Field(
+        ..., description='リプライの親子関係に沿って並べた会話内のツイート一覧'
+    )
+
+
+@router.get('/{tweet_id}/thread', response_model=TweetThreadResponse)
+async def TweetThreadAPI(
+    tweet_id: str,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    fieldset: TweetFieldset = Depends(get_tweet_fieldset),
+) -> TweetThreadResponse | Response:
+    """
+    会話スレッド取得 API
+
+    指定されたツイートと同じ会話に属する保存済みツイートを、
+    リプライの親子関係に沿った順序（深さ優先、同じ親の中では古い順）で取得します。
+    会話 ID のインデックスで 1 回取得し、メディア・既読状態などはまとめて取得します。
+    """
+    # ユーザーに紐づいたターゲットアカウントのIDを取得
+    target_account_ids = (
+        await get_user_membership(current_user)
+    ).active_target_account_ids
+
+    # 起点のツイートを取得（引用元ツイートは除外）
+    tweet = await Tweet.filter(
+        tweet_id=tweet_id, target_account_id__in=target_account_ids, is_quoted=False
+    ).first()
+
+    if not tweet:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='指定されたツイートが見つかりません',
+        )
+
+    # 会話 ID を持たないツイートは、自身を起点とする会話として扱う
+    conversation_id = tweet.conversation_id or tweet.tweet_id
+    thread_tweets = await Tweet.filter(
+        Q(conversation_id=conversation_id) | Q(tweet_id=conversation_id),
+        target_account_id__in=target_account_ids,
+        is_quoted=False,
+    ).select_related('target_account', 'quoted_tweet_ref__target_account')
+
+    etag = build_etag(
+        str(request.query_params),
+        current_user.id,
+        current_user.tweet_state_version,
+        get_tweet_versions(thread_tweets),
+    )
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag_headers(response, etag)
+
+    ordered_tweets = order_thread_tweets(thread_tweets)
+    tweet_rows = await create_tweet_rows(
+        [thread_tweet for thread_tweet, _ in ordered_tweets], current_user, fieldset
+    )
+
+    # TweetThreadResponse と同じ形式の dict を検証なしで直接シリアライズする
+    return FastJSONResponse(
+        {
+            'conversation_id': conversation_id,
+            'tweets': [
+                {**tweet_row, 'depth': depth}
+                for tweet_row, (_, depth) in zip(
+                    tweet_rows, ordered_tweets, strict=True
+                )
+            ],
+        },
+        headers=dict(response.headers),
+    )
 
 
 @router.post('/bookmark/{tweet_id}', response_model=dict[str, str | bool])
@@ -533,7 +1212,8 @@ async def ToggleBookmarkAPI(
     ブックマーク済みの場合は削除、未ブックマークの場合は追加します。
     """
     # ツイートの存在確認
-    tweet = await Tweet.filter(id=tweet_id).first()
+    # メディア保存で使う引用元ツイートも結合して取得
+    tweet = await Tweet.filter(id=tweet_id).select_related('quoted_tweet_ref').first()
     if not tweet:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -548,6 +1228,8 @@ async def ToggleBookmarkAPI(
     if bookmarked_tweet:
         # ブックマーク済みの場合は削除
         await bookmarked_tweet.delete()
+        tweet_state_cache.unmark(current_user.id, 'bookmarked', [tweet.id])
+        await bump_tweet_state_version(current_user.id)
         return {
             'message': 'ブックマークを削除しました',
             'is_bookmarked': False,
@@ -555,6 +1237,8 @@ async def ToggleBookmarkAPI(
     else:
         # 未ブックマークの場合は追加
         await BookmarkedTweet.create(user=current_user, tweet=tweet)
+        tweet_state_cache.mark(current_user.id, 'bookmarked', [tweet.id])
+        await bump_tweet_state_version(current_user.id)
 
         # ブックマーク追加時にツイートのメディアを MinIO に保存開始
         await _process_tweet_media_for_bookmark(tweet)
@@ -583,16 +1267,117 @@ async def MarkTweetAsReadAPI(
             detail='指定されたツイートが見つかりません',
         )
 
-    # 既存の既読記録を確認
-    read_tweet = await ReadTweet.filter(user=current_user, tweet=tweet).first()
-
-    if not read_tweet:
-        # 未読の場合は既読状態を作成
-        await ReadTweet.create(user=current_user, tweet=tweet)
+    # 既読状態を作成（既読済みの場合は何もしない）し、キャッシュと ETag 用のバージョンにも反映
+    await mark_tweets_read(current_user.id, [tweet.id])
 
     return {'message': 'ツイートを既読にしました'}
 
 
+class BulkMarkReadRequest(BaseModel):
+    """一括既読リクエスト"""
+
+    tweet_ids: list[int] | None = Field(
+        None,
+        max_length=BULK_READ_MAX_TWEET_IDS,
+        description='既読にするツイート ID の一覧（1 件以上、指定時は範囲指定と併用不可）',
+    )
+    timeline_id: int | None = Field(
+        None,
+        description='範囲指定: 対象のタイムライン ID（範囲指定ではこれか target_account_id が必須）',
+    )
+    target_account_id: int | None = Field(
+        None, description='範囲指定: 対象のターゲットアカウント ID'
+    )
+    up_to_cursor: str | None = Field(
+        None,
+        description=(
+            '範囲指定: 一覧 API（sort=latest）のカーソル。'
+            'カーソルが指すツイートとそれより新しいツイートを既読にする'
+            '（範囲指定ではこれか mark_all が必須）'
+        ),
+    )
+    mark_all: bool = Field(
+        False,
+        description='範囲指定: true の場合、対象のすべてのツイートを既読にする',
+    )
+
+
+class BulkMarkReadResponse(BaseModel):
+    """一括既読レスポンス"""
+
+    message: str = Field(..., description='処理結果メッセージ')
+    read_count: int = Field(..., description='新しく既読になったツイート数')
+
+
+@router.post('/read', response_model=BulkMarkReadResponse)
+async def BulkMarkTweetsAsReadAPI(
+    request: BulkMarkReadRequest,
+    current_user: User = Depends(get_current_user),
+) -> BulkMarkReadResponse:
+    """
+    一括既読 API
+
+    tweet_ids で指定したツイート、またはタイムライン・ターゲットアカウントのうち
+    up_to_cursor の位置以降のツイート（mark_all=true の場合はすべてのツイート）を
+    まとめて既読にします。既読済みのツイートは数に含めません。
+    既読化は取り消せないため、対象を明示しないリクエストは受け付けません。
+    """
+    is_range = (
+        request.timeline_id is not None
+        or request.target_account_id is not None
+        or request.up_to_cursor is not None
+        or request.mark_all
+    )
+
+    if request.tweet_ids is not None:
+        if is_range:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='tweet_ids と範囲指定は同時に指定できません',
+            )
+        if not request.tweet_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='tweet_ids を 1 件以上指定してください',
+            )
+        newly_read_ids = await mark_tweets_read(current_user.id, request.tweet_ids)
+    else:
+        if request.timeline_id is None and request.target_account_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    'tweet_ids、または timeline_id か target_account_id を'
+                    '指定してください'
+                ),
+            )
+        if (request.up_to_cursor is None) == (not request.mark_all):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='up_to_cursor と mark_all のどちらか一方を指定してください',
+            )
+        up_to = None
+        if request.up_to_cursor is not None:
+            up_to = decode_cursor(request.up_to_cursor)
+            # sort=top のカーソル（スコア値）は投稿日時の範囲に変換できない
+            if not isinstance(up_to.value, int):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail='カーソルの形式が不正です',
+                )
+
+        target_account_ids = await _resolve_target_account_ids(
+            current_user, request.timeline_id, request.target_account_id
+        )
+        newly_read_ids = await mark_range_read(
+            current_user.id, target_account_ids, up_to
+        )
+
+    return BulkMarkReadResponse(
+        message=f'{len(newly_read_ids)} 件のツイートを既読にしました',
+        read_count=len(newly_read_ids),
+    )
+
+
 async def _process_single_media_background(
     media_id: int, media_key: str, tweet_id: str
 ) -> None:
@@ -631,7 +1416,7 @@ async def _process_tweet_media_for_bookmark(tweet: Tweet) -> None:
     ブックマーク時にツイートのメディアを MinIO に保存する処理（バックグラウンド実行）
 
     Args:
-        tweet: ブックマークされたツイート
+        tweet: ブックマークされたツイート（select_related('quoted_tweet_ref') 済み）
     """
     # ツイート自身のメディアを処理
     main_media_items = await Media.filter(tweet=tweet).all()
@@ -644,8 +1429,8 @@ async def _process_tweet_media_for_bookmark(tweet: Tweet) -> None:
         )
 
     # 引用ツイートがある場合、そのメディアも処理
-    if tweet.is_quote and tweet.quoted_tweet_id:
-        quoted_tweet = await Tweet.filter(tweet_id=tweet.quoted_tweet_id).first()
+    if tweet.is_quote and tweet.quoted_tweet_ref_id:
+        quoted_tweet = await tweet.quoted_tweet_ref
         if quoted_tweet:
             quoted_media_items = await Media.filter(tweet=quoted_tweet).all()
 
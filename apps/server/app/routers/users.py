@@ -1,8 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, ConfigDict
 from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
 
+from app.models.target_account import TargetAccount
 from app.models.user import User
+from app.services.tweet_archive import (
+    delete_archive_objects,
+    get_archive_object_keys,
+)
+from app.services.tweet_partitions import delete_target_account_tweet_dependents
 from app.utils.auth import get_current_admin_user, hash_password
 
 router = APIRouter(prefix='/api/v1/users', tags=['users'])
@@ -140,4 +147,21 @@ async def UserDeleteAPI(
     if not user:
         raise HTTPException(status_code=404, detail='User not found')
 
-    await user.delete()
+    # アーカイブの行は連鎖削除されるため、削除するファイルのキーを先に取得しておく
+    target_account_ids = await TargetAccount.filter(user_id=user.id).values_list(
+        'id', flat=True
+    )
+    archive_object_keys = await get_archive_object_keys(target_account_ids)
+    # ターゲットアカウント経由で削除されるツイートを参照する行を、ユーザーと同じ
+    # トランザクションで削除する（アカウントの行をロックし、削除中の取り込みを待たせる）
+    async with in_transaction():
+        # values_list() では FOR UPDATE が付かないため、モデルとして取得してロックする
+        target_accounts = (
+            await TargetAccount.select_for_update().filter(user_id=user.id).only('id')
+        )
+        await delete_target_account_tweet_dependents(
+            [account.id for account in target_accounts]
+        )
+        await user.delete()
+    # DB から削除できた後にアーカイブファイルを削除する
+    await delete_archive_objects(archive_object_keys)
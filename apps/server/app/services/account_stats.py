@@ -0,0 +1,124 @@
+"""
+ターゲットアカウントの日別活動集計（ロールアップ）の更新・集約サービス
+
+統計表示のたびに tweets を GROUP BY すると履歴の蓄積に比例して遅くなるため、
+ツイートの取り込み時とエンゲージメント更新時に target_account_daily_stats の
+(アカウント, 日付) の行へ差分を加算しておく。
+統計 API は期間内の日数分の小さな行を読むだけで、件数・平均・割合を算出できる。
+"""
+
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from tortoise import connections
+
+from app.constants import ACCOUNT_STATS_TIMEZONE, TABLE_TARGET_ACCOUNT_DAILY_STATS
+from app.models.target_account_daily_stats import TargetAccountDailyStats
+
+# 日付の区切りに使うタイムゾーン
+_STATS_TIMEZONE = ZoneInfo(ACCOUNT_STATS_TIMEZONE)
+
+
+def activity_day(timestamp: int) -> date:
+    """
+    Unix timestamp を日別集計の日付に変換する
+
+    Args:
+        timestamp: Unix timestamp（ツイートの投稿日時など）
+
+    Returns:
+        date: ACCOUNT_STATS_TIMEZONE での日付
+    """
+    return datetime.fromtimestamp(timestamp, _STATS_TIMEZONE).date()
+
+
+async def add_daily_activity(
+    target_account_id: int,
+    posted_at: int,
+    tweet_count: int = 0,
+    likes: int = 0,
+    retweets: int = 0,
+    media_count: int = 0,
+) -> None:
+    """
+    ツイートの投稿日の集計行に差分を加算する（行がなければ作成する）
+
+    集計が保存済みのツイートとずれないよう、ツイートの保存・更新と同じトランザクション内で呼び出す。
+
+    Args:
+        target_account_id: ツイートを保存したターゲットアカウントの ID
+        posted_at: ツイートの投稿日時（Unix timestamp）
+        tweet_count: 加算するツイート数
+        likes: 加算するいいね数
+        retweets: 加算するリツイート数
+        media_count: 加算するメディア付きツイート数
+    """
+    sql = f"""
+        INSERT INTO "{TABLE_TARGET_ACCOUNT_DAILY_STATS}" (
+            "target_account_id", "day", "tweet_count", "likes_sum",
+            "retweets_sum", "media_count", "updated_at"
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7)
+        ON CONFLICT ("target_account_id", "day") DO UPDATE SET
+            "tweet_count" = "{TABLE_TARGET_ACCOUNT_DAILY_STATS}"."tweet_count"
+                + EXCLUDED."tweet_count",
+            "likes_sum" = "{TABLE_TARGET_ACCOUNT_DAILY_STATS}"."likes_sum"
+                + EXCLUDED."likes_sum",
+            "retweets_sum" = "{TABLE_TARGET_ACCOUNT_DAILY_STATS}"."retweets_sum"
+                + EXCLUDED."retweets_sum",
+            "media_count" = "{TABLE_TARGET_ACCOUNT_DAILY_STATS}"."media_count"
+                + EXCLUDED."media_count",
+            "updated_at" = EXCLUDED."updated_at"
+    """
+    await connections.get('default').execute_query(
+        sql,
+        [
+            target_account_id,
+            activity_day(posted_at),
+            tweet_count,
+            likes,
+            retweets,
+            media_count,
+            int(time.time()),
+        ],
+    )
+
+
+@dataclass(frozen=True)
+class ActivitySummary:
+    """期間内の日別集計を合算した統計"""
+
+    tweet_count: int  # 期間内のツイート数
+    tweets_per_day: float  # 1 日あたりのツイート数（活動のない日も含めた平均）
+    average_likes: float  # 1 ツイートあたりのいいね数
+    average_retweets: float  # 1 ツイートあたりのリツイート数
+    media_ratio: float  # メディアを含むツイートの割合（0〜1）
+
+
+def summarize_daily_stats(
+    rows: Sequence[TargetAccountDailyStats], days: int
+) -> ActivitySummary:
+    """
+    期間内の日別集計を合算する
+
+    Args:
+        rows: 期間内の日別集計（活動のない日の行は存在しない）
+        days: 期間の日数
+
+    Returns:
+        ActivitySummary: 合算した統計（ツイートがない場合の平均・割合は 0）
+    """
+    tweet_count = sum(row.tweet_count for row in rows)
+    if not tweet_count:
+        return ActivitySummary(0, 0.0, 0.0, 0.0, 0.0)
+
+    return ActivitySummary(
+        tweet_count=tweet_count,
+        tweets_per_day=tweet_count / days,
+        average_likes=sum(row.likes_sum for row in rows) / tweet_count,
+        average_retweets=sum(row.retweets_sum for row in rows) / tweet_count,
+        media_ratio=sum(row.media_count for row in rows) / tweet_count,
+    )
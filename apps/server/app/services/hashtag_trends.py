@@ -0,0 +1,200 @@
+"""
+ハッシュタグの正規化・取り込み時のカウンター加算と、タイムライン別のトレンド集計
+
+Tweet.hashtags は JSON のままではタグ単位で集計できないため、取り込み時に
+tweet_hashtags へ 1 タグ 1 行で展開し、同時にターゲットアカウント・時間バケット別の
+出現数（hashtag_counts）を加算する。
+トレンド API は期間内のバケットのカウンターを合算するだけで上位のタグを求め、
+tweets テーブルは参照しない。
+"""
+
+import logging
+import re
+import time
+from typing import Any
+
+from tortoise import connections
+
+from app.constants import (
+    HASHTAG_BUCKET_SECONDS,
+    TABLE_HASHTAG_COUNTS,
+    TABLE_TWEET_HASHTAGS,
+    TREND_WINDOW_MAX_HOURS,
+)
+from app.models.tweet import Tweet
+from app.utils.text_search import normalize_search_text
+
+logger = logging.getLogger(__name__)
+
+# トレンド API の集計期間の指定形式（例: 24h, 7d）
+_TREND_WINDOW_PATTERN = re.compile(r'^([1-9][0-9]*)([hd])$')
+
+
+def normalize_hashtag(tag: str) -> str:
+    """
+    ハッシュタグを集計用に正規化する（全角・半角の統一、小文字化、先頭の # の除去）
+
+    Args:
+        tag: ハッシュタグ
+
+    Returns:
+        str: 正規化したハッシュタグ
+    """
+    return normalize_search_text(tag).strip().lstrip('#')
+
+
+def extract_hashtags(hashtags: Any) -> list[str]:
+    """
+    Tweet.hashtags の JSON から正規化したハッシュタグを重複なく取り出す
+
+    twikit はタグの文字列の一覧を返すが、API のエンティティ形式（{"text": ...}）も受け付ける。
+
+    Args:
+        hashtags: Tweet.hashtags の値
+
+    Returns:
+        list[str]: 正規化したハッシュタグの一覧（出現順）
+    """
+    if not isinstance(hashtags, list):
+        return []
+
+    tags: list[str] = []
+    for hashtag in hashtags:
+        if isinstance(hashtag, dict):
+            hashtag = hashtag.get('text')
+        if not isinstance(hashtag, str):
+            continue
+        tag = normalize_hashtag(hashtag)
+        if tag:
+            tags.append(tag)
+    return list(dict.fromkeys(tags))
+
+
+def hashtag_bucket(timestamp: int) -> int:
+    """
+    Unix timestamp をカウンターの時間バケットの開始日時に切り捨てる
+
+    Args:
+        timestamp: Unix timestamp
+
+    Returns:
+        int: HASHTAG_BUCKET_SECONDS 単位に切り捨てた Unix timestamp
+    """
+    return timestamp - timestamp % HASHTAG_BUCKET_SECONDS
+
+
+def parse_trend_window(window: str) -> int:
+    """
+    トレンド API の集計期間の指定（例: 24h, 7d）を秒数に変換する
+
+    Args:
+        window: 数値と単位（h: 時間 / d: 日）からなる集計期間
+
+    Returns:
+        int: 集計期間の秒数
+
+    Raises:
+        ValueError: 形式が不正な場合、または TREND_WINDOW_MAX_HOURS を超える場合
+    """
+    match = _TREND_WINDOW_PATTERN.match(window)
+    if not match:
+        raise ValueError(f'Invalid trend window: {window}')
+
+    hours = int(match.group(1)) * (24 if match.group(2) == 'd' else 1)
+    if hours > TREND_WINDOW_MAX_HOURS:
+        raise ValueError(f'Trend window is too long: {window}')
+    return hours * 3600
+
+
+async def record_tweet_hashtags(tweet: Tweet) -> None:
+    """
+    取り込んだツイートのハッシュタグを展開し、時間バケット別のカウンターに加算する
+
+    新しく展開したタグの分だけを加算するため、同じツイートで再実行しても二重に数えない。
+
+    Args:
+        tweet: 保存済みのツイート（引用元ツイートは対象外）
+    """
+    tags = extract_hashtags(tweet.hashtags)
+    if not tags:
+        return
+
+    sql = f"""
+        WITH "inserted" AS (
+            INSERT INTO "{TABLE_TWEET_HASHTAGS}" (
+                "tweet_id", "tag", "target_account_id", "posted_at"
+            )
+            SELECT $1, "tag", $3, $4 FROM unnest($2::text[]) AS "tag"
+            ON CONFLICT ("tweet_id", "tag") DO NOTHING
+            RETURNING "tag"
+        )
+        INSERT INTO "{TABLE_HASHTAG_COUNTS}" (
+            "target_account_id", "bucket_start", "tag", "count"
+        )
+        SELECT $3, $5, "tag", 1 FROM "inserted"
+        ON CONFLICT ("target_account_id", "bucket_start", "tag") DO UPDATE SET
+            "count" = "{TABLE_HASHTAG_COUNTS}"."count" + 1
+    """
+    await connections.get('default').execute_query(
+        sql,
+        [
+            tweet.id,
+            tags,
+            tweet.target_account_id,
+            tweet.posted_at,
+            hashtag_bucket(tweet.posted_at),
+        ],
+    )
+
+
+async def get_trending_hashtags(
+    target_account_ids: list[int], since: int, limit: int
+) -> list[dict[str, Any]]:
+    """
+    ターゲットアカウント群の期間内のハッシュタグを出現数の多い順に取得する
+
+    Args:
+        target_account_ids: 集計対象のターゲットアカウント ID 一覧
+        since: 集計期間の開始日時（Unix timestamp、この日時を含むバケットから集計）
+        limit: 取得するハッシュタグ数
+
+    Returns:
+        list[dict[str, Any]]: {'tag': タグ, 'count': 出現数} の一覧
+    """
+    if not target_account_ids:
+        return []
+
+    return await connections.get('default').execute_query_dict(
+        f"""
+        SELECT "tag", sum("count")::int AS "count"
+        FROM "{TABLE_HASHTAG_COUNTS}"
+        WHERE "target_account_id" = ANY($1::bigint[]) AND "bucket_start" >= $2
+        GROUP BY "tag"
+        ORDER BY "count" DESC, "tag"
+        LIMIT $3
+        """,
+        [target_account_ids, hashtag_bucket(since), limit],
+    )
+
+
+async def prune_hashtag_counts() -> int:
+    """
+    トレンド API の集計期間の最大値より古いカウンターを削除する（定期ジョブから実行）
+
+    Returns:
+        int: 削除したカウンターの行数
+    """
+    horizon = hashtag_bucket(int(time.time()) - TREND_WINDOW_MAX_HOURS * 3600)
+    rows = await connections.get('default').execute_query_dict(
+        f"""
+        WITH "deleted" AS (
+            DELETE FROM "{TABLE_HASHTAG_COUNTS}" WHERE "bucket_start" < $1
+            RETURNING 1
+        )
+        SELECT count(*) AS "count" FROM "deleted"
+        """,
+        [horizon],
+    )
+    deleted_count = rows[0]['count']
+    logger.info(f'Pruned {deleted_count} hashtag counters')
+    return deleted_count
@@ -0,0 +1,108 @@
+"""
+ユーザー別のタイムライン・ターゲットアカウントの所属関係キャッシュ
+
+ツイート一覧・詳細 API はリクエストのたびに「ユーザーのアクティブなターゲットアカウント」
+「タイムラインに所属するターゲットアカウント」の ID 一覧を必要とするため、
+ユーザーごとに読み込んだ所属関係をメモリに保持する。
+
+タイムライン・ターゲットアカウントの作成・更新・削除時は users.membership_version（世代）を
+加算し、リクエストごとに読み込むユーザーの世代とキャッシュの世代が一致する間は DB を参照しない。
+ターゲットアカウントの所有者が他のユーザーに移る場合は、移す前の所有者の世代も加算する。
+世代は DB に保持するため、複数ワーカーで起動した場合も変更後のリクエストで読み込み直される。
+"""
+
+from dataclasses import dataclass
+
+from tortoise.expressions import F
+
+from app.models.target_account import TargetAccount
+from app.models.timeline import Timeline
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class TimelineMembership:
+    """タイムラインとそれに所属するターゲットアカウント"""
+
+    # target_accounts を prefetch 済みのタイムライン（複数リクエストで共有するため読み取り専用）
+    timeline: Timeline
+    # 所属するターゲットアカウント ID（一覧・未読数・トレンドはすべてこれを対象にする）
+    target_account_ids: list[int]
+    active_target_account_ids: list[int]  # 所属するアクティブなターゲットアカウント ID
+
+
+@dataclass(frozen=True)
+class UserMembership:
+    """ユーザーのターゲットアカウント・タイムラインの所属関係"""
+
+    active_target_account_ids: list[int]  # アクティブなターゲットアカウント ID
+    timelines: dict[int, TimelineMembership]  # アクティブなタイムライン ID -> 所属関係
+
+
+# ユーザー ID -> (読み込み時の membership_version, 所属関係)
+# ユーザーあたりタイムライン・アカウント数分の小さなデータのため、全ユーザー分を保持する
+_membership_cache: dict[int, tuple[int, UserMembership]] = {}
+
+
+async def _load_membership(user_id: int) -> UserMembership:
+    """DB からユーザーの所属関係を読み込む"""
+    active_target_account_ids = (
+        await TargetAccount.filter(user_id=user_id, is_active=True)
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+    timelines = await Timeline.filter(user_id=user_id, is_active=True).prefetch_related(
+        'target_accounts'
+    )
+    # 他のユーザーに所有者が移ったアカウントはタイムラインに残っていても含めない
+    return UserMembership(
+        active_target_account_ids=list(active_target_account_ids),
+        timelines={
+            timeline.id: TimelineMembership(
+                timeline=timeline,
+                target_account_ids=[
+                    account.id
+                    for account in timeline.target_accounts
+                    if account.user_id == user_id
+                ],
+                active_target_account_ids=[
+                    account.id
+                    for account in timeline.target_accounts
+                    if account.user_id == user_id and account.is_active
+                ],
+            )
+            for timeline in timelines
+        },
+    )
+
+
+async def get_user_membership(user: User) -> UserMembership:
+    """
+    ユーザーのターゲットアカウント・タイムラインの所属関係を取得する
+
+    Args:
+        user: リクエスト時に読み込んだユーザー
+
+    Returns:
+        UserMembership: 所属関係（呼び出し側で変更しないこと）
+    """
+    cached = _membership_cache.get(user.id)
+    if cached is not None and cached[0] == user.membership_version:
+        return cached[1]
+
+    membership = await _load_membership(user.id)
+    _membership_cache[user.id] = (user.membership_version, membership)
+    return membership
+
+
+async def bump_membership_version(user_id: int) -> None:
+    """
+    ユーザーの所属関係の世代を加算する
+
+    タイムライン・ターゲットアカウントを作成・更新・削除した場合は必ず呼び出す。
+
+    Args:
+        user_id: EchoBird ユーザー ID
+    """
+    await User.filter(id=user_id).update(membership_version=F('membership_version') + 1)
+    _membership_cache.pop(user_id, None)
@@ -0,0 +1,521 @@
+"""
+ツイートの既読状態の一括更新・判定・畳み込みと、ツイート一覧の未読絞り込み・未読数の集計
+
+既読状態は、ユーザー・ターゲットアカウント別の既読位置（read_watermarks）と、
+それより新しいツイートの個別の既読行（read_tweets）の組で表す。
+定期ジョブで既読行を既読位置に畳み込むことで、既読状態の行数と判定コストを一定に保つ。
+
+既読化は INSERT ... ON CONFLICT DO NOTHING の 1 文で行い、新しく既読になった
+ツイートのみをキャッシュと ETag 用のバージョンに反映する。
+
+未読絞り込みは read_tweets(user_id, tweet_id) の一意制約のインデックスと
+既読位置に対する NOT EXISTS で既読ツイートを除外する。PostgreSQL はこれを anti-join
+として計画するため、未読のみのページングも通常のページングとほぼ同じコストで行える。
+
+Tortoise ORM の annotate() + filter() では条件が「NOT EXISTS (...) = $n」の形になり、
+プランナーが anti-join に変換できないため、WHERE 句に NOT EXISTS をそのまま出力する
+RawQ を用いる。
+
+未読数はユーザー・ターゲットアカウントの組ごとにキャッシュし、取り込み・既読化で状態が
+変わったアカウントだけを数え直す。
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+from tortoise import connections
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
+
+from app.constants import (
+    READ_WATERMARK_CACHE_MAX_USERS,
+    READ_WATERMARK_HORIZON_DAYS,
+    TABLE_READ_TWEETS,
+    TABLE_READ_WATERMARKS,
+    TABLE_TARGET_ACCOUNTS,
+    TABLE_TWEETS,
+    UNREAD_COUNT_CACHE_MAX_ENTRIES,
+)
+from app.models.read_watermark import ReadWatermark
+from app.models.user import User
+from app.services.tweet_state_cache import bump_tweet_state_version, tweet_state_cache
+from app.utils.pagination import PageCursor
+from app.utils.raw_sql import RawQ
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class BoundedCache(Generic[K, V]):
+    """エントリ数の上限を超えた分を、最も長く参照されていないものから破棄する辞書（LRU）"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[K, V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """エントリを取得し、最近参照したものとして扱う"""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """エントリを保存し、上限を超えた分を破棄する"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _covered_by_watermark_sql(user_id_sql: str, tweet_id_sql: str) -> str:
+    """
+    ツイートがユーザーの既読位置以下にあるかを判定する EXISTS 句を生成する
+
+    Args:
+        user_id_sql: ユーザー ID を表す SQL（プレースホルダーまたは整数リテラル）
+        tweet_id_sql: 判定するツイートの ID を表す SQL（外側のクエリの列）
+
+    Returns:
+        str: EXISTS (...) 形式の SQL
+    """
+    return (
+        f'EXISTS (SELECT 1 FROM "{TABLE_READ_WATERMARKS}" "w" '
+        f'JOIN "{TABLE_TWEETS}" "t" ON "t"."target_account_id" = "w"."target_account_id" '
+        f'WHERE "w"."user_id" = {user_id_sql} AND "t"."id" = {tweet_id_sql} '
+        f'AND ("t"."posted_at", "t"."id") <= ("w"."posted_at", "w"."tweet_id"))'
+    )
+
+
+@dataclass
+class ReadWatermarks:
+    """ユーザーのターゲットアカウント別の既読位置"""
+
+    # ターゲットアカウント ID -> (posted_at, ツイート ID)
+    positions: dict[int, tuple[int, int]] = field(default_factory=dict)
+
+    def covers(self, tweet: Any) -> bool:
+        """ツイートが既読位置以下にある（既読として扱う）かどうか"""
+        position = self.positions.get(tweet.target_account_id)
+        return position is not None and (tweet.posted_at, tweet.id) <= position
+
+
+# ユーザー ID -> (読み込み時の tweet_state_version, 既読位置)
+_watermark_cache: BoundedCache[int, tuple[int, ReadWatermarks]] = BoundedCache(
+    READ_WATERMARK_CACHE_MAX_USERS
+)
+
+
+async def get_read_watermarks(user: User) -> ReadWatermarks:
+    """
+    ユーザーの既読位置を取得する
+
+    既読位置の更新時は tweet_state_version を加算するため、バージョンが一致する間は
+    DB を参照せずにキャッシュを返す（複数ワーカー間でも一貫する）。
+
+    Args:
+        user: リクエスト時に読み込んだユーザー
+
+    Returns:
+        ReadWatermarks: ユーザーの既読位置
+    """
+    cached = _watermark_cache.get(user.id)
+    if cached is not None and cached[0] == user.tweet_state_version:
+        return cached[1]
+
+    rows = await ReadWatermark.filter(user_id=user.id).values_list(
+        'target_account_id', 'posted_at', 'tweet_id'
+    )
+    watermarks = ReadWatermarks(
+        positions={
+            target_account_id: (posted_at, tweet_id)
+            for target_account_id, posted_at, tweet_id in rows
+        }
+    )
+    _watermark_cache.set(user.id, (user.tweet_state_version, watermarks))
+    return watermarks
+
+
+async def _record_newly_read(user_id: int, tweet_ids: list[int]) -> None:
+    """新しく既読になったツイートをキャッシュと ETag 用のバージョンに反映する"""
+    if not tweet_ids:
+        return
+    tweet_state_cache.mark(user_id, 'read', tweet_ids)
+    await bump_tweet_state_version(user_id)
+
+
+async def mark_tweets_read(user_id: int, tweet_ids: list[int]) -> list[int]:
+    """
+    指定したツイートを 1 文の INSERT でまとめて既読にする
+
+    存在しないツイート ID と既読済み（既読位置以下を含む）のツイートは無視する。
+
+    Args:
+        user_id: 既読にするユーザーの ID
+        tweet_ids: 既読にするツイートの ID
+
+    Returns:
+        list[int]: 新しく既読になったツイートの ID
+    """
+    if not tweet_ids:
+        return []
+
+    _, rows = await connections.get('default').execute_query(
+        f'''
+        INSERT INTO "{TABLE_READ_TWEETS}" ("user_id", "tweet_id", "read_at")
+        SELECT $1, "id", $2 FROM "{TABLE_TWEETS}"
+        WHERE "id" = ANY($3::bigint[])
+        AND NOT {_covered_by_watermark_sql('$1', f'"{TABLE_TWEETS}"."id"')}
+        ON CONFLICT ("user_id", "tweet_id") DO NOTHING
+        RETURNING "tweet_id"
+        ''',
+        [user_id, int(time.time()), list(set(tweet_ids))],
+    )
+    newly_read_ids = [row['tweet_id'] for row in rows]
+    await _record_newly_read(user_id, newly_read_ids)
+    return newly_read_ids
+
+
+async def mark_range_read(
+    user_id: int,
+    target_account_ids: list[int],
+    up_to: PageCursor | None,
+) -> list[int]:
+    """
+    アカウント群のツイートのうち、カーソル位置以降（より新しいもの）をまとめて既読にする
+
+    INSERT ... SELECT の 1 文で既読を書き込むため、件数にかかわらずツイートを
+    アプリケーションに読み込まない。
+
+    Args:
+        user_id: 既読にするユーザーの ID
+        target_account_ids: 対象のターゲットアカウント ID（引用元ツイートは除く）
+        up_to: 一覧 API（sort=latest）のカーソル。カーソルが指すツイート自身と
+            それより新しいツイートを既読にする（None の場合はすべて）
+
+    Returns:
+        list[int]: 新しく既読になったツイートの ID
+    """
+    if not target_account_ids:
+        return []
+
+    params: list = [user_id, int(time.time()), target_account_ids]
+    range_condition = ''
+    if up_to is not None:
+        range_condition = 'AND ("posted_at", "id") >= ($4, $5)'
+        params.extend([up_to.value, up_to.id])
+
+    _, rows = await connections.get('default').execute_query(
+        f'''
+        INSERT INTO "{TABLE_READ_TWEETS}" ("user_id", "tweet_id", "read_at")
+        SELECT $1, "id", $2 FROM "{TABLE_TWEETS}"
+        WHERE "target_account_id" = ANY($3::bigint[]) AND "is_quoted" = False
+        {range_condition}
+        AND NOT {_covered_by_watermark_sql('$1', f'"{TABLE_TWEETS}"."id"')}
+        ON CONFLICT ("user_id", "tweet_id") DO NOTHING
+        RETURNING "tweet_id"
+        ''',
+        params,
+    )
+    newly_read_ids = [row['tweet_id'] for row in rows]
+    await _record_newly_read(user_id, newly_read_ids)
+    return newly_read_ids
+
+
+def filter_unread(
+    query: QuerySet, user_id: int, tweet_id_column: str = 'id'
+) -> QuerySet:
+    """
+    ユーザーが既読にしたツイート（既読位置以下のツイートを含む）を除外する
+
+    Args:
+        query: ツイート ID の列を持つモデル（Tweet / TimelineEntry）のクエリセット
+        user_id: 既読状態を判定するユーザーの ID
+        tweet_id_column: query のテーブルでツイート ID を持つ列名
+
+    Returns:
+        QuerySet: 未読のツイートのみに絞り込んだクエリセット
+    """
+    tweet_id_sql = f'"{query.model._meta.db_table}"."{tweet_id_column}"'
+    return query.filter(
+        RawQ(
+            f'NOT EXISTS (SELECT 1 FROM "{TABLE_READ_TWEETS}" '
+            f'WHERE "{TABLE_READ_TWEETS}"."user_id" = {int(user_id)} '
+            f'AND "{TABLE_READ_TWEETS}"."tweet_id" = {tweet_id_sql}) '
+            f'AND NOT {_covered_by_watermark_sql(str(int(user_id)), tweet_id_sql)}'
+        )
+    )
+
+
+# (ユーザー ID, ターゲットアカウント ID) -> (集計時の状態, 未読ツイート数)
+_unread_count_cache: BoundedCache[tuple[int, int], tuple[tuple, int]] = BoundedCache(
+    UNREAD_COUNT_CACHE_MAX_ENTRIES
+)
+
+
+async def _get_unread_count_states(
+    user_id: int, account_ids: list[int]
+) -> dict[int, tuple]:
+    """
+    ターゲットアカウント別に、未読数が変わると必ず変わる状態を取得する
+
+    状態は保存済みツイート数（取り込み・アーカイブで増減）、既読位置、
+    ユーザーのそのアカウントへの既読行の数と最大の行 ID（既読化・畳み込みで変わる）の組で、
+    ツイートを数えずにインデックスと既読行だけから求める。
+
+    Returns:
+        dict[int, tuple]: ターゲットアカウント ID -> 状態
+    """
+    rows = await connections.get('default').execute_query_dict(
+        f'''
+        SELECT "a"."id", "a"."stored_tweets_count",
+            "w"."posted_at" AS "watermark_posted_at",
+            "w"."tweet_id" AS "watermark_tweet_id",
+            coalesce("r"."read_count", 0) AS "read_count",
+            coalesce("r"."last_read_id", 0) AS "last_read_id"
+        FROM "{TABLE_TARGET_ACCOUNTS}" "a"
+        LEFT JOIN "{TABLE_READ_WATERMARKS}" "w"
+            ON "w"."user_id" = $1 AND "w"."target_account_id" = "a"."id"
+        LEFT JOIN (
+            SELECT "t"."target_account_id", count(*) AS "read_count",
+                max("rt"."id") AS "last_read_id"
+            FROM "{TABLE_READ_TWEETS}" "rt"
+            JOIN "{TABLE_TWEETS}" "t" ON "t"."id" = "rt"."tweet_id"
+            WHERE "rt"."user_id" = $1 AND "t"."target_account_id" = ANY($2::bigint[])
+            GROUP BY "t"."target_account_id"
+        ) "r" ON "r"."target_account_id" = "a"."id"
+        WHERE "a"."id" = ANY($2::bigint[])
+        ''',
+        [user_id, account_ids],
+    )
+    return {
+        row['id']: (
+            row['stored_tweets_count'],
+            row['watermark_posted_at'],
+            row['watermark_tweet_id'],
+            row['read_count'],
+            row['last_read_id'],
+        )
+        for row in rows
+    }
+
+
+async def _count_unread_tweets_by_account(
+    user_id: int, account_ids: list[int]
+) -> dict[int, int]:
+    """ターゲットアカウント別の未読ツイート数を 1 回の集計クエリで数える"""
+    rows = await connections.get('default').execute_query_dict(
+        f'''
+        SELECT "target_account_id", count(*)::int AS "count" FROM "{TABLE_TWEETS}"
+        WHERE "target_account_id" = ANY($2::bigint[]) AND "is_quoted" = False
+        AND NOT EXISTS (SELECT 1 FROM "{TABLE_READ_TWEETS}"
+            WHERE "{TABLE_READ_TWEETS}"."user_id" = $1
+            AND "{TABLE_READ_TWEETS}"."tweet_id" = "{TABLE_TWEETS}"."id")
+        AND NOT {_covered_by_watermark_sql('$1', f'"{TABLE_TWEETS}"."id"')}
+        GROUP BY "target_account_id"
+        ''',
+        [user_id, account_ids],
+    )
+    unread_counts = dict.fromkeys(account_ids, 0)
+    for row in rows:
+        unread_counts[row['target_account_id']] = row['count']
+    return unread_counts
+
+
+async def count_unread_tweets(
+    user: User, target_account_ids: list[int]
+) -> dict[int, int]:
+    """
+    ターゲットアカウント別の未読ツイート数を数える
+
+    未読数はユーザー・ターゲットアカウントの組ごとにキャッシュし、
+    _get_unread_count_states の状態が集計時と変わったアカウントだけを 1 回の集計クエリで
+    数え直す。取り込みや既読化があっても、そのアカウント以外は数え直さない
+    （DB の値で判定するため複数ワーカー間でも一貫する）。
+
+    Args:
+        user: リクエスト時に読み込んだユーザー
+        target_account_ids: 集計対象のターゲットアカウント ID 一覧
+
+    Returns:
+        dict[int, int]: ターゲットアカウント ID -> 未読ツイート数（引用元ツイートは除く）
+    """
+    if not target_account_ids:
+        return {}
+
+    account_ids = sorted(set(target_account_ids))
+    states = await _get_unread_count_states(user.id, account_ids)
+
+    unread_counts = dict.fromkeys(account_ids, 0)
+    stale_account_ids = []
+    for account_id, state in states.items():
+        cached = _unread_count_cache.get((user.id, account_id))
+        if cached is not None and cached[0] == state:
+            unread_counts[account_id] = cached[1]
+        else:
+            stale_account_ids.append(account_id)
+
+    if stale_account_ids:
+        # 状態は集計より先に取得しているため、集計中の変更は次回の状態の比較で検出される
+        recounted = await _count_unread_tweets_by_account(user.id, stale_account_ids)
+        for account_id, count in recounted.items():
+            unread_counts[account_id] = count
+            _unread_count_cache.set((user.id, account_id), (states[account_id], count))
+
+    return unread_counts
+
+
+async def _compact_account_read_state(
+    user_id: int, target_account_id: int, horizon: int | None
+) -> tuple[int, bool]:
+    """
+    1 ユーザー・1 アカウント分の既読行を既読位置に畳み込む
+
+    既読位置より新しい最古の未読ツイートの直前にある既読ツイートまで既読位置を進め、
+    既読位置以下になった既読行を削除する。未読ツイートは投稿日時に関係なく前進を止めるため、
+    畳み込みで既読状態が変わることはない（horizon を指定した場合を除く）。
+
+    Args:
+        user_id: ユーザー ID
+        target_account_id: ターゲットアカウント ID
+        horizon: 指定した場合、この投稿日時より古い未読ツイートは既読位置の前進を妨げない
+
+    Returns:
+        tuple[int, bool]: (削除した既読行の数, 既読位置を進めたかどうか)
+    """
+    moved = False
+    async with in_transaction() as connection:
+        rows = await connection.execute_query_dict(
+            f'''
+            WITH "current" AS (
+                SELECT "posted_at", "tweet_id" FROM "{TABLE_READ_WATERMARKS}"
+                WHERE "user_id" = $1 AND "target_account_id" = $2
+            ), "first_unread" AS (
+                SELECT "t"."posted_at", "t"."id" FROM "{TABLE_TWEETS}" "t"
+                WHERE "t"."target_account_id" = $2 AND "t"."is_quoted" = False
+                AND ($3::int IS NULL OR "t"."posted_at" >= $3::int)
+                AND NOT EXISTS (
+                    SELECT 1 FROM "current" "c"
+                    WHERE ("t"."posted_at", "t"."id") <= ("c"."posted_at", "c"."tweet_id")
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM "{TABLE_READ_TWEETS}" "r"
+                    WHERE "r"."user_id" = $1 AND "r"."tweet_id" = "t"."id"
+                )
+                ORDER BY "t"."posted_at", "t"."id" LIMIT 1
+            )
+            SELECT "t"."posted_at", "t"."id" FROM "{TABLE_READ_TWEETS}" "r"
+            JOIN "{TABLE_TWEETS}" "t" ON "t"."id" = "r"."tweet_id"
+            WHERE "r"."user_id" = $1 AND "t"."target_account_id" = $2
+            AND "t"."is_quoted" = False
+            AND NOT EXISTS (
+                SELECT 1 FROM "first_unread" "f"
+                WHERE ("t"."posted_at", "t"."id") >= ("f"."posted_at", "f"."id")
+            )
+            ORDER BY "t"."posted_at" DESC, "t"."id" DESC LIMIT 1
+            ''',
+            [user_id, target_account_id, horizon],
+        )
+        if rows:
+            # 既読位置を進める（既存の既読位置より後ろには戻さない）
+            moved_count, _ = await connection.execute_query(
+                f'''
+                INSERT INTO "{TABLE_READ_WATERMARKS}"
+                    ("user_id", "target_account_id", "posted_at", "tweet_id", "updated_at")
+                VALUES ($1, $2, $3, $4, $5)
+                ON CONFLICT ("user_id", "target_account_id") DO UPDATE
+                SET "posted_at" = EXCLUDED."posted_at",
+                    "tweet_id" = EXCLUDED."tweet_id",
+                    "updated_at" = EXCLUDED."updated_at"
+                WHERE ("{TABLE_READ_WATERMARKS}"."posted_at", "{TABLE_READ_WATERMARKS}"."tweet_id")
+                    < (EXCLUDED."posted_at", EXCLUDED."tweet_id")
+                RETURNING 1
+                ''',
+                [
+                    user_id,
+                    target_account_id,
+                    rows[0]['posted_at'],
+                    rows[0]['id'],
+                    int(time.time()),
+                ],
+            )
+            moved = moved_count > 0
+
+        # 既読位置以下になった既読行を削除
+        deleted = await connection.execute_query_dict(
+            f'''
+            WITH "deleted" AS (
+                DELETE FROM "{TABLE_READ_TWEETS}" "r"
+                USING "{TABLE_TWEETS}" "t", "{TABLE_READ_WATERMARKS}" "w"
+                WHERE "r"."user_id" = $1 AND "t"."id" = "r"."tweet_id"
+                AND "w"."user_id" = $1 AND "w"."target_account_id" = $2
+                AND "t"."target_account_id" = $2
+                AND ("t"."posted_at", "t"."id") <= ("w"."posted_at", "w"."tweet_id")
+                RETURNING 1
+            )
+            SELECT count(*) AS "count" FROM "deleted"
+            ''',
+            [user_id, target_account_id],
+        )
+    return deleted[0]['count'], moved
+
+
+async def compact_read_state() -> int:
+    """
+    全ユーザーの既読行を既読位置に畳み込む（定期ジョブから実行）
+
+    畳み込みで既読状態が変わったユーザーはキャッシュを破棄し、
+    ETag 用のバージョンを加算する。
+
+    Returns:
+        int: 削除した既読行の数
+    """
+    # 既定では未読ツイートを既読扱いにしない（有効期限は READ_WATERMARK_HORIZON_DAYS で任意に設定）
+    horizon = (
+        int(time.time()) - READ_WATERMARK_HORIZON_DAYS * 86400
+        if READ_WATERMARK_HORIZON_DAYS > 0
+        else None
+    )
+    pairs = await connections.get('default').execute_query_dict(
+        f'''
+        SELECT DISTINCT "r"."user_id", "t"."target_account_id"
+        FROM "{TABLE_READ_TWEETS}" "r"
+        JOIN "{TABLE_TWEETS}" "t" ON "t"."id" = "r"."tweet_id"
+        '''
+    )
+
+    total_deleted = 0
+    compacted_user_ids: set[int] = set()
+    for pair in pairs:
+        try:
+            deleted_count, moved = await _compact_account_read_state(
+                pair['user_id'], pair['target_account_id'], horizon
+            )
+        except Exception as ex:
+            logger.error(
+                f'Failed to compact read state of user {pair["user_id"]} '
+                f'for account {pair["target_account_id"]}',
+                exc_info=ex,
+            )
+            continue
+        total_deleted += deleted_count
+        if deleted_count or moved:
+            compacted_user_ids.add(pair['user_id'])
+
+    for user_id in compacted_user_ids:
+        tweet_state_cache.invalidate(user_id, 'read')
+        await bump_tweet_state_version(user_id)
+
+    logger.info(
+        f'Compacted {total_deleted} read rows of {len(compacted_user_ids)} users '
+        'into read watermarks'
+    )
+    return total_deleted
@@ -0,0 +1,134 @@
+"""
+カスタムタイムラインのマテリアライズドフィード（timeline_entries）管理サービス
+
+ツイート取り込み時に、投稿元アカウントを含む全タイムラインへエントリを書き込んでおく
+（fan-out-on-write）。タイムラインのアカウント構成が変わった場合は、
+追加されたアカウントの既存ツイートを埋め戻し、外されたアカウントのエントリを削除する。
+"""
+
+import logging
+
+from tortoise import connections
+from tortoise.expressions import Subquery
+
+from app.constants import TABLE_TIMELINE_ENTRIES, TABLE_TWEETS
+from app.models.timeline import Timeline
+from app.models.timeline_entry import TimelineEntry
+from app.models.tweet import Tweet
+
+logger = logging.getLogger(__name__)
+
+
+async def fan_out_tweet(tweet: Tweet) -> None:
+    """
+    取り込んだツイートを、投稿元アカウントを含む全タイムラインのフィードに追加する
+
+    Args:
+        tweet: 保存済みのツイート（引用元ツイートは対象外）
+    """
+    if tweet.is_quoted:
+        return
+
+    timeline_ids = await Timeline.filter(
+        target_accounts__id=tweet.target_account_id
+    ).values_list('id', flat=True)
+    if not timeline_ids:
+        return
+
+    await TimelineEntry.bulk_create(
+        [
+            TimelineEntry(
+                timeline_id=timeline_id,
+                tweet_id=tweet.id,
+                posted_at=tweet.posted_at,
+                engagement_score=tweet.engagement_score,
+            )
+            for timeline_id in timeline_ids
+        ],
+        ignore_conflicts=True,
+    )
+
+
+async def sync_timeline_entries(
+    timeline_id: int,
+    added_account_ids: set[int],
+    removed_account_ids: set[int],
+) -> None:
+    """
+    タイムラインのアカウント構成の変更をフィードに反映する
+
+    Args:
+        timeline_id: 構成が変わったタイムラインの ID
+        added_account_ids: 追加されたターゲットアカウントの ID（既存ツイートを埋め戻す）
+        removed_account_ids: 外されたターゲットアカウントの ID（エントリを削除する）
+    """
+    if removed_account_ids:
+        # 外されたアカウントのツイートをフィードから削除
+        deleted_count = await TimelineEntry.filter(
+            timeline_id=timeline_id,
+            tweet_id__in=Subquery(
+                Tweet.filter(target_account_id__in=list(removed_account_ids)).values(
+                    'id'
+                )
+            ),
+        ).delete()
+        logger.info(
+            f'Pruned {deleted_count} timeline entries from timeline {timeline_id}'
+        )
+
+    if added_account_ids:
+        # 追加されたアカウントの既存ツイートを 1 文の INSERT ... SELECT で埋め戻す
+        # 挿入件数は RETURNING を数えて取得する（行そのものは返さない）
+        rows = await connections.get('default').execute_query_dict(
+            f'''
+            WITH "inserted" AS (
+                INSERT INTO "{TABLE_TIMELINE_ENTRIES}"
+                    ("timeline_id", "tweet_id", "posted_at", "engagement_score")
+                SELECT $1, "id", "posted_at", "engagement_score" FROM "{TABLE_TWEETS}"
+                WHERE "target_account_id" = ANY($2::bigint[]) AND "is_quoted" = False
+                ON CONFLICT ("timeline_id", "tweet_id") DO NOTHING
+                RETURNING 1
+            )
+            SELECT count(*) AS "count" FROM "inserted"
+            ''',
+            [timeline_id, list(added_account_ids)],
+        )
+        logger.info(
+            f'Backfilled {rows[0]["count"]} timeline entries into timeline {timeline_id}'
+        )
+
+
+async def update_entry_engagement_scores(tweet: Tweet) -> None:
+    """
+    ツイートのエンゲージメントスコアの変更を、ツイートを含む全フィードのエントリに反映する
+
+    Args:
+        tweet: エンゲージメントスコアを更新したツイート
+    """
+    if tweet.is_quoted:
+        return
+
+    await TimelineEntry.filter(tweet_id=tweet.id).update(
+        engagement_score=tweet.engagement_score
+    )
+
+
+async def get_entry_tweets(entries: list[TimelineEntry]) -> list[Tweet]:
+    """
+    フィードのエントリに対応するツイートを、エントリと同じ順序で取得する
+
+    Args:
+        entries: 新しい順に並んだタイムラインエントリ
+
+    Returns:
+        list[Tweet]: select_related('target_account') 済みのツイート一覧
+    """
+    tweet_ids = [entry.tweet_id for entry in entries]
+    if not tweet_ids:
+        return []
+
+    tweets = await Tweet.filter(id__in=tweet_ids).select_related(
+        'target_account', 'quoted_tweet_ref__target_account'
+    )
+    tweet_map = {tweet.id: tweet for tweet in tweets}
+    return [tweet_map[tweet_id] for tweet_id in tweet_ids if tweet_id in tweet_map]
@@ -0,0 +1,354 @@
+"""
+保持期間を過ぎたツイートのアーカイブ（コールドストレージへの退避）と読み戻し
+
+環境変数 TWEET_RETENTION_DAYS（日数、0 以下は無期限）で保持期間を設定すると、定期ジョブが
+投稿日時が保持期間を過ぎたツイートを、ターゲットアカウントごとに投稿日時の古い順に
+TWEET_ARCHIVE_BATCH_SIZE 件ずつ gzip 圧縮した NDJSON（1 行 1 ツイート、メディアの
+メタデータを含む）にまとめて MinIO のアーカイブ用バケットに保存し、DB から削除する。
+
+TWEET_RETENTION_KEEP_BOOKMARKED（既定は true）の間はブックマークされたツイートを残す。
+保存済みのツイートから引用元として参照されているツイートも、参照が残る間は削除しない。
+メディアファイル本体はメディア用バケットに残し、アーカイブにはその参照（local_path）を含める。
+
+対象の選択・アップロード・削除は対象のツイートを行ロックした 1 トランザクションで行い、
+アップロードに失敗した場合は削除せず、DB への反映に失敗した場合はアップロードしたファイルを
+削除するため、アーカイブされずに失われるツイートも、参照されないファイルも残らない。
+削除したツイートの既読・ブックマークは、コミット後に各ユーザーのキャッシュと
+ETag 用のバージョンに反映する。アーカイブファイルは tweet_archives に
+期間とともに記録し、期間を指定した読み戻しは重なるファイルだけを読み込む。
+"""
+
+import gzip
+import json
+import logging
+import os
+import time
+import uuid
+from collections import defaultdict
+from typing import Any
+
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
+
+from app.constants import (
+    TABLE_BOOKMARKED_TWEETS,
+    TABLE_TWEETS,
+    TWEET_ARCHIVE_BATCH_SIZE,
+    TWEET_RETENTION_DAYS_DEFAULT,
+)
+from app.models.bookmarked_tweet import BookmarkedTweet
+from app.models.media import Media
+from app.models.read_tweet import ReadTweet
+from app.models.target_account import TargetAccount
+from app.models.tweet import Tweet
+from app.models.tweet_archive import TweetArchive
+from app.services.tweet_count import increment_stored_tweets_count
+from app.services.tweet_partitions import delete_tweet_dependents
+from app.services.tweet_state_cache import bump_tweet_state_version, tweet_state_cache
+from app.utils.raw_sql import RawQ
+from app.utils.s3_client import (
+    delete_archive_file,
+    download_archive_file,
+    upload_archive_file,
+)
+
+logger = logging.getLogger(__name__)
+
+# ツイートを DB に保持する日数（0 以下は無期限でアーカイブしない）
+TWEET_RETENTION_DAYS = int(
+    os.getenv('TWEET_RETENTION_DAYS', str(TWEET_RETENTION_DAYS_DEFAULT))
+)
+# 保持期間を過ぎてもブックマークされたツイートを残すかどうか
+TWEET_RETENTION_KEEP_BOOKMARKED = (
+    os.getenv('TWEET_RETENTION_KEEP_BOOKMARKED', 'true').lower() == 'true'
+)
+
+# アーカイブに含めないツイートの列（全文検索用の列は本文から再計算できる）
+EXCLUDED_TWEET_FIELDS = ('search_text', 'search_bigrams')
+
+
+def retention_cutoff(now: int, retention_days: int) -> int | None:
+    """
+    保持期間の境界となる投稿日時を返す
+
+    Args:
+        now: 現在日時（Unix timestamp）
+        retention_days: 保持日数
+
+    Returns:
+        int | None: これより前に投稿されたツイートをアーカイブする（無期限の場合は None）
+    """
+    if retention_days <= 0:
+        return None
+    return now - retention_days * 24 * 60 * 60
+
+
+def archive_object_key(
+    target_account_id: int, first_posted_at: int, last_posted_at: int
+) -> str:
+    """
+    アーカイブファイルのオブジェクトキーを生成する
+
+    Args:
+        target_account_id: ターゲットアカウント ID
+        first_posted_at: 含まれるツイートの最も古い投稿日時
+        last_posted_at: 含まれるツイートの最も新しい投稿日時
+
+    Returns:
+        str: アーカイブ用バケット内のオブジェクトキー
+    """
+    return (
+        f'tweets/{target_account_id}/'
+        f'{first_posted_at}-{last_posted_at}-{uuid.uuid4().hex[:8]}.ndjson.gz'
+    )
+
+
+def build_archive_document(
+    tweets: list[dict[str, Any]], media: list[dict[str, Any]]
+) -> bytes:
+    """
+    ツイートとメディアのメタデータを gzip 圧縮した NDJSON にまとめる
+
+    Args:
+        tweets: ツイートの列の辞書（投稿日時の古い順）
+        media: ツイートに添付されたメディアの列の辞書（tweet_id でツイートに対応付ける）
+
+    Returns:
+        bytes: 1 行 1 ツイート（media キーにメディアの一覧を持つ）の NDJSON を gzip 圧縮したもの
+    """
+    media_by_tweet: dict[int, list[dict[str, Any]]] = defaultdict(list)
+    for item in media:
+        media_by_tweet[item['tweet_id']].append(item)
+
+    lines = [
+        json.dumps(
+            {**tweet, 'media': media_by_tweet.get(tweet['id'], [])},
+            ensure_ascii=False,
+            separators=(',', ':'),
+        )
+        + '\n'
+        for tweet in tweets
+    ]
+    # 同じ内容から同じファイルになるよう、gzip ヘッダーの更新日時は固定する
+    return gzip.compress(''.join(lines).encode(), mtime=0)
+
+
+def read_archive_document(data: bytes) -> list[dict[str, Any]]:
+    """
+    build_archive_document で作成したアーカイブファイルを読み込む
+
+    Args:
+        data: gzip 圧縮された NDJSON
+
+    Returns:
+        list[dict[str, Any]]: ツイートの辞書（media キーにメディアの一覧を持つ）
+    """
+    return [
+        json.loads(line) for line in gzip.decompress(data).decode().splitlines() if line
+    ]
+
+
+def _expired_tweets_query(
+    target_account_id: int, cutoff: int, keep_bookmarked: bool
+) -> QuerySet:
+    """保持期間を過ぎたアーカイブ対象のツイートのクエリセットを生成する"""
+    query = Tweet.filter(
+        target_account_id=target_account_id, posted_at__lt=cutoff
+    ).filter(
+        RawQ(
+            f'NOT EXISTS (SELECT 1 FROM "{TABLE_TWEETS}" "q" '
+            f'WHERE "q"."quoted_tweet_ref_id" = "{TABLE_TWEETS}"."id")'
+        )
+    )
+    if keep_bookmarked:
+        query = query.filter(
+            RawQ(
+                f'NOT EXISTS (SELECT 1 FROM "{TABLE_BOOKMARKED_TWEETS}" "b" '
+                f'WHERE "b"."tweet_id" = "{TABLE_TWEETS}"."id")'
+            )
+        )
+    return query
+
+
+async def _archive_batch(
+    target_account_id: int, cutoff: int, keep_bookmarked: bool
+) -> int:
+    """
+    ターゲットアカウントの保持期間を過ぎたツイートを 1 バッチ分アーカイブして削除する
+
+    対象の選択から削除までを 1 トランザクションで行い、対象のツイートを行ロックしてから
+    アップロードするため、選択後に変わった条件で削除することはない。
+    DB への反映に失敗した場合はアップロードしたファイルを削除する。
+
+    Returns:
+        int: アーカイブしたツイート数（対象がない・アップロードに失敗した場合は 0）
+    """
+    object_key = None
+    try:
+        async with in_transaction():
+            locked_tweets = (
+                await _expired_tweets_query(target_account_id, cutoff, keep_bookmarked)
+                .order_by('posted_at', 'id')
+                .limit(TWEET_ARCHIVE_BATCH_SIZE)
+                .select_for_update()
+                .only('id')
+            )
+            if not locked_tweets:
+                return 0
+
+            tweet_ids = [tweet.id for tweet in locked_tweets]
+            tweets = (
+                await Tweet.filter(id__in=tweet_ids)
+                .order_by('posted_at', 'id')
+                .values(
+                    *(
+                        name
+                        for name in Tweet._meta.fields_db_projection
+                        if name not in EXCLUDED_TWEET_FIELDS
+                    )
+                )
+            )
+            media = (
+                await Media.filter(tweet_id__in=tweet_ids)
+                .order_by('id')
+                .values(*Media._meta.fields_db_projection)
+            )
+            document = build_archive_document(tweets, media)
+            first_posted_at = tweets[0]['posted_at']
+            last_posted_at = tweets[-1]['posted_at']
+            key = archive_object_key(target_account_id, first_posted_at, last_posted_at)
+
+            # アップロードに失敗した場合は削除しない（次回のジョブで再試行する）
+            if not await upload_archive_file(key, document):
+                logger.error(f'Failed to upload tweet archive {key}, skipping deletion')
+                return 0
+            object_key = key
+
+            # 既読・ブックマークの行を削除するユーザーを、削除前に同じトランザクション内で集める
+            read_user_ids = (
+                await ReadTweet.filter(tweet_id__in=tweet_ids)
+                .distinct()
+                .values_list('user_id', flat=True)
+            )
+            bookmarked_user_ids = (
+                []
+                if keep_bookmarked
+                else await BookmarkedTweet.filter(tweet_id__in=tweet_ids)
+                .distinct()
+                .values_list('user_id', flat=True)
+            )
+            await TweetArchive.create(
+                target_account_id=target_account_id,
+                object_key=object_key,
+                first_posted_at=first_posted_at,
+                last_posted_at=last_posted_at,
+                tweet_count=len(tweets),
+                byte_size=len(document),
+            )
+            await delete_tweet_dependents(tweet_ids)
+            # posted_at の条件で削除対象のパーティションを絞り込む
+            await Tweet.filter(id__in=tweet_ids, posted_at__lt=cutoff).delete()
+    except Exception:
+        # どの tweet_archives の行からも参照されないファイルを残さない
+        if object_key is not None:
+            await delete_archive_file(object_key)
+        raise
+
+    stored_count = sum(1 for tweet in tweets if not tweet['is_quoted'])
+    if stored_count:
+        await increment_stored_tweets_count(target_account_id, -stored_count)
+    # 既読・ブックマークを削除したユーザーのキャッシュから取り除き、ETag を無効化する
+    for user_id in read_user_ids:
+        tweet_state_cache.unmark(user_id, 'read', tweet_ids)
+    for user_id in bookmarked_user_ids:
+        tweet_state_cache.unmark(user_id, 'bookmarked', tweet_ids)
+    for user_id in set(read_user_ids) | set(bookmarked_user_ids):
+        await bump_tweet_state_version(user_id)
+
+    return len(tweets)
+
+
+async def archive_expired_tweets() -> int:
+    """
+    保持期間を過ぎたツイートをアーカイブして DB から削除する（定期ジョブから実行）
+
+    Returns:
+        int: アーカイブしたツイート数
+    """
+    cutoff = retention_cutoff(int(time.time()), TWEET_RETENTION_DAYS)
+    if cutoff is None:
+        logger.debug('Tweet retention is disabled, skipping archival')
+        return 0
+
+    target_account_ids = (
+        await TargetAccount.all().order_by('id').values_list('id', flat=True)
+    )
+    archived_count = 0
+    for target_account_id in target_account_ids:
+        try:
+            while True:
+                batch_count = await _archive_batch(
+                    target_account_id, cutoff, TWEET_RETENTION_KEEP_BOOKMARKED
+                )
+                archived_count += batch_count
+                if batch_count < TWEET_ARCHIVE_BATCH_SIZE:
+                    break
+        except Exception as ex:
+            logger.error(
+                f'Failed to archive tweets for account {target_account_id}: {ex!s}'
+            )
+
+    if archived_count:
+        logger.info(f'Archived {archived_count} expired tweets')
+    return archived_count
+
+
+async def load_archived_tweets(archive: TweetArchive) -> list[dict[str, Any]] | None:
+    """
+    アーカイブファイルからツイートを読み戻す
+
+    Args:
+        archive: 読み込むアーカイブ
+
+    Returns:
+        list[dict[str, Any]] | None: ツイートの辞書（ファイルを取得できない場合は None）
+    """
+    data = await download_archive_file(archive.object_key)
+    if data is None:
+        return None
+    return read_archive_document(data)
+
+
+async def get_archive_object_keys(target_account_ids: list[int]) -> list[str]:
+    """
+    ターゲットアカウントのアーカイブファイルのオブジェクトキーを取得する
+
+    tweet_archives の行はターゲットアカウントの削除時に連鎖削除されるため、
+    ターゲットアカウント（またはそれを所有するユーザー）を削除する前に取得しておき、
+    削除後に delete_archive_objects でファイルを削除する。
+
+    Args:
+        target_account_ids: 削除するターゲットアカウントの ID
+
+    Returns:
+        list[str]: アーカイブ用バケット内のオブジェクトキー
+    """
+    if not target_account_ids:
+        return []
+
+    return list(
+        await TweetArchive.filter(target_account_id__in=target_account_ids).values_list(
+            'object_key', flat=True
+        )
+    )
+
+
+async def delete_archive_objects(object_keys: list[str]) -> None:
+    """
+    アーカイブファイルを削除する
+
+    Args:
+        object_keys: get_archive_object_keys で取得したオブジェクトキー
+    """
+    for object_key in object_keys:
+        await delete_archive_file(object_key)
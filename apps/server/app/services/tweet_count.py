@@ -0,0 +1,78 @@
+"""
+ツイート一覧 API の総件数算出サービス
+
+ページ取得のたびに COUNT(*) で全件を数えるとツイートの蓄積に比例して遅くなるため、
+取り込み時に TargetAccount.stored_tweets_count を加算しておき、
+一覧 API ではその合計を推定値として返す
+"""
+
+from typing import Literal
+
+from tortoise.expressions import F
+from tortoise.queryset import QuerySet
+
+from app.models.target_account import TargetAccount
+
+# 一覧 API の include_total パラメータで指定できる値
+# false: 総数を返さない / estimate: カウンターの合計を返す / exact: COUNT(*) で数える
+TotalMode = Literal['false', 'estimate', 'exact']
+
+
+async def increment_stored_tweets_count(
+    target_account_id: int, amount: int = 1
+) -> None:
+    """
+    ターゲットアカウントの保存済みツイート数を加算する（取り込み時に呼び出す）
+
+    Args:
+        target_account_id: ツイートを保存したターゲットアカウントの ID
+        amount: 加算する件数（削除時は負の値）
+    """
+    await TargetAccount.filter(id=target_account_id).update(
+        stored_tweets_count=F('stored_tweets_count') + amount
+    )
+
+
+async def estimate_tweet_total(target_account_ids: list[int]) -> int:
+    """
+    ターゲットアカウント群の保存済みツイート数の合計を返す
+
+    Args:
+        target_account_ids: 集計対象のターゲットアカウント ID 一覧
+
+    Returns:
+        int: 引用元ツイートを除いた保存済みツイート数の合計
+    """
+    if not target_account_ids:
+        return 0
+
+    counts = await TargetAccount.filter(id__in=target_account_ids).values_list(
+        'stored_tweets_count', flat=True
+    )
+    return sum(counts)
+
+
+async def resolve_tweet_total(
+    mode: TotalMode,
+    query: QuerySet,
+    target_account_ids: list[int] | None,
+) -> int | None:
+    """
+    include_total の指定に応じて一覧 API の総件数を算出する
+
+    target_account_ids が None の場合（ブックマーク一覧など、アカウント単位の
+    カウンターで表せない一覧）は estimate でも COUNT(*) で数える。
+
+    Args:
+        mode: include_total の指定値
+        query: 一覧取得に使うフィルタ済みのクエリセット（exact 時に使用）
+        target_account_ids: 一覧の対象となるターゲットアカウント ID 一覧
+
+    Returns:
+        int | None: 総件数（false の場合は None）
+    """
+    if mode == 'false':
+        return None
+    if mode == 'estimate' and target_account_ids is not None:
+        return await estimate_tweet_total(target_account_ids)
+    return await query.count()
@@ -0,0 +1,262 @@
+"""
+tweets テーブルの月別レンジパーティションの管理と、ツイート削除時の参照行の削除
+
+tweets は posted_at（Unix timestamp）の UTC での月単位でパーティション化し（tweets_pYYYYMM）、
+どの月のパーティションにも入らないツイート（古い引用元ツイートなど）は既定パーティション
+（tweets_pdefault）に入れる。定期ジョブで当月から TWEET_PARTITION_MONTHS_AHEAD か月先までの
+パーティションを作成しておき、新しいツイートが既定パーティションに入らないようにする。
+作成時に既定パーティションへ入ってしまったその月のツイートは、作成したパーティションへ移す。
+
+一覧 API の期間（sort=top）やカーソルによる posted_at の範囲条件でパーティションが刈り込まれる。
+ツイートを参照する外部キー制約は張らないため、古いパーティションは参照元の検証なしに
+ALTER TABLE ... DETACH PARTITION で即座に切り離せる。
+"""
+
+import logging
+import time
+from datetime import UTC, date, datetime
+
+from tortoise import connections
+from tortoise.transactions import in_transaction
+
+from app.constants import (
+    TABLE_BOOKMARKED_TWEETS,
+    TABLE_MEDIA,
+    TABLE_READ_TWEETS,
+    TABLE_TIMELINE_ENTRIES,
+    TABLE_TWEET_HASHTAGS,
+    TABLE_TWEETS,
+    TWEET_PARTITION_MONTHS_AHEAD,
+)
+
+logger = logging.getLogger(__name__)
+
+# どの月のパーティションにも入らないツイートを入れる既定パーティション
+TWEET_DEFAULT_PARTITION_NAME = f'{TABLE_TWEETS}_pdefault'
+
+
+def tweet_partition_month(timestamp: int) -> date:
+    """
+    Unix timestamp が属するパーティションの月（UTC での月初の日付）を返す
+
+    Args:
+        timestamp: Unix timestamp（ツイートの投稿日時など）
+
+    Returns:
+        date: 月初の日付
+    """
+    return datetime.fromtimestamp(timestamp, UTC).date().replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """
+    月初の日付に月数を加算する
+
+    Args:
+        month: 月初の日付
+        months: 加算する月数
+
+    Returns:
+        date: 加算後の月初の日付
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def tweet_partition_name(month: date) -> str:
+    """
+    月のパーティションのテーブル名を返す
+
+    Args:
+        month: 月初の日付
+
+    Returns:
+        str: テーブル名（tweets_pYYYYMM）
+    """
+    return f'{TABLE_TWEETS}_p{month:%Y%m}'
+
+
+def tweet_partition_bounds(month: date) -> tuple[int, int]:
+    """
+    月のパーティションに入る posted_at の範囲を返す
+
+    マイグレーションで作成するパーティションと範囲を揃えるため、UTC の月初で区切る。
+
+    Args:
+        month: 月初の日付
+
+    Returns:
+        tuple[int, int]: (範囲の開始（含む）, 範囲の終了（含まない）) の Unix timestamp
+    """
+    start = datetime(month.year, month.month, 1, tzinfo=UTC)
+    next_month = add_months(month, 1)
+    end = datetime(next_month.year, next_month.month, 1, tzinfo=UTC)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+async def _create_tweet_partition(
+    name: str, start: int, end: int, has_default_partition: bool
+) -> None:
+    """
+    月のパーティションを作成する
+
+    既定パーティションに同じ範囲のツイートがあるとパーティションを作成できないため、
+    その場合は既定パーティションを一時的に切り離し、作成したパーティションへ移してから戻す。
+
+    Args:
+        name: パーティションのテーブル名
+        start: 範囲の開始（含む）の Unix timestamp
+        end: 範囲の終了（含まない）の Unix timestamp
+        has_default_partition: 既定パーティションがあるかどうか
+    """
+    partition_sql = (
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{TABLE_TWEETS}" '
+        f'FOR VALUES FROM ({start}) TO ({end})'
+    )
+    async with in_transaction() as connection:
+        if not has_default_partition:
+            await connection.execute_script(partition_sql)
+            return
+
+        rows = await connection.execute_query_dict(
+            f'SELECT count(*) AS "count" FROM "{TWEET_DEFAULT_PARTITION_NAME}" '
+            f'WHERE "posted_at" >= $1 AND "posted_at" < $2',
+            [start, end],
+        )
+        if not rows[0]['count']:
+            await connection.execute_script(partition_sql)
+            return
+
+        logger.warning(
+            f'Moving {rows[0]["count"]} tweets from {TWEET_DEFAULT_PARTITION_NAME} '
+            f'into new partition {name}'
+        )
+        range_sql = f'"posted_at" >= {start} AND "posted_at" < {end}'
+        await connection.execute_script(
+            f"""
+            ALTER TABLE "{TABLE_TWEETS}" DETACH PARTITION "{TWEET_DEFAULT_PARTITION_NAME}";
+            {partition_sql};
+            INSERT INTO "{TABLE_TWEETS}"
+                SELECT * FROM "{TWEET_DEFAULT_PARTITION_NAME}" WHERE {range_sql};
+            DELETE FROM "{TWEET_DEFAULT_PARTITION_NAME}" WHERE {range_sql};
+            ALTER TABLE "{TABLE_TWEETS}"
+                ATTACH PARTITION "{TWEET_DEFAULT_PARTITION_NAME}" DEFAULT;
+            """
+        )
+
+
+async def ensure_tweet_partitions() -> int:
+    """
+    当月から TWEET_PARTITION_MONTHS_AHEAD か月先までのパーティションを作成する（定期ジョブから実行）
+
+    tweets がパーティション化されていない場合（マイグレーション適用前）は何もしない。
+
+    Returns:
+        int: 新しく作成したパーティションの数
+    """
+    connection = connections.get('default')
+    rows = await connection.execute_query_dict(
+        """
+        SELECT "c"."relname" FROM "pg_inherits" "i"
+        JOIN "pg_class" "c" ON "c"."oid" = "i"."inhrelid"
+        WHERE "i"."inhparent" = to_regclass($1)
+        AND EXISTS (
+            SELECT 1 FROM "pg_partitioned_table" WHERE "partrelid" = to_regclass($1)
+        )
+        """,
+        [TABLE_TWEETS],
+    )
+    if not rows:
+        logger.debug(f'Table {TABLE_TWEETS} is not partitioned, skipping')
+        return 0
+
+    existing_names = {row['relname'] for row in rows}
+    current_month = tweet_partition_month(int(time.time()))
+    created_count = 0
+    for offset in range(TWEET_PARTITION_MONTHS_AHEAD + 1):
+        month = add_months(current_month, offset)
+        name = tweet_partition_name(month)
+        if name in existing_names:
+            continue
+
+        start, end = tweet_partition_bounds(month)
+        try:
+            await _create_tweet_partition(
+                name,
+                start,
+                end,
+                has_default_partition=TWEET_DEFAULT_PARTITION_NAME in existing_names,
+            )
+        except Exception as ex:
+            logger.error(f'Failed to create tweet partition {name}: {ex!s}')
+            continue
+        created_count += 1
+
+    if created_count:
+        logger.info(f'Created {created_count} tweet partitions')
+    return created_count
+
+
+def _delete_tweet_dependents_sql(tweet_ids_condition: str) -> str:
+    """
+    ツイートを参照する行を削除し、引用元としての参照を解除する 1 文の SQL を生成する
+
+    Args:
+        tweet_ids_condition: 対象のツイート ID の列に続ける条件（= ANY(...) / IN (...)）
+    """
+    return f"""
+        WITH "media" AS (
+            DELETE FROM "{TABLE_MEDIA}" WHERE "tweet_id" {tweet_ids_condition}
+        ), "bookmarks" AS (
+            DELETE FROM "{TABLE_BOOKMARKED_TWEETS}" WHERE "tweet_id" {tweet_ids_condition}
+        ), "reads" AS (
+            DELETE FROM "{TABLE_READ_TWEETS}" WHERE "tweet_id" {tweet_ids_condition}
+        ), "entries" AS (
+            DELETE FROM "{TABLE_TIMELINE_ENTRIES}" WHERE "tweet_id" {tweet_ids_condition}
+        ), "hashtags" AS (
+            DELETE FROM "{TABLE_TWEET_HASHTAGS}" WHERE "tweet_id" {tweet_ids_condition}
+        )
+        UPDATE "{TABLE_TWEETS}" SET "quoted_tweet_ref_id" = NULL
+        WHERE "quoted_tweet_ref_id" {tweet_ids_condition}
+        """
+
+
+async def delete_tweet_dependents(tweet_ids: list[int]) -> None:
+    """
+    ツイートを参照する行を削除し、引用元としての参照を解除する
+
+    外部キー制約による ON DELETE CASCADE / SET NULL の代わりに、
+    ツイートを削除する前に（削除と同じトランザクション内で）呼び出す。
+
+    Args:
+        tweet_ids: 削除するツイートの ID
+    """
+    if not tweet_ids:
+        return
+
+    await connections.get('default').execute_query(
+        _delete_tweet_dependents_sql('= ANY($1::bigint[])'), [tweet_ids]
+    )
+
+
+async def delete_target_account_tweet_dependents(target_account_ids: list[int]) -> None:
+    """
+    ターゲットアカウントのツイートを参照する行を削除し、引用元としての参照を解除する
+
+    ターゲットアカウント（またはそれを所有するユーザー）を削除する前に、
+    削除と同じトランザクション内で呼び出す。対象のツイートは呼び出し時点の一覧ではなく
+    target_account_id のサブクエリで選ぶため、一覧の取得後に取り込まれたツイートも含まれる。
+
+    Args:
+        target_account_ids: 削除するターゲットアカウントの ID
+    """
+    if not target_account_ids:
+        return
+
+    await connections.get('default').execute_query(
+        _delete_tweet_dependents_sql(
+            f'IN (SELECT "id" FROM "{TABLE_TWEETS}" '
+            f'WHERE "target_account_id" = ANY($1::bigint[]))'
+        ),
+        [target_account_ids],
+    )
@@ -0,0 +1,144 @@
+"""
+新着ツイート通知のプロセス内 Pub/Sub
+
+fetch_user_tweets() が新しく保存したツイートをターゲットアカウント単位で配信し、
+タイムラインのストリーミング API（SSE）の購読者へ届ける。
+購読者ごとのキューは上限付きで、消費が追いつかない購読者へは個別の通知を破棄した上で
+再同期（REST API での再取得）を促す。
+
+スケジューラーと同じイベントループ上で動作するプロセス内の仕組みのため、
+複数ワーカーで起動する場合は、取り込みを行ったワーカーに接続している購読者にのみ配信される。
+"""
+
+import asyncio
+import logging
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from app.constants import TWEET_STREAM_QUEUE_SIZE
+from app.models.tweet import Tweet
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TweetNotification:
+    """1 回の取り込みで保存された新着ツイートの通知"""
+
+    target_account_id: int  # ツイートを取り込んだターゲットアカウントの ID
+    tweets: list[Tweet]  # 新しく保存されたツイート（target_account 設定済み）
+
+
+class TweetSubscription:
+    """
+    ターゲットアカウント群の新着ツイート通知の購読
+
+    キューが上限に達した場合は溜まっている通知を破棄して overflowed を立て、
+    購読者には個別の通知の代わりに再同期を促す。
+    """
+
+    def __init__(
+        self,
+        target_account_ids: Iterable[int],
+        max_queue_size: int = TWEET_STREAM_QUEUE_SIZE,
+    ):
+        self.target_account_ids = frozenset(target_account_ids)
+        self.overflowed = False
+        self._queue: asyncio.Queue[TweetNotification] = asyncio.Queue(
+            maxsize=max_queue_size
+        )
+
+    def deliver(self, notification: TweetNotification) -> None:
+        """通知をキューに追加する（満杯の場合は破棄して overflowed を立てる）"""
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(notification)
+        except asyncio.QueueFull:
+            # 消費が追いつかない購読者の通知は破棄し、メモリ使用量を抑える
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self.overflowed = True
+
+    async def get(self, timeout: float) -> TweetNotification | None:
+        """
+        次の通知を待つ
+
+        Args:
+            timeout: 待機する最大秒数
+
+        Returns:
+            TweetNotification | None: 通知（タイムアウトした場合は None）
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+    def reset_overflow(self) -> None:
+        """再同期を通知した後に、通常の配信を再開する"""
+        self.overflowed = False
+
+
+class TweetPubSub:
+    """ターゲットアカウント単位の新着ツイート通知を購読者へ配信する"""
+
+    def __init__(self):
+        self._subscriptions: dict[int, set[TweetSubscription]] = {}
+
+    @contextmanager
+    def subscribe(
+        self, target_account_ids: Iterable[int]
+    ) -> Iterator[TweetSubscription]:
+        """
+        ターゲットアカウント群の新着ツイート通知を購読する
+
+        with ブロックを抜けると購読は自動的に解除される。
+
+        Args:
+            target_account_ids: 購読するターゲットアカウントの ID
+
+        Yields:
+            TweetSubscription: 通知を受け取る購読
+        """
+        subscription = TweetSubscription(target_account_ids)
+        for target_account_id in subscription.target_account_ids:
+            self._subscriptions.setdefault(target_account_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            for target_account_id in subscription.target_account_ids:
+                subscriptions = self._subscriptions.get(target_account_id)
+                if subscriptions is None:
+                    continue
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[target_account_id]
+
+    def publish(self, target_account_id: int, tweets: list[Tweet]) -> None:
+        """
+        新しく保存したツイートを購読者へ配信する
+
+        Args:
+            target_account_id: ツイートを取り込んだターゲットアカウントの ID
+            tweets: 新しく保存したツイート（引用元ツイートは含めない）
+        """
+        subscriptions = self._subscriptions.get(target_account_id)
+        if not tweets or not subscriptions:
+            return
+
+        notification = TweetNotification(
+            target_account_id=target_account_id, tweets=tweets
+        )
+        for subscription in subscriptions:
+            subscription.deliver(notification)
+
+        logger.debug(
+            f'Published {len(tweets)} new tweets of account {target_account_id} '
+            f'to {len(subscriptions)} subscribers'
+        )
+
+
+# グローバルな Pub/Sub インスタンス
+tweet_pubsub = TweetPubSub()
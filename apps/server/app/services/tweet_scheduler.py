@@ -5,9 +5,20 @@ from datetime import datetime, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
-from app.constants import SCHEDULER_INITIAL_DELAY_MAX_MINUTES, SCHEDULER_JITTER_SECONDS
+from app.constants import (
+    HASHTAG_COUNT_PRUNE_INTERVAL_HOURS,
+    READ_COMPACTION_INTERVAL_HOURS,
+    SCHEDULER_INITIAL_DELAY_MAX_MINUTES,
+    SCHEDULER_JITTER_SECONDS,
+    TWEET_ARCHIVE_INTERVAL_HOURS,
+    TWEET_PARTITION_CHECK_INTERVAL_HOURS,
+)
 from app.models.target_account import TargetAccount
 from app.models.twitter_account import TwitterAccount
+from app.services.hashtag_trends import prune_hashtag_counts
+from app.services.read_state import compact_read_state
+from app.services.tweet_archive import archive_expired_tweets
+from app.services.tweet_partitions import ensure_tweet_partitions
 from app.utils.twitter_service import TwitterService
 
 logger = logging.getLogger(__name__)
@@ -41,6 +52,43 @@ class TweetScheduler:
             for account in active_accounts:
                 await self._schedule_account_fetch(account)
 
+            # 既読行を既読位置に畳み込むジョブをスケジュール
+            self.scheduler.add_job(
+                func=compact_read_state,
+                trigger=IntervalTrigger(hours=READ_COMPACTION_INTERVAL_HOURS),
+                id='compact_read_state',
+                name='Compact read state into read watermarks',
+                replace_existing=True,
+            )
+
+            # トレンド集計の期間外になったハッシュタグのカウンターを削除するジョブをスケジュール
+            self.scheduler.add_job(
+                func=prune_hashtag_counts,
+                trigger=IntervalTrigger(hours=HASHTAG_COUNT_PRUNE_INTERVAL_HOURS),
+                id='prune_hashtag_counts',
+                name='Prune expired hashtag counters',
+                replace_existing=True,
+            )
+
+            # tweets の先の月のパーティションを作成するジョブをスケジュール（起動時にも実行）
+            self.scheduler.add_job(
+                func=ensure_tweet_partitions,
+                trigger=IntervalTrigger(hours=TWEET_PARTITION_CHECK_INTERVAL_HOURS),
+                id='ensure_tweet_partitions',
+                name='Create upcoming tweet partitions',
+                next_run_time=datetime.now(),
+                replace_existing=True,
+            )
+
+            # 保持期間を過ぎたツイートをアーカイブして削除するジョブをスケジュール
+            self.scheduler.add_job(
+                func=archive_expired_tweets,
+                trigger=IntervalTrigger(hours=TWEET_ARCHIVE_INTERVAL_HOURS),
+                id='archive_expired_tweets',
+                name='Archive expired tweets to cold storage',
+                replace_existing=True,
+            )
+
             # スケジューラーを開始
             self.scheduler.start()
             logger.info(
@@ -0,0 +1,235 @@
+"""
+ユーザー別の既読・ブックマーク済みツイート ID キャッシュ
+
+ツイート一覧の is_read / is_bookmarked 判定のたびに read_tweets / bookmarked_tweets を
+引かずに済むよう、ユーザーごとの ID 集合をソート済み array('q') としてメモリに保持する。
+初回参照時に遅延ロードし、MarkTweetAsReadAPI / ToggleBookmarkAPI などの書き込み時に
+同じ内容を反映（ライトスルー）する。メモリ上限を超えた場合は最も長く参照されていない
+ユーザーのエントリから破棄する（LRU）。
+
+スケジューラーと同様にアプリケーションプロセス内で完結するキャッシュのため、
+複数ワーカーで起動する場合は各ワーカーが独立したキャッシュを持つ点に注意。
+"""
+
+import logging
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Literal
+
+from tortoise.expressions import F
+
+from app.constants import TWEET_STATE_CACHE_MAX_BYTES
+from app.models.bookmarked_tweet import BookmarkedTweet
+from app.models.read_tweet import ReadTweet
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# キャッシュする状態の種類
+TweetStateKind = Literal['read', 'bookmarked']
+
+# DB からユーザーの状態を読み込む関数の型（ユーザー ID, 種類 -> ツイート ID 一覧）
+TweetStateLoader = Callable[[int, TweetStateKind], Awaitable[Iterable[int]]]
+
+
+class TweetIdSet:
+    """ソート済み array('q') で表現したコンパクトなツイート ID 集合"""
+
+    __slots__ = ('_ids',)
+
+    def __init__(self, tweet_ids: Iterable[int] = ()):
+        self._ids = array('q', sorted(set(tweet_ids)))
+
+    def __contains__(self, tweet_id: object) -> bool:
+        if not isinstance(tweet_id, int):
+            return False
+        index = bisect_left(self._ids, tweet_id)
+        return index < len(self._ids) and self._ids[index] == tweet_id
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def nbytes(self) -> int:
+        """集合が占有するおおよそのメモリ量（バイト）"""
+        return len(self._ids) * self._ids.itemsize
+
+    def add_many(self, tweet_ids: Iterable[int]) -> None:
+        """ツイート ID をまとめて追加する"""
+        new_ids = [tweet_id for tweet_id in tweet_ids if tweet_id not in self]
+        if not new_ids:
+            return
+        if len(new_ids) == 1:
+            # 1 件だけならソート済み位置へ挿入
+            index = bisect_left(self._ids, new_ids[0])
+            self._ids.insert(index, new_ids[0])
+        else:
+            self._ids = array('q', sorted(set(self._ids).union(new_ids)))
+
+    def discard_many(self, tweet_ids: Iterable[int]) -> None:
+        """ツイート ID をまとめて削除する（存在しない ID は無視）"""
+        for tweet_id in tweet_ids:
+            index = bisect_left(self._ids, tweet_id)
+            if index < len(self._ids) and self._ids[index] == tweet_id:
+                del self._ids[index]
+
+
+async def _load_tweet_ids(user_id: int, kind: TweetStateKind) -> list[int]:
+    """DB からユーザーの既読・ブックマーク済みツイート ID を読み込む"""
+    if kind == 'read':
+        return await ReadTweet.filter(user_id=user_id).values_list(
+            'tweet_id', flat=True
+        )
+    return await BookmarkedTweet.filter(user_id=user_id).values_list(
+        'tweet_id', flat=True
+    )
+
+
+class TweetStateCache:
+    """
+    ユーザー別の既読・ブックマーク済みツイート ID 集合の LRU キャッシュ
+
+    (ユーザー ID, 種類) ごとに TweetIdSet を保持し、合計メモリ量が max_bytes を
+    超えないよう古いエントリから破棄する。
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = TWEET_STATE_CACHE_MAX_BYTES,
+        loader: TweetStateLoader = _load_tweet_ids,
+    ):
+        self.max_bytes = max_bytes
+        self._loader = loader
+        self._entries: OrderedDict[tuple[int, TweetStateKind], TweetIdSet] = (
+            OrderedDict()
+        )
+        self._total_bytes = 0
+        # 読み込み中に書き込みがあったかを検出するためのキーごとの書き込み回数
+        self._write_counts: dict[tuple[int, TweetStateKind], int] = {}
+
+    async def get(self, user_id: int, kind: TweetStateKind) -> TweetIdSet:
+        """
+        ユーザーの既読・ブックマーク済みツイート ID 集合を取得する
+
+        キャッシュにない場合は DB から読み込んでキャッシュする。
+
+        Args:
+            user_id: EchoBird ユーザー ID
+            kind: 取得する状態の種類
+
+        Returns:
+            TweetIdSet: ツイート ID 集合
+        """
+        key = (user_id, kind)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+
+        write_count = self._write_counts.get(key, 0)
+        entry = TweetIdSet(await self._loader(user_id, kind))
+
+        # 読み込み中に書き込みがあった場合は読み込み結果が古い可能性があるためキャッシュしない
+        if self._write_counts.get(key, 0) == write_count:
+            self._store(key, entry)
+        return entry
+
+    def mark(
+        self, user_id: int, kind: TweetStateKind, tweet_ids: Iterable[int]
+    ) -> None:
+        """
+        DB への書き込み後に、ツイートを既読・ブックマーク済みとしてキャッシュへ反映する
+
+        Args:
+            user_id: EchoBird ユーザー ID
+            kind: 更新する状態の種類
+            tweet_ids: 追加するツイート ID
+        """
+        key = (user_id, kind)
+        self._write_counts[key] = self._write_counts.get(key, 0) + 1
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+
+        previous_bytes = entry.nbytes
+        entry.add_many(tweet_ids)
+        self._total_bytes += entry.nbytes - previous_bytes
+        self._evict()
+
+    def unmark(
+        self, user_id: int, kind: TweetStateKind, tweet_ids: Iterable[int]
+    ) -> None:
+        """
+        DB からの削除後に、ツイートの既読・ブックマーク状態をキャッシュから取り除く
+
+        Args:
+            user_id: EchoBird ユーザー ID
+            kind: 更新する状態の種類
+            tweet_ids: 取り除くツイート ID
+        """
+        key = (user_id, kind)
+        self._write_counts[key] = self._write_counts.get(key, 0) + 1
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+
+        previous_bytes = entry.nbytes
+        entry.discard_many(tweet_ids)
+        self._total_bytes += entry.nbytes - previous_bytes
+
+    def invalidate(self, user_id: int, kind: TweetStateKind) -> None:
+        """
+        ユーザーのキャッシュを破棄し、次回参照時に DB から読み込み直す
+
+        Args:
+            user_id: EchoBird ユーザー ID
+            kind: 破棄する状態の種類
+        """
+        key = (user_id, kind)
+        self._write_counts[key] = self._write_counts.get(key, 0) + 1
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.nbytes
+
+    def _store(self, key: tuple[int, TweetStateKind], entry: TweetIdSet) -> None:
+        """エントリを保存し、上限を超えた分を LRU で破棄する"""
+        if entry.nbytes > self.max_bytes:
+            # 単独で上限を超える集合はキャッシュしない
+            logger.warning(
+                f'Tweet state set for user {key[0]} ({key[1]}) exceeds cache limit, not caching'
+            )
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._total_bytes -= previous.nbytes
+        self._entries[key] = entry
+        self._total_bytes += entry.nbytes
+        self._evict()
+
+    def _evict(self) -> None:
+        """合計メモリ量が上限以下になるまで、最も長く参照されていないエントリを破棄する"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.nbytes
+
+
+# グローバルなキャッシュインスタンス
+tweet_state_cache = TweetStateCache()
+
+
+async def bump_tweet_state_version(user_id: int) -> None:
+    """
+    ユーザーの既読・ブックマーク状態のバージョンを加算する
+
+    一覧・詳細 API の ETag はこのバージョンを含むため、状態を変更した場合は必ず呼び出す。
+    プロセス内キャッシュと異なり DB に保持するため、複数ワーカー間でも一貫する。
+
+    Args:
+        user_id: EchoBird ユーザー ID
+    """
+    await User.filter(id=user_id).update(
+        tweet_state_version=F('tweet_state_version') + 1
+    )
@@ -0,0 +1,84 @@
+"""
+エンゲージメントスコア（sort=top の並び順）の算出
+
+スコアは「重み付きエンゲージメントの常用対数 + 投稿日時 / 減衰秒数」で、
+新しいツイートほど少ないエンゲージメントで上位に来る（時間減衰）。
+投稿日時を基準にした値のため時間の経過で再計算する必要はなく、
+カウンターが変わった時だけ更新すればよい。また対数部分は 0 以上なので、
+「投稿日時 >= since」のツイートは必ず「スコア >= since / 減衰秒数」を満たし、
+期間指定の上位取得をスコアのインデックスの範囲スキャンで行える。
+"""
+
+import math
+import time
+from typing import Literal
+
+from tortoise.queryset import QuerySet
+
+from app.constants import (
+    ENGAGEMENT_SCORE_DECAY_SECONDS,
+    ENGAGEMENT_WEIGHT_LIKES,
+    ENGAGEMENT_WEIGHT_QUOTES,
+    ENGAGEMENT_WEIGHT_REPLIES,
+    ENGAGEMENT_WEIGHT_RETWEETS,
+    ENGAGEMENT_WEIGHT_VIEWS,
+)
+
+# 一覧 API の並び順（latest: 新しい順 / top: エンゲージメントスコア順）
+TweetSort = Literal['latest', 'top']
+
+
+def compute_engagement_score(
+    likes_count: int,
+    retweets_count: int,
+    replies_count: int,
+    quotes_count: int,
+    views_count: int | None,
+    posted_at: int,
+) -> float:
+    """
+    ツイートのカウンターと投稿日時からエンゲージメントスコアを算出する
+
+    Args:
+        likes_count: いいね数
+        retweets_count: リツイート数
+        replies_count: リプライ数
+        quotes_count: 引用数
+        views_count: 表示回数（不明な場合は None）
+        posted_at: 投稿日時（Unix timestamp）
+
+    Returns:
+        float: エンゲージメントスコア
+    """
+    weighted_engagement = (
+        likes_count * ENGAGEMENT_WEIGHT_LIKES
+        + retweets_count * ENGAGEMENT_WEIGHT_RETWEETS
+        + replies_count * ENGAGEMENT_WEIGHT_REPLIES
+        + quotes_count * ENGAGEMENT_WEIGHT_QUOTES
+        + (views_count or 0) * ENGAGEMENT_WEIGHT_VIEWS
+    )
+    return (
+        math.log10(max(weighted_engagement, 1.0))
+        + posted_at / ENGAGEMENT_SCORE_DECAY_SECONDS
+    )
+
+
+def filter_top_window(query: QuerySet, window_hours: int) -> QuerySet:
+    """
+    sort=top 用に、直近 window_hours 時間に投稿されたツイートへ絞り込む
+
+    投稿日時の条件に加えて、同値なスコアの下限条件を付けることで
+    (グループ, engagement_score) のインデックスを範囲スキャンできるようにする。
+
+    Args:
+        query: posted_at と engagement_score を持つモデル（Tweet / TimelineEntry）のクエリセット
+        window_hours: 集計期間（時間）
+
+    Returns:
+        QuerySet: 絞り込み済みのクエリセット
+    """
+    since = int(time.time()) - window_hours * 3600
+    return query.filter(
+        posted_at__gte=since,
+        engagement_score__gte=since / ENGAGEMENT_SCORE_DECAY_SECONDS,
+    )
@@ -0,0 +1,78 @@
+"""
+一覧・詳細 API の ETag（条件付き GET）サポート
+ページ内容を決める値（ツイートの updated_at、既読・ブックマーク状態のバージョンなど）から
+弱い ETag を算出し、If-None-Match が一致する場合はレスポンス生成を省略して 304 を返す
+"""
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+# 条件付き GET 対象のレスポンスに付与する Cache-Control（常に再検証させる）
+ETAG_CACHE_CONTROL = 'private, no-cache'
+
+
+def build_etag(*parts: object) -> str:
+    """
+    レスポンス内容を決める値の組から弱い ETag を生成する
+
+    Args:
+        *parts: repr() で安定した文字列になる値（int, str, tuple, list など）
+
+    Returns:
+        str: W/"<sha1>" 形式の ETag
+    """
+    digest = hashlib.sha1(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    リクエストの If-None-Match が ETag と一致するか判定する（弱い比較）
+
+    Args:
+        request: リクエスト
+        etag: 現在のレスポンスの ETag
+
+    Returns:
+        bool: 一致する場合は True（304 を返してよい）
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+
+    opaque_tag = etag.removeprefix('W/')
+    return any(
+        candidate.strip().removeprefix('W/') == opaque_tag
+        for candidate in if_none_match.split(',')
+    )
+
+
+def not_modified_response(etag: str) -> Response:
+    """
+    304 Not Modified レスポンスを生成する
+
+    Args:
+        etag: 現在のレスポンスの ETag
+
+    Returns:
+        Response: ボディなしの 304 レスポンス
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={'ETag': etag, 'Cache-Control': ETAG_CACHE_CONTROL},
+    )
+
+
+def set_etag_headers(response: Response, etag: str) -> None:
+    """
+    通常レスポンスに ETag と Cache-Control を付与する
+
+    Args:
+        response: FastAPI が注入するレスポンス
+        etag: 現在のレスポンスの ETag
+    """
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = ETAG_CACHE_CONTROL
@@ -0,0 +1,22 @@
+"""
+ツイート系 API の高速 JSON レスポンス
+response_model による再検証と jsonable_encoder を経由せず、
+pydantic-core の JSON エンコーダー（Rust 実装）で直接シリアライズする
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    dict / list などの JSON 互換データを pydantic-core でシリアライズするレスポンス
+
+    渡すデータのキーと値の型は、エンドポイントの response_model（OpenAPI スキーマ）と
+    一致させること。このレスポンスを返した場合、FastAPI による検証は行われない。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
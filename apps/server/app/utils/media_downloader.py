@@ -15,6 +15,7 @@ from app.constants import (
     MEDIA_STATUS_PENDING,
 )
 from app.models.media import Media
+from app.models.tweet import Tweet
 from app.utils.s3_client import media_file_exists, upload_media_file
 
 
@@ -123,6 +124,10 @@ class MediaDownloader:
         media.download_attempts += 1
         await media.save()
 
+        # ダウンロード完了でレスポンスのメディア URL が変わるため、ツイートの ETag も更新させる
+        if status == MEDIA_STATUS_COMPLETED:
+            await Tweet.filter(id=media.tweet_id).update(updated_at=int(time.time()))
+
     async def process_pending_media(self, limit: int = 10) -> int:
         """未処理のメディアを一括処理"""
         # 未処理のメディアを取得
@@ -0,0 +1,288 @@
+"""
+ツイート一覧系 API のキーセット（カーソル）ページネーション
+(ソートキー, id) の組でシークすることで、深いページでも OFFSET のような
+読み飛ばしが発生せず、一定時間でページを取得できる
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any, Generic, Literal, TypeVar
+
+from fastapi import HTTPException, status
+from tortoise.expressions import Q
+from tortoise.models import Model
+from tortoise.queryset import QuerySet
+
+# カーソルの進行方向（next: 古い方向へ、prev: 新しい方向へ）
+CursorDirection = Literal['next', 'prev']
+
+ModelT = TypeVar('ModelT', bound=Model)
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """デコード済みのページカーソル"""
+
+    value: int | float  # ソートキー（posted_at など）の値
+    id: int  # ソートキーが同値の場合のタイブレーカー
+    direction: CursorDirection  # カーソルの進行方向
+
+
+@dataclass
+class KeysetPage(Generic[ModelT]):
+    """キーセットページネーションの取得結果"""
+
+    items: list[ModelT]  # 新しい順に並んだページ内のレコード
+    next_cursor: str | None  # 次（より古い）ページのカーソル
+    prev_cursor: str | None  # 前（より新しい）ページのカーソル
+    has_next: bool  # 次のページが存在するかどうか
+
+
+def encode_cursor(value: int | float, id: int, direction: CursorDirection) -> str:
+    """
+    ソートキーと ID から不透明なカーソル文字列を生成する
+
+    Args:
+        value: ソートキーの値
+        id: タイブレーカーの ID
+        direction: カーソルの進行方向
+
+    Returns:
+        str: URL セーフな Base64 文字列
+    """
+    payload = json.dumps([value, id, direction], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> PageCursor:
+    """
+    カーソル文字列をデコードする
+
+    Args:
+        cursor: encode_cursor() で生成されたカーソル文字列
+
+    Returns:
+        PageCursor: デコード済みのカーソル
+
+    Raises:
+        HTTPException: カーソルの形式が不正な場合
+    """
+    try:
+        # 省略したパディングを補ってからデコード
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, id, direction = json.loads(base64.urlsafe_b64decode(padded))
+        if (
+            not isinstance(value, int | float)
+            or not isinstance(id, int)
+            or direction not in ('next', 'prev')
+        ):
+            raise ValueError(cursor)
+    except (ValueError, TypeError, binascii.Error) as ex:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='カーソルの形式が不正です',
+        ) from ex
+
+    return PageCursor(value=value, id=id, direction=direction)
+
+
+def _get_cursor_key(item: Any, sort_field: str, id_field: str) -> tuple[Any, int]:
+    """レコードからカーソル用の (ソートキー, ID) を取り出す"""
+    return getattr(item, sort_field), getattr(item, id_field)
+
+
+async def paginate_by_cursor(
+    query: QuerySet[ModelT],
+    sort_field: str,
+    page_size: int,
+    cursor: PageCursor | None,
+    id_field: str = 'id',
+) -> KeysetPage[ModelT]:
+    """
+    (sort_field, id_field) の降順でキーセットページネーションを行う
+
+    page_size + 1 件を取得して次ページの有無を判定するため、COUNT は発行しない。
+    prev 方向のカーソルの場合は昇順でシークした結果を反転して返す。
+
+    Args:
+        query: フィルタ済みのクエリセット
+        sort_field: ソートキーのフィールド名（posted_at, bookmarked_at など）
+        page_size: 1 ページあたりの件数
+        cursor: デコード済みのカーソル（None の場合は先頭ページ）
+        id_field: タイブレーカーに使うフィールド名
+
+    Returns:
+        KeysetPage: ページ内のレコードと前後のカーソル
+    """
+    if cursor is not None and cursor.direction == 'prev':
+        # 新しい方向へ戻る場合は昇順でシークし、取得後に反転する
+        query = query.filter(
+            Q(**{f'{sort_field}__gt': cursor.value})
+            | Q(**{sort_field: cursor.value, f'{id_field}__gt': cursor.id})
+        ).order_by(sort_field, id_field)
+        rows = await query.limit(page_size + 1)
+        has_more = len(rows) > page_size
+        items = list(reversed(rows[:page_size]))
+
+        # prev 方向で取得した場合、次（古い方向）のページは必ず存在する
+        prev_cursor = None
+        if items:
+            if has_more:
+                prev_cursor = encode_cursor(
+                    *_get_cursor_key(items[0], sort_field, id_field), 'prev'
+                )
+            next_cursor = encode_cursor(
+                *_get_cursor_key(items[-1], sort_field, id_field), 'next'
+            )
+        else:
+            # より新しいレコードがない場合は、カーソルが指すレコード自身から古い方向へ戻れるようにする
+            # （カーソルより新しいレコードはないため、ID を 1 進めてもそれ以外のレコードは含まれない）
+            next_cursor = encode_cursor(cursor.value, cursor.id + 1, 'next')
+        return KeysetPage(
+            items=items,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+            has_next=True,
+        )
+
+    if cursor is not None:
+        # 古い方向へ進む場合は降順でシーク
+        query = query.filter(
+            Q(**{f'{sort_field}__lt': cursor.value})
+            | Q(**{sort_field: cursor.value, f'{id_field}__lt': cursor.id})
+        )
+    query = query.order_by(f'-{sort_field}', f'-{id_field}')
+    rows = await query.limit(page_size + 1)
+    has_next = len(rows) > page_size
+    items = rows[:page_size]
+
+    next_cursor = None
+    prev_cursor = None
+    if items:
+        if has_next:
+            next_cursor = encode_cursor(
+                *_get_cursor_key(items[-1], sort_field, id_field), 'next'
+            )
+        # カーソル指定で取得した場合のみ、より新しいページが存在し得る
+        if cursor is not None:
+            prev_cursor = encode_cursor(
+                *_get_cursor_key(items[0], sort_field, id_field), 'prev'
+            )
+
+    return KeysetPage(
+        items=items,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        has_next=has_next,
+    )
+
+
+async def paginate_by_page(
+    query: QuerySet[ModelT],
+    sort_field: str,
+    page: int,
+    page_size: int,
+    id_field: str = 'id',
+) -> KeysetPage[ModelT]:
+    """
+    ページ番号（OFFSET）方式でページネーションを行う（従来クライアント向け）
+
+    並び順はキーセット方式と同じ (sort_field, id_field) の降順とし、
+    次ページが存在する場合はカーソル方式へ移行できるよう next_cursor も返す。
+
+    Args:
+        query: フィルタ済みのクエリセット
+        sort_field: ソートキーのフィールド名
+        page: 1 始まりのページ番号
+        page_size: 1 ページあたりの件数
+        id_field: タイブレーカーに使うフィールド名
+
+    Returns:
+        KeysetPage: ページ内のレコードと次ページのカーソル
+    """
+    offset = (page - 1) * page_size
+    rows = (
+        await query.order_by(f'-{sort_field}', f'-{id_field}')
+        .offset(offset)
+        .limit(page_size + 1)
+    )
+    has_next = len(rows) > page_size
+    items = rows[:page_size]
+
+    next_cursor = None
+    if has_next and items:
+        next_cursor = encode_cursor(
+            *_get_cursor_key(items[-1], sort_field, id_field), 'next'
+        )
+
+    return KeysetPage(
+        items=items,
+        next_cursor=next_cursor,
+        prev_cursor=None,
+        has_next=has_next,
+    )
+
+
+async def paginate(
+    query: QuerySet[ModelT],
+    sort_field: str,
+    page: int,
+    page_size: int,
+    cursor: str | None,
+    id_field: str = 'id',
+) -> KeysetPage[ModelT]:
+    """
+    カーソルが指定されていればキーセット方式、なければページ番号方式でページネーションを行う
+
+    Args:
+        query: フィルタ済みのクエリセット
+        sort_field: ソートキーのフィールド名
+        page: 1 始まりのページ番号（カーソル指定時は無視）
+        page_size: 1 ページあたりの件数
+        cursor: クライアントから受け取ったカーソル文字列
+        id_field: タイブレーカーに使うフィールド名
+
+    Returns:
+        KeysetPage: ページ内のレコードと前後のカーソル
+    """
+    if cursor is not None:
+        return await paginate_by_cursor(
+            query, sort_field, page_size, decode_cursor(cursor), id_field
+        )
+    return await paginate_by_page(query, sort_field, page, page_size, id_field)
+
+
+async def iterate_by_cursor(
+    query: QuerySet[ModelT],
+    sort_field: str,
+    chunk_size: int,
+    id_field: str = 'id',
+) -> AsyncIterator[list[ModelT]]:
+    """
+    (sort_field, id_field) の降順で、クエリ結果全体をキーセットで一定件数ずつ取得する
+
+    各チャンクは前のチャンクの末尾からシークして取得するため、
+    結果全体の件数にかかわらず保持するレコードは 1 チャンク分に限られる。
+
+    Args:
+        query: フィルタ済みのクエリセット
+        sort_field: ソートキーのフィールド名
+        chunk_size: 1 回に取得する件数
+        id_field: タイブレーカーに使うフィールド名
+
+    Yields:
+        list[ModelT]: 新しい順に並んだ 1 チャンク分のレコード
+    """
+    cursor = None
+    while True:
+        chunk = await paginate_by_cursor(
+            query, sort_field, chunk_size, cursor, id_field
+        )
+        if chunk.items:
+            yield chunk.items
+        if not chunk.has_next or chunk.next_cursor is None:
+            return
+        cursor = decode_cursor(chunk.next_cursor)
@@ -0,0 +1,35 @@
+"""
+Tortoise ORM のクエリセットに SQL 文字列の WHERE 条件を渡すための Q
+
+annotate() + filter() で相関サブクエリを使うと条件が「NOT EXISTS (...) = $n」の形になり、
+PostgreSQL のプランナーが anti-join に変換できないため、条件の SQL をそのまま出力する。
+"""
+
+from pypika_tortoise import SqlContext
+from pypika_tortoise.terms import Criterion
+from tortoise.expressions import Q, ResolveContext
+from tortoise.query_utils import QueryModifier
+
+
+class RawCriterion(Criterion):
+    """SQL 文字列をそのまま出力する WHERE 条件"""
+
+    def __init__(self, sql: str):
+        super().__init__()
+        self.sql = sql
+
+    def get_sql(self, _ctx: SqlContext) -> str:
+        return self.sql
+
+
+class RawQ(Q):
+    """SQL 文字列の WHERE 条件を QuerySet.filter() に渡すための Q"""
+
+    __slots__ = ('sql',)
+
+    def __init__(self, sql: str):
+        super().__init__()
+        self.sql = sql
+
+    def resolve(self, _resolve_context: ResolveContext) -> QueryModifier:
+        return QueryModifier(where_criterion=RawCriterion(self.sql))
@@ -1,6 +1,6 @@
 """
 MinIO S3互換ストレージクライアント
-ツイートに添付されたメディアファイルの保存・取得を行う
+ツイートに添付されたメディアファイルと、保持期間を過ぎたツイートのアーカイブの保存・取得を行う
 """
 
 import json
@@ -10,7 +10,7 @@ import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
-from app.constants import MEDIA_BUCKET_NAME
+from app.constants import ARCHIVE_BUCKET_NAME, MEDIA_BUCKET_NAME
 
 
 class S3Client:
@@ -21,7 +21,9 @@ class S3Client:
         # サーバー間通信用エンドポイント（コンテナ名使用）
         self.endpoint_url = os.getenv('MINIO_ENDPOINT_URL', 'http://localhost:9000')
         # ブラウザ向けパブリックアクセス用エンドポイント（localhostを使用）
-        self.public_endpoint_url = os.getenv('MINIO_PUBLIC_ENDPOINT_URL', 'http://localhost:9000')
+        self.public_endpoint_url = os.getenv(
+            'MINIO_PUBLIC_ENDPOINT_URL', 'http://localhost:9000'
+        )
         self.access_key = os.getenv('MINIO_ACCESS_KEY', 'minioadmin')
         self.secret_key = os.getenv('MINIO_SECRET_KEY', 'minioadmin123')
         self.region_name = os.getenv('MINIO_REGION', 'us-east-1')
@@ -39,14 +41,19 @@ class S3Client:
             ),
         )
 
-    async def create_bucket_if_not_exists(self, bucket_name: str) -> bool:
-        """バケットが存在しない場合は作成し、パブリック読み込みポリシーを設定する"""
+    async def create_bucket_if_not_exists(
+        self, bucket_name: str, public_read: bool = True
+    ) -> bool:
+        """
+        バケットが存在しない場合は作成し、public_read の場合はパブリック読み込みポリシーを設定する
+        """
         try:
             self.s3_client.head_bucket(Bucket=bucket_name)
             print(f'Bucket {bucket_name} already exists')
 
             # バケットが存在する場合でも、ポリシーを確認・設定
-            await self._set_public_read_policy(bucket_name)
+            if public_read:
+                await self._set_public_read_policy(bucket_name)
             return True
         except ClientError as ex:
             error_code = ex.response['Error']['Code']
@@ -57,7 +64,8 @@ class S3Client:
                     print(f'Created bucket {bucket_name}')
 
                     # パブリック読み込みポリシーを設定
-                    await self._set_public_read_policy(bucket_name)
+                    if public_read:
+                        await self._set_public_read_policy(bucket_name)
                     return True
                 except ClientError as create_ex:
                     print(f'Failed to create bucket {bucket_name}: {create_ex}')
@@ -194,6 +202,13 @@ async def initialize_media_bucket() -> bool:
     return await s3_client.create_bucket_if_not_exists(MEDIA_BUCKET_NAME)
 
 
+async def initialize_archive_bucket() -> bool:
+    """ツイートのアーカイブ保存用バケットを初期化する（パブリック読み込みは許可しない）"""
+    return await s3_client.create_bucket_if_not_exists(
+        ARCHIVE_BUCKET_NAME, public_read=False
+    )
+
+
 async def upload_media_file(
     media_key: str,
     file_data: bytes,
@@ -228,3 +243,20 @@ async def media_file_exists(media_key: str) -> bool:
     """メディアファイルが存在するかチェックする"""
     object_key = f'media/{media_key}'
     return await s3_client.file_exists(MEDIA_BUCKET_NAME, object_key)
+
+
+async def upload_archive_file(object_key: str, file_data: bytes) -> bool:
+    """ツイートのアーカイブファイルをアップロードする"""
+    return await s3_client.upload_file(
+        file_data, ARCHIVE_BUCKET_NAME, object_key, 'application/gzip'
+    )
+
+
+async def download_archive_file(object_key: str) -> bytes | None:
+    """ツイートのアーカイブファイルをダウンロードする"""
+    return await s3_client.download_file(ARCHIVE_BUCKET_NAME, object_key)
+
+
+async def delete_archive_file(object_key: str) -> bool:
+    """ツイートのアーカイブファイルを削除する"""
+    return await s3_client.delete_file(ARCHIVE_BUCKET_NAME, object_key)
@@ -0,0 +1,77 @@
+"""
+複数アカウントをまとめたタイムラインでの、同じ元ツイートの共有（リツイート）の重複排除
+
+ツイートごとに「元ツイートを表すキー」（dedupe_key）を保存時に算出しておく。
+リツイートはリツイート元のツイート ID（取得できない場合は元ツイート作者と本文のハッシュ）、
+それ以外はツイート自身の ID をキーとし、同じキーを持つツイートは同じ元ツイートの共有とみなす。
+一覧では同じキーのツイートのうち最も新しい共有だけを残す条件を SQL の NOT EXISTS で付与するため、
+ページネーション・件数は重複排除後の行に対して行われる。
+"""
+
+import hashlib
+
+from tortoise.queryset import QuerySet
+
+from app.constants import TABLE_TWEETS
+from app.utils.raw_sql import RawQ
+
+
+def compute_dedupe_key(
+    tweet_id: str,
+    retweeted_tweet_id: str | None,
+    is_retweet: bool,
+    original_author_username: str | None,
+    content: str,
+) -> str:
+    """
+    ツイートの元ツイートを表す重複排除キーを算出する
+
+    マイグレーションでの既存データの埋め戻しと結果を揃えるため、
+    本文のハッシュは PostgreSQL の md5(content) と同じ値を使う。
+
+    Args:
+        tweet_id: Twitter 側のツイート ID
+        retweeted_tweet_id: リツイート元のツイート ID
+        is_retweet: リツイートかどうか
+        original_author_username: 元ツイート作者のユーザー名
+        content: ツイート本文（リツイートの場合は元ツイートの本文）
+
+    Returns:
+        str: 重複排除キー
+    """
+    if retweeted_tweet_id:
+        return retweeted_tweet_id
+    if is_retweet and original_author_username:
+        content_hash = hashlib.md5(content.encode(), usedforsecurity=False)
+        return f'@{original_author_username.lower()}:{content_hash.hexdigest()[:20]}'
+    return tweet_id
+
+
+def filter_duplicate_shares(
+    query: QuerySet, target_account_ids: list[int], tweet_id_column: str = 'id'
+) -> QuerySet:
+    """
+    同じ元ツイートをより新しく共有したツイートがあるツイートを除外する
+
+    Args:
+        query: ツイート ID の列を持つモデル（Tweet / TimelineEntry）のクエリセット
+        target_account_ids: 一覧の対象となるターゲットアカウント ID 一覧
+        tweet_id_column: query のテーブルでツイート ID を持つ列名
+
+    Returns:
+        QuerySet: 元ツイートごとに最も新しい共有のみに絞り込んだクエリセット
+    """
+    tweet_id_sql = f'"{query.model._meta.db_table}"."{tweet_id_column}"'
+    account_ids_sql = ','.join(
+        str(int(account_id)) for account_id in target_account_ids
+    )
+    return query.filter(
+        RawQ(
+            f'NOT EXISTS (SELECT 1 FROM "{TABLE_TWEETS}" "o" '
+            f'JOIN "{TABLE_TWEETS}" "s" ON "s"."dedupe_key" = "o"."dedupe_key" '
+            f'AND ("s"."posted_at", "s"."id") > ("o"."posted_at", "o"."id") '
+            f'WHERE "o"."id" = {tweet_id_sql} '
+            f'AND "s"."target_account_id" = ANY(ARRAY[{account_ids_sql}]::bigint[]) '
+            f'AND NOT "s"."is_quoted")'
+        )
+    )
@@ -0,0 +1,74 @@
+"""
+ツイート全文検索用のテキスト正規化・文字 bigram 抽出
+日本語は空白で単語が区切られないため、形態素解析ではなく文字 bigram で索引を作る。
+ツイート保存時に本文から bigram 配列を生成して GIN インデックスで引き、
+検索語を含むかどうかは正規化済み本文の部分一致で再確認する。
+"""
+
+import unicodedata
+
+
+def normalize_search_text(text: str) -> str:
+    """
+    検索用にテキストを正規化する（全角・半角の統一と小文字化）
+
+    マイグレーションでの既存データの埋め戻しと結果を揃えるため、
+    PostgreSQL の lower(normalize(text, NFKC)) と同じ変換に留める。
+
+    Args:
+        text: 正規化するテキスト
+
+    Returns:
+        str: NFKC 正規化して小文字化したテキスト
+    """
+    return unicodedata.normalize('NFKC', text).lower()
+
+
+def extract_bigrams(text: str) -> list[str]:
+    """
+    正規化済みテキストから、空白を含まない文字 bigram を重複なく抽出する
+
+    Args:
+        text: normalize_search_text() で正規化したテキスト
+
+    Returns:
+        list[str]: ソート済みの bigram 一覧
+    """
+    return sorted(
+        {
+            text[index : index + 2]
+            for index in range(len(text) - 1)
+            if not text[index].isspace() and not text[index + 1].isspace()
+        }
+    )
+
+
+def build_search_document(content: str, full_text: str | None) -> tuple[str, list[str]]:
+    """
+    ツイート本文から検索用の正規化テキストと bigram 配列を生成する
+
+    Args:
+        content: ツイート本文
+        full_text: 省略されていない全文（本文と同じ場合や存在しない場合は None 可）
+
+    Returns:
+        tuple[str, list[str]]: (正規化テキスト, bigram 配列)
+    """
+    text = content
+    if full_text and full_text != content:
+        text = f'{content}\n{full_text}'
+    search_text = normalize_search_text(text)
+    return search_text, extract_bigrams(search_text)
+
+
+def parse_search_query(query: str) -> list[str]:
+    """
+    検索クエリを正規化し、空白区切りの検索語（AND 条件）に分割する
+
+    Args:
+        query: ユーザーが入力した検索クエリ
+
+    Returns:
+        list[str]: 重複を除いた検索語の一覧（入力順）
+    """
+    return list(dict.fromkeys(normalize_search_text(query).split()))
@@ -3,6 +3,7 @@ import logging
 import time
 from typing import Any
 
+from tortoise.transactions import in_transaction
 from twikit import Client
 from twikit.errors import TwitterException
 
@@ -11,10 +12,43 @@ from app.models.target_account import TargetAccount
 from app.models.tweet import Tweet
 from app.models.twitter_account import TwitterAccount
 from app.models.user import User
+from app.services.account_stats import add_daily_activity
+from app.services.hashtag_trends import record_tweet_hashtags
+from app.services.membership_cache import bump_membership_version
+from app.services.timeline_feed import (
+    fan_out_tweet,
+    update_entry_engagement_scores,
+)
+from app.services.tweet_count import increment_stored_tweets_count
+from app.services.tweet_pubsub import tweet_pubsub
 
 logger = logging.getLogger(__name__)
 
 
+def parse_engagement_counters(tweet_data: Any) -> dict[str, int | None]:
+    """
+    twikit のツイートからエンゲージメントのカウンターを取り出す
+
+    twikit は表示回数などを API のレスポンスの文字列のまま返すため、
+    保存済みの値と比較・代入できるよう整数に変換する。
+
+    Args:
+        tweet_data: twikit のツイート
+
+    Returns:
+        dict[str, int | None]: Tweet のカウンターの列名 -> 値（表示回数は不明な場合 None）
+    """
+    view_count = getattr(tweet_data, 'view_count', None)
+    return {
+        'likes_count': int(getattr(tweet_data, 'favorite_count', 0) or 0),
+        'retweets_count': int(getattr(tweet_data, 'retweet_count', 0) or 0),
+        'replies_count': int(getattr(tweet_data, 'reply_count', 0) or 0),
+        'quotes_count': int(getattr(tweet_data, 'quote_count', 0) or 0),
+        'views_count': None if view_count in (None, '') else int(view_count),
+        'bookmark_count': int(getattr(tweet_data, 'bookmark_count', 0) or 0),
+    }
+
+
 class TwitterService:
     """
     Twitter サービス
@@ -101,7 +135,8 @@ class TwitterService:
             current_time = int(time.time())
 
             if existing_target:
-                # 既存のTargetAccountを更新
+                # 既存のTargetAccountを更新（他のユーザーの場合は所有者を移す）
+                previous_user_id = existing_target.user_id
                 existing_target.user = current_user
                 existing_target.username = target_user.screen_name
                 existing_target.display_name = target_user.name
@@ -134,6 +169,10 @@ class TwitterService:
                 await existing_target.save()
                 target_account = existing_target
 
+                # 移す前の所有者の所属キャッシュにアカウントが残らないよう世代を加算
+                if previous_user_id != current_user.id:
+                    await bump_membership_version(previous_user_id)
+
             else:
                 # 新規TargetAccountを作成
                 target_account = await TargetAccount.create(
@@ -211,16 +250,21 @@ class TwitterService:
 
             fetched_count = 0
             latest_tweet_id = None
+            new_tweets: list[Tweet] = []
 
             for tweet_data in tweets:
                 # 既存のツイートをチェック
                 existing_tweet = await Tweet.filter(tweet_id=tweet_data.id).first()
 
                 if existing_tweet:
-                    continue  # 既に保存済み
+                    # 既に保存済みの場合はエンゲージメントのカウンターのみ更新
+                    await self._update_tweet_engagement(existing_tweet, tweet_data)
+                    continue
 
                 # ツイートを保存
-                await self._save_tweet(tweet_data, target_account)
+                tweet = await self._save_tweet(tweet_data, target_account)
+                if tweet is not None:
+                    new_tweets.append(tweet)
                 fetched_count += 1
 
                 if latest_tweet_id is None:
@@ -229,6 +273,9 @@ class TwitterService:
             # 取得成功を記録
             await self._update_fetch_success(target_account, latest_tweet_id)
 
+            # ストリーミング API の購読者へ新着ツイートを通知
+            tweet_pubsub.publish(target_account.id, new_tweets)
+
             logger.info(
                 f'Fetched {fetched_count} tweets for @{target_account.username}'
             )
@@ -246,7 +293,9 @@ class TwitterService:
             await self._record_fetch_error(target_account, error_msg)
             return 0
 
-    async def _save_tweet(self, tweet_data: Any, target_account: TargetAccount) -> None:
+    async def _save_tweet(
+        self, tweet_data: Any, target_account: TargetAccount
+    ) -> Tweet | None:
         """
         ツイートデータをデータベースに保存
         メディア情報も同時に保存し、ダウンロード処理をキューに追加
@@ -254,6 +303,9 @@ class TwitterService:
         Args:
             tweet_data: twikit から取得したツイートデータ
             target_account: 取得元のターゲットアカウント
+
+        Returns:
+            Tweet | None: 保存したツイート（保存に失敗した場合は None）
         """
         try:
             current_time = int(time.time())
@@ -270,6 +322,10 @@ class TwitterService:
             media_source_data = tweet_data  # デフォルトは元のツイートデータ
             # URLs取得用のデータソースを決定
             urls_source_data = tweet_data  # デフォルトは元のツイートデータ
+            # 保存済みの引用元ツイート（引用ツイート・引用ツイートのリツイートの場合）
+            quoted_tweet_ref = None
+            # リツイート元のツイート ID（twikit では retweeted_tweet から取得する）
+            retweeted_tweet_id = getattr(tweet_data, 'retweeted_status_id', None)
 
             if is_retweet:
                 # リツイートの場合、元ツイートの本文を取得
@@ -277,6 +333,7 @@ class TwitterService:
                     tweet_data, 'retweeted_status', None
                 ) or getattr(tweet_data, 'retweeted_tweet', None)
                 if retweeted_tweet:
+                    retweeted_tweet_id = retweeted_tweet_id or retweeted_tweet.id
                     content = retweeted_tweet.text
                     full_text = (
                         getattr(retweeted_tweet, 'full_text', None)
@@ -307,7 +364,9 @@ class TwitterService:
                         # 引用ツイートをリツイートした場合、引用元ツイートも保存
                         quoted_tweet = getattr(retweeted_tweet, 'quote', None)
                         if quoted_tweet:
-                            await self._save_quoted_tweet(quoted_tweet, target_account)
+                            quoted_tweet_ref = await self._save_quoted_tweet(
+                                quoted_tweet, target_account
+                            )
 
                     # リツイートの場合、メディアとURLsは元ツイートから取得
                     media_source_data = retweeted_tweet
@@ -328,7 +387,9 @@ class TwitterService:
                 # 引用元ツイートの情報を取得して保存
                 quoted_tweet = getattr(tweet_data, 'quote', None)
                 if quoted_tweet:
-                    await self._save_quoted_tweet(quoted_tweet, target_account)
+                    quoted_tweet_ref = await self._save_quoted_tweet(
+                        quoted_tweet, target_account
+                    )
                     # 引用元作者の情報を取得
                     quoted_author = getattr(quoted_tweet, 'user', None)
                     if quoted_author:
@@ -384,57 +445,126 @@ class TwitterService:
                 f'Tweet {tweet_data.id}: is_retweet={is_retweet}, is_quote={is_quote}, retweeted_is_quote={retweeted_is_quote}, has_media={has_media}, content_length={len(content)}, full_text_length={len(full_text)}, quoted_tweet_id={quoted_tweet_id}, media_source={"retweeted_tweet" if is_retweet and media_source_data != tweet_data else "original"}'
             )
 
-            # ツイートを保存
-            tweet = await Tweet.create(
-                tweet_id=tweet_data.id,
-                target_account=target_account,
-                content=content,
-                full_text=full_text,
-                lang=tweet_data.lang,
-                likes_count=getattr(tweet_data, 'favorite_count', 0),
-                retweets_count=getattr(tweet_data, 'retweet_count', 0),
-                replies_count=getattr(tweet_data, 'reply_count', 0),
-                quotes_count=getattr(tweet_data, 'quote_count', 0),
-                views_count=getattr(tweet_data, 'view_count', 0),
-                bookmark_count=getattr(tweet_data, 'bookmark_count', 0),
-                is_retweet=is_retweet,
-                is_quote=is_quote,
-                retweeted_tweet_id=getattr(tweet_data, 'retweeted_status_id', None),
-                quoted_tweet_id=quoted_tweet_id,
-                is_reply=hasattr(tweet_data, 'in_reply_to_status_id'),
-                in_reply_to_tweet_id=getattr(tweet_data, 'in_reply_to_status_id', None),
-                in_reply_to_user_id=getattr(tweet_data, 'in_reply_to_user_id', None),
-                conversation_id=getattr(tweet_data, 'conversation_id', None),
-                hashtags=getattr(urls_source_data, 'hashtags', None),
-                urls=getattr(urls_source_data, 'urls', None),
-                user_mentions=getattr(urls_source_data, 'user_mentions', None),
-                is_possibly_sensitive=False,  # TODO delete this column
-                has_media=has_media,
-                # 元ツイート作者情報
-                original_author_username=original_author_username,
-                original_author_display_name=original_author_display_name,
-                original_author_profile_image_url=original_author_profile_image_url,
-                posted_at=self._parse_twitter_date(tweet_data.created_at),
-                created_at=current_time,
-                updated_at=current_time,
-            )
+            # ツイートと、取り込み時に加算する集計・フィード・メディア情報を 1 トランザクションで保存する
+            # （途中で失敗した場合はツイートごと取り消し、次回の取得で保存し直す）
+            async with in_transaction():
+                tweet = await Tweet.create(
+                    tweet_id=tweet_data.id,
+                    target_account=target_account,
+                    content=content,
+                    full_text=full_text,
+                    lang=tweet_data.lang,
+                    **parse_engagement_counters(tweet_data),
+                    is_retweet=is_retweet,
+                    is_quote=is_quote,
+                    retweeted_tweet_id=retweeted_tweet_id,
+                    quoted_tweet_id=quoted_tweet_id,
+                    quoted_tweet_ref=quoted_tweet_ref,
+                    is_reply=hasattr(tweet_data, 'in_reply_to_status_id'),
+                    in_reply_to_tweet_id=getattr(
+                        tweet_data, 'in_reply_to_status_id', None
+                    ),
+                    in_reply_to_user_id=getattr(
+                        tweet_data, 'in_reply_to_user_id', None
+                    ),
+                    conversation_id=getattr(tweet_data, 'conversation_id', None),
+                    hashtags=getattr(urls_source_data, 'hashtags', None),
+                    urls=getattr(urls_source_data, 'urls', None),
+                    user_mentions=getattr(urls_source_data, 'user_mentions', None),
+                    is_possibly_sensitive=False,  # TODO delete this column
+                    has_media=has_media,
+                    # 元ツイート作者情報
+                    original_author_username=original_author_username,
+                    original_author_display_name=original_author_display_name,
+                    original_author_profile_image_url=original_author_profile_image_url,
+                    posted_at=self._parse_twitter_date(tweet_data.created_at),
+                    created_at=current_time,
+                    updated_at=current_time,
+                )
 
-            # メディア情報の保存（適切なデータソースを使用）
-            if has_media:
-                await self._save_tweet_media(media_source_data, tweet)
+                # 一覧 API の総件数推定用カウンターを加算
+                await increment_stored_tweets_count(target_account.id)
+
+                # アカウント統計の日別集計に加算
+                await add_daily_activity(
+                    target_account.id,
+                    tweet.posted_at,
+                    tweet_count=1,
+                    likes=tweet.likes_count,
+                    retweets=tweet.retweets_count,
+                    media_count=int(has_media),
+                )
+
+                # ハッシュタグを展開してトレンド集計用のカウンターに加算
+                await record_tweet_hashtags(tweet)
+
+                # ツイートを含む全カスタムタイムラインのフィードに追加
+                await fan_out_tweet(tweet)
+
+                # メディア情報の保存（適切なデータソースを使用）
+                if has_media:
+                    await self._save_tweet_media(media_source_data, tweet)
+
+            return tweet
 
         except Exception as ex:
             logger.error(f'Failed to save tweet {tweet_data.id}', exc_info=ex)
+            return None
+
+    async def _update_tweet_engagement(self, tweet: Tweet, tweet_data: Any) -> None:
+        """
+        保存済みツイートのエンゲージメントのカウンターを最新の値に更新
+
+        カウンターが変わった場合のみ保存し、エンゲージメントスコアを再計算して
+        タイムラインのフィードとアカウント統計の日別集計にも反映する。
+
+        Args:
+            tweet: 保存済みのツイート
+            tweet_data: 再取得した同じツイートのデータ
+        """
+        counters = parse_engagement_counters(tweet_data)
+        if all(getattr(tweet, name) == value for name, value in counters.items()):
+            return
+
+        try:
+            likes_delta = counters['likes_count'] - tweet.likes_count
+            retweets_delta = counters['retweets_count'] - tweet.retweets_count
+            for name, value in counters.items():
+                setattr(tweet, name, value)
+            # カウンターと日別集計の増減は同じトランザクションで保存する
+            # （集計だけ失敗すると、次回の差分が保存済みの値から計算されて増減が失われるため）
+            async with in_transaction():
+                # save() でエンゲージメントスコアと updated_at が再計算される
+                await tweet.save(
+                    update_fields=[*counters, 'engagement_score', 'updated_at']
+                )
+                await update_entry_engagement_scores(tweet)
+
+                # アカウント統計の日別集計にカウンターの増減を反映（引用元ツイートは集計外）
+                if not tweet.is_quoted and (likes_delta or retweets_delta):
+                    await add_daily_activity(
+                        tweet.target_account_id,
+                        tweet.posted_at,
+                        likes=likes_delta,
+                        retweets=retweets_delta,
+                    )
+        except Exception as ex:
+            logger.error(
+                f'Failed to update engagement of tweet {tweet.tweet_id}', exc_info=ex
+            )
 
     async def _save_quoted_tweet(
         self, quoted_tweet_data: Any, target_account: TargetAccount
-    ) -> None:
+    ) -> Tweet | None:
         """
         引用元ツイートをデータベースに保存
 
         Args:
             quoted_tweet_data: 引用元ツイートのデータ
             target_account: 引用ツイートの取得元アカウント
+
+        Returns:
+            Tweet | None: 保存済みの引用元ツイート（保存に失敗した場合は None）
         """
         try:
             # 既存の引用元ツイートをチェック
@@ -445,7 +575,7 @@ class TwitterService:
                 logger.info(
                     f'Quoted tweet {quoted_tweet_data.id} already exists, skipping'
                 )
-                return
+                return existing_quoted_tweet
 
             current_time = int(time.time())
 
@@ -473,12 +603,7 @@ class TwitterService:
                 full_text=getattr(quoted_tweet_data, 'full_text', None)
                 or quoted_tweet_data.text,
                 lang=quoted_tweet_data.lang,
-                likes_count=getattr(quoted_tweet_data, 'favorite_count', 0),
-                retweets_count=getattr(quoted_tweet_data, 'retweet_count', 0),
-                replies_count=getattr(quoted_tweet_data, 'reply_count', 0),
-                quotes_count=getattr(quoted_tweet_data, 'quote_count', 0),
-                views_count=getattr(quoted_tweet_data, 'view_count', 0),
-                bookmark_count=getattr(quoted_tweet_data, 'bookmark_count', 0),
+                **parse_engagement_counters(quoted_tweet_data),
                 is_retweet=False,  # 引用元ツイート自体はリツイートではない
                 is_quote=False,  # 引用元ツイート自体は引用ツイートではない
                 is_quoted=True,  # 引用元ツイートとして保存
@@ -511,11 +636,13 @@ class TwitterService:
                 await self._save_tweet_media(quoted_tweet_data, quoted_tweet)
 
             logger.info(f'Saved quoted tweet {quoted_tweet_data.id}')
+            return quoted_tweet
 
         except Exception as ex:
             logger.error(
                 f'Failed to save quoted tweet {quoted_tweet_data.id}', exc_info=ex
             )
+            return None
 
     async def _save_tweet_media(self, tweet_data: Any, tweet: Tweet) -> None:
         """
@@ -549,34 +676,37 @@ class TwitterService:
                         )
                         continue
 
-                    # 既存のメディアレコードをチェック
-                    existing_media = await Media.filter(media_key=media_key).first()
-                    if existing_media:
-                        logger.info(f'Media {media_key} already exists, skipping')
-                        continue
-
-                    # メディア情報をデータベースに保存
-                    media = await Media.create(
-                        tweet=tweet,
-                        media_key=media_key,
-                        media_type=media_type,
-                        media_url=media_url,
-                        display_url=getattr(media_item, 'display_url', None),
-                        expanded_url=getattr(media_item, 'expanded_url', None),
-                        width=getattr(media_item, 'width', None),
-                        height=getattr(media_item, 'height', None),
-                        duration_ms=getattr(media_item, 'duration_ms', None),
-                        preview_image_url=getattr(
-                            media_item, 'preview_image_url', None
-                        ),
-                        variants=getattr(media_item, 'variants', None),
-                        alt_text=getattr(media_item, 'alt_text', None),
-                        additional_media_info=getattr(
-                            media_item, 'additional_media_info', None
-                        ),
-                        created_at=current_time,
-                        updated_at=current_time,
-                    )
+                    # ツイートの保存と同じトランザクション内で呼ばれるため、
+                    # 個別のメディアの失敗はセーブポイントまでの取り消しにとどめる
+                    async with in_transaction():
+                        # 既存のメディアレコードをチェック
+                        existing_media = await Media.filter(media_key=media_key).first()
+                        if existing_media:
+                            logger.info(f'Media {media_key} already exists, skipping')
+                            continue
+
+                        # メディア情報をデータベースに保存
+                        media = await Media.create(
+                            tweet=tweet,
+                            media_key=media_key,
+                            media_type=media_type,
+                            media_url=media_url,
+                            display_url=getattr(media_item, 'display_url', None),
+                            expanded_url=getattr(media_item, 'expanded_url', None),
+                            width=getattr(media_item, 'width', None),
+                            height=getattr(media_item, 'height', None),
+                            duration_ms=getattr(media_item, 'duration_ms', None),
+                            preview_image_url=getattr(
+                                media_item, 'preview_image_url', None
+                            ),
+                            variants=getattr(media_item, 'variants', None),
+                            alt_text=getattr(media_item, 'alt_text', None),
+                            additional_media_info=getattr(
+                                media_item, 'additional_media_info', None
+                            ),
+                            created_at=current_time,
+                            updated_at=current_time,
+                        )
 
                     logger.info(f'Saved media {media_key} for tweet {tweet.tweet_id}')
 
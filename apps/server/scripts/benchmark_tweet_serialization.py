@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+ツイート一覧レスポンスのシリアライズ性能ベンチマーク
+
+合成したツイートのページ（既定 100 件）について、以下の 2 つの経路の所要時間を比較する
+- 従来経路: TweetResponse を生成して検証し、FastAPI の response_model 検証と
+  jsonable_encoder を経て JSONResponse でシリアライズする
+- 高速経路: create_tweet_rows() と同じ dict を組み立て、FastJSONResponse で直接シリアライズする
+
+使い方:
+    uv run scripts/benchmark_tweet_serialization.py [--page-size 100] [--repeat 200]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from types import SimpleNamespace
+
+# パスを追加してappをインポート可能にする
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.routers.tweets import (
+    TimelineResponse,
+    TweetFieldset,
+    TweetResponse,
+    _build_tweet_row,
+)
+from app.utils.fast_json import FastJSONResponse
+
+
+def create_synthetic_tweet(index: int) -> SimpleNamespace:
+    """Tweet モデルと同じ属性を持つ合成ツイートを生成する"""
+    target_account = SimpleNamespace(
+        id=index % 5 + 1,
+        username=f'account_{index % 5}',
+        display_name=f'Account {index % 5}',
+        profile_image_url=f'https://pbs.twimg.com/profile_images/{index % 5}.jpg',
+    )
+    return SimpleNamespace(
+        id=index + 1,
+        tweet_id=str(1800000000000000000 + index),
+        content=f'合成ツイート {index} ' + 'あいうえお' * 20,
+        full_text=f'合成ツイート {index} ' + 'あいうえお' * 40,
+        lang='ja',
+        likes_count=index * 3,
+        retweets_count=index,
+        replies_count=index // 2,
+        quotes_count=index // 3,
+        views_count=index * 100,
+        bookmark_count=index // 4,
+        is_retweet=False,
+        is_quote=index % 10 == 0,
+        is_quoted=False,
+        retweeted_tweet_id=None,
+        quoted_tweet_id=str(1700000000000000000 + index) if index % 10 == 0 else None,
+        is_reply=False,
+        in_reply_to_tweet_id=None,
+        in_reply_to_user_id=None,
+        conversation_id=str(1800000000000000000 + index),
+        hashtags=['echo', 'bird'],
+        urls=[{'url': 'https://t.co/x', 'expanded_url': 'https://example.com'}],
+        user_mentions=[{'screen_name': 'someone', 'id_str': '12345'}],
+        is_possibly_sensitive=False,
+        has_media=index % 4 == 0,
+        original_author_username=None,
+        original_author_display_name=None,
+        original_author_profile_image_url=None,
+        posted_at=1718000000 - index * 60,
+        created_at=1718000000,
+        updated_at=1718000000,
+        target_account=target_account,
+    )
+
+
+def create_synthetic_media(index: int) -> list[dict]:
+    """合成ツイートに添付するメディア情報を生成する"""
+    if index % 4 != 0:
+        return []
+    return [
+        {
+            'media_key': f'3_{index}',
+            'media_type': 'photo',
+            'media_url': f'https://pbs.twimg.com/media/{index}.jpg',
+            'width': 1200,
+            'height': 800,
+            'alt_text': None,
+            'duration_ms': None,
+        }
+    ]
+
+
+def build_rows(tweets: list[SimpleNamespace]) -> list[dict]:
+    """create_tweet_rows() と同様に、取得済みデータからツイートの dict を組み立てる"""
+    fieldset = TweetFieldset()
+    return [
+        _build_tweet_row(
+            tweet,
+            media=create_synthetic_media(index),
+            quoted_tweet=None,
+            is_read=index % 2 == 0,
+            is_bookmarked=index % 7 == 0,
+            fieldset=fieldset,
+        )
+        for index, tweet in enumerate(tweets)
+    ]
+
+
+async def serialize_legacy(tweets: list[SimpleNamespace], page_size: int) -> bytes:
+    """従来経路: モデル生成・response_model 検証・jsonable_encoder を経てシリアライズ"""
+    payload = TimelineResponse(
+        tweets=[TweetResponse.model_validate(row) for row in build_rows(tweets)],
+        total=10000,
+        page=1,
+        page_size=page_size,
+        has_next=True,
+        next_cursor='cursor',
+        prev_cursor=None,
+    )
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=payload)
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+async def serialize_fast(tweets: list[SimpleNamespace], page_size: int) -> bytes:
+    """高速経路: dict を組み立てて FastJSONResponse で直接シリアライズ"""
+    return FastJSONResponse(
+        {
+            'tweets': build_rows(tweets),
+            'total': 10000,
+            'page': 1,
+            'page_size': page_size,
+            'has_next': True,
+            'next_cursor': 'cursor',
+            'prev_cursor': None,
+        }
+    ).body
+
+
+# FastAPI がエンドポイントの response_model から生成するフィールドと同等のもの
+RESPONSE_FIELD = create_model_field(name='Response', type_=TimelineResponse)
+
+
+async def measure(
+    serializer: Callable[[list[SimpleNamespace], int], Awaitable[bytes]],
+    tweets: list[SimpleNamespace],
+    page_size: int,
+    repeat: int,
+) -> float:
+    """1 ページあたりの平均所要時間（ミリ秒）を計測する"""
+    await serializer(tweets, page_size)  # ウォームアップ
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        await serializer(tweets, page_size)
+    return (time.perf_counter() - started_at) / repeat * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    tweets = [create_synthetic_tweet(index) for index in range(args.page_size)]
+
+    # 両経路の出力が同じ JSON になることを確認
+    legacy_body = await serialize_legacy(tweets, args.page_size)
+    fast_body = await serialize_fast(tweets, args.page_size)
+    if json.loads(legacy_body) != json.loads(fast_body):
+        print('❌ 従来経路と高速経路の出力が一致しません')
+        sys.exit(1)
+
+    legacy_ms = await measure(serialize_legacy, tweets, args.page_size, args.repeat)
+    fast_ms = await measure(serialize_fast, tweets, args.page_size, args.repeat)
+
+    print(f'ページサイズ: {args.page_size} 件 / 試行回数: {args.repeat} 回')
+    print(f'レスポンスサイズ: {len(fast_body):,} バイト')
+    print(f'従来経路: {legacy_ms:.3f} ms/ページ')
+    print(f'高速経路: {fast_ms:.3f} ms/ページ（{legacy_ms / fast_ms:.1f} 倍）')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
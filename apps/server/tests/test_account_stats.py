@@ -0,0 +1,91 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.account_stats import activity_day, summarize_daily_stats
+from app.utils import twitter_service
+from app.utils.twitter_service import TwitterService
+
+
+def test_activity_day_uses_stats_timezone() -> None:
+    # 2025-06-30 15:00 UTC は日本時間で 2025-07-01 00:00
+    assert activity_day(1751295600) == date(2025, 7, 1)
+    assert activity_day(1751295599) == date(2025, 6, 30)
+
+
+def test_summarize_daily_stats() -> None:
+    rows = [
+        SimpleNamespace(tweet_count=3, likes_sum=30, retweets_sum=6, media_count=1),
+        SimpleNamespace(tweet_count=1, likes_sum=10, retweets_sum=2, media_count=1),
+    ]
+    summary = summarize_daily_stats(rows, days=8)
+    assert summary.tweet_count == 4
+    assert summary.tweets_per_day == 0.5
+    assert summary.average_likes == 10
+    assert summary.average_retweets == 2
+    assert summary.media_ratio == 0.5
+
+
+def test_summarize_without_tweets() -> None:
+    summary = summarize_daily_stats([], days=30)
+    assert summary.tweet_count == 0
+    assert summary.average_likes == 0
+
+
+def test_daily_activity_is_rolled_back_with_the_tweet(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    events: list[str] = []
+
+    @asynccontextmanager
+    async def in_transaction():
+        events.append('begin')
+        try:
+            yield
+        except Exception:
+            events.append('rollback')
+            raise
+        events.append('commit')
+
+    async def create(**kwargs) -> SimpleNamespace:
+        events.append('create')
+        return SimpleNamespace(**kwargs)
+
+    async def increment_stored_tweets_count(_target_account_id: int) -> None:
+        events.append('count')
+
+    async def add_daily_activity(*_args, **_kwargs) -> None:
+        events.append('rollup')
+
+    async def record_tweet_hashtags(_tweet) -> None:
+        raise RuntimeError('hashtag counter update failed')
+
+    monkeypatch.setattr(twitter_service, 'in_transaction', in_transaction)
+    monkeypatch.setattr(twitter_service.Tweet, 'create', create)
+    monkeypatch.setattr(
+        twitter_service, 'increment_stored_tweets_count', increment_stored_tweets_count
+    )
+    monkeypatch.setattr(twitter_service, 'add_daily_activity', add_daily_activity)
+    monkeypatch.setattr(twitter_service, 'record_tweet_hashtags', record_tweet_hashtags)
+
+    tweet_data = SimpleNamespace(
+        id='1',
+        text='hello',
+        lang='ja',
+        favorite_count=5,
+        retweet_count=0,
+        reply_count=0,
+        quote_count=0,
+        view_count=None,
+        bookmark_count=0,
+        is_quote_status=False,
+        created_at='Wed Oct 10 20:19:24 +0000 2018',
+    )
+    service = TwitterService.__new__(TwitterService)
+
+    # 日別集計への加算もツイートの保存と同じトランザクションで取り消される
+    assert asyncio.run(service._save_tweet(tweet_data, SimpleNamespace(id=1))) is None
+    assert events == ['begin', 'create', 'count', 'rollup', 'rollback']
@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.auth import get_current_user
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.mark.parametrize(
+    'body',
+    [
+        {},  # 対象を明示しない
+        {'tweet_ids': []},
+        {'mark_all': True},  # 全アカウントは対象にできない
+        {'up_to_cursor': 'x'},
+        {'timeline_id': 1},  # up_to_cursor か mark_all が必須
+        {'timeline_id': 1, 'up_to_cursor': 'x', 'mark_all': True},
+        {'tweet_ids': [1], 'timeline_id': 1},
+    ],
+)
+def test_bulk_read_rejects_unscoped_requests(client: TestClient, body: dict) -> None:
+    response = client.post('/api/v1/tweets/read', json=body)
+    assert response.status_code == 400
@@ -0,0 +1,107 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.constants import ENGAGEMENT_SCORE_DECAY_SECONDS
+from app.models.tweet import Tweet
+from app.utils import twitter_service
+from app.utils.engagement_score import compute_engagement_score
+from app.utils.twitter_service import TwitterService
+
+
+def test_score_grows_with_engagement() -> None:
+    low = compute_engagement_score(1, 0, 0, 0, None, 1_700_000_000)
+    high = compute_engagement_score(100, 10, 5, 2, 10000, 1_700_000_000)
+    assert high > low
+
+
+def test_score_decays_with_age() -> None:
+    posted_at = 1_700_000_000
+    older = compute_engagement_score(1000, 0, 0, 0, 0, posted_at)
+    newer = compute_engagement_score(
+        100, 0, 0, 0, 0, posted_at + ENGAGEMENT_SCORE_DECAY_SECONDS
+    )
+    # 減衰秒数だけ新しいツイートは、10 倍のエンゲージメントの古いツイートと同スコア
+    assert abs(older - newer) < 1e-9
+
+
+def test_score_lower_bound_is_posted_at_term() -> None:
+    posted_at = 1_700_000_000
+    score = compute_engagement_score(0, 0, 0, 0, None, posted_at)
+    assert score == posted_at / ENGAGEMENT_SCORE_DECAY_SECONDS
+
+
+def test_update_engagement_accepts_string_counters(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    saved_fields: list[list[str]] = []
+    daily_deltas: list[tuple[int, int]] = []
+
+    async def save(self: Tweet, update_fields: list[str]) -> None:
+        # Tweet.save() と同じくスコアを再計算する（DB への保存は行わない）
+        self.engagement_score = compute_engagement_score(
+            self.likes_count,
+            self.retweets_count,
+            self.replies_count,
+            self.quotes_count,
+            self.views_count,
+            self.posted_at,
+        )
+        saved_fields.append(update_fields)
+
+    async def update_entry_engagement_scores(_tweet: Tweet) -> None:
+        pass
+
+    async def add_daily_activity(
+        _target_account_id: int, _posted_at: int, likes: int, retweets: int
+    ) -> None:
+        daily_deltas.append((likes, retweets))
+
+    @asynccontextmanager
+    async def in_transaction():
+        yield
+
+    monkeypatch.setattr(Tweet, 'save', save)
+    monkeypatch.setattr(twitter_service, 'in_transaction', in_transaction)
+    monkeypatch.setattr(
+        twitter_service,
+        'update_entry_engagement_scores',
+        update_entry_engagement_scores,
+    )
+    monkeypatch.setattr(twitter_service, 'add_daily_activity', add_daily_activity)
+
+    tweet = Tweet(
+        tweet_id='1',
+        likes_count=1,
+        retweets_count=0,
+        replies_count=0,
+        quotes_count=0,
+        views_count=100,
+        bookmark_count=0,
+        is_quoted=False,
+        posted_at=1_700_000_000,
+    )
+    tweet.target_account_id = 1
+    # twikit は表示回数を API の文字列のまま返す
+    tweet_data = SimpleNamespace(
+        favorite_count=5,
+        retweet_count=2,
+        reply_count=0,
+        quote_count=0,
+        view_count='1234',
+        bookmark_count=0,
+    )
+    service = TwitterService.__new__(TwitterService)
+
+    asyncio.run(service._update_tweet_engagement(tweet, tweet_data))
+    assert tweet.views_count == 1234
+    assert tweet.engagement_score == compute_engagement_score(
+        5, 2, 0, 0, 1234, 1_700_000_000
+    )
+    assert daily_deltas == [(4, 2)]
+
+    # 同じ値での再取得では保存しない
+    asyncio.run(service._update_tweet_engagement(tweet, tweet_data))
+    assert len(saved_fields) == 1
@@ -0,0 +1,33 @@
+import pytest
+from starlette.requests import Request
+
+from app.utils.etag import build_etag, is_not_modified
+
+
+def _make_request(if_none_match: str | None) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b'if-none-match', if_none_match.encode()))
+    return Request({'type': 'http', 'method': 'GET', 'headers': headers})
+
+
+def test_build_etag_is_stable_and_weak() -> None:
+    etag = build_etag(1, 'page=1', [(10, 100, 100)])
+    assert etag == build_etag(1, 'page=1', [(10, 100, 100)])
+    assert etag != build_etag(1, 'page=1', [(10, 101, 100)])
+    assert etag.startswith('W/"')
+
+
+@pytest.mark.parametrize(
+    ('if_none_match', 'expected'),
+    [
+        (None, False),
+        ('*', True),
+        ('W/"abc"', True),
+        ('"abc"', True),
+        ('"other", W/"abc"', True),
+        ('W/"other"', False),
+    ],
+)
+def test_is_not_modified(if_none_match: str | None, expected: bool) -> None:
+    assert is_not_modified(_make_request(if_none_match), 'W/"abc"') is expected
@@ -0,0 +1,37 @@
+import pytest
+
+from app.constants import HASHTAG_BUCKET_SECONDS, TREND_WINDOW_MAX_HOURS
+from app.services.hashtag_trends import (
+    extract_hashtags,
+    hashtag_bucket,
+    parse_trend_window,
+)
+
+
+def test_extract_hashtags_normalizes_and_dedupes() -> None:
+    hashtags = ['Python', '#python', 'ＰＹＴＨＯＮ', {'text': '日本語'}, '', None]
+    assert extract_hashtags(hashtags) == ['python', '日本語']
+
+
+def test_extract_hashtags_ignores_non_list() -> None:
+    assert extract_hashtags(None) == []
+    assert extract_hashtags({'text': 'python'}) == []
+
+
+def test_hashtag_bucket_truncates_to_bucket_start() -> None:
+    assert (
+        hashtag_bucket(HASHTAG_BUCKET_SECONDS * 10 + 5) == HASHTAG_BUCKET_SECONDS * 10
+    )
+
+
+def test_parse_trend_window() -> None:
+    assert parse_trend_window('24h') == 24 * 3600
+    assert parse_trend_window('7d') == 7 * 86400
+
+
+@pytest.mark.parametrize(
+    'window', ['', '0h', '24', '1w', '-1h', f'{TREND_WINDOW_MAX_HOURS + 1}h']
+)
+def test_parse_trend_window_rejects_invalid(window: str) -> None:
+    with pytest.raises(ValueError):
+        parse_trend_window(window)
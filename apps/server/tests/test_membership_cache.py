@@ -0,0 +1,33 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import membership_cache
+from app.services.membership_cache import UserMembership, get_user_membership
+
+
+def test_membership_is_reloaded_only_when_version_changes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    loaded_user_ids: list[int] = []
+
+    async def load(user_id: int) -> UserMembership:
+        loaded_user_ids.append(user_id)
+        return UserMembership(active_target_account_ids=[user_id], timelines={})
+
+    monkeypatch.setattr(membership_cache, '_load_membership', load)
+    monkeypatch.setattr(membership_cache, '_membership_cache', {})
+
+    async def scenario() -> None:
+        user = SimpleNamespace(id=1, membership_version=0)
+        first = await get_user_membership(user)
+        assert await get_user_membership(user) is first
+
+        # 別ワーカーでの変更も、リクエスト時に読み込んだ世代の違いで検出する
+        user.membership_version = 1
+        assert await get_user_membership(user) is not first
+        await get_user_membership(SimpleNamespace(id=2, membership_version=1))
+
+    asyncio.run(scenario())
+    assert loaded_user_ids == [1, 1, 2]
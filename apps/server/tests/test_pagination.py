@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.pagination import (
+    PageCursor,
+    decode_cursor,
+    encode_cursor,
+    paginate_by_cursor,
+)
+
+
+class _EmptyQuery:
+    """常に 0 件を返すクエリセットの代わり"""
+
+    def filter(self, *_args, **_kwargs) -> '_EmptyQuery':
+        return self
+
+    def order_by(self, *_fields) -> '_EmptyQuery':
+        return self
+
+    async def limit(self, _count: int) -> list:
+        return []
+
+
+def test_cursor_round_trip() -> None:
+    cursor = encode_cursor(1718000000, 42, 'next')
+    decoded = decode_cursor(cursor)
+    assert decoded.value == 1718000000
+    assert decoded.id == 42
+    assert decoded.direction == 'next'
+
+
+def test_cursor_is_url_safe() -> None:
+    cursor = encode_cursor(1718000000, 42, 'prev')
+    assert '=' not in cursor
+    assert '+' not in cursor
+    assert '/' not in cursor
+
+
+@pytest.mark.parametrize(
+    'cursor', ['', 'not-a-cursor', encode_cursor(1, 2, 'next')[:-3]]
+)
+def test_invalid_cursor_is_rejected(cursor: str) -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+def test_empty_prev_page_can_return_forward() -> None:
+    anchor = PageCursor(value=1718000000, id=42, direction='prev')
+    page = asyncio.run(paginate_by_cursor(_EmptyQuery(), 'posted_at', 20, anchor))
+
+    assert page.items == []
+    assert page.has_next
+    assert page.prev_cursor is None
+    # カーソルが指していたレコード自身を含む古い方向のページへ戻る
+    assert page.next_cursor is not None
+    next_cursor = decode_cursor(page.next_cursor)
+    assert next_cursor.direction == 'next'
+    assert (next_cursor.value, next_cursor.id) > (anchor.value, anchor.id)
@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import read_state
+from app.services.read_state import BoundedCache, ReadWatermarks, count_unread_tweets
+
+
+def _tweet(tweet_id: int, target_account_id: int, posted_at: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=tweet_id, target_account_id=target_account_id, posted_at=posted_at
+    )
+
+
+def test_watermark_covers_tweets_at_or_below_position() -> None:
+    watermarks = ReadWatermarks(positions={1: (100, 10)})
+
+    assert watermarks.covers(_tweet(5, 1, 99))
+    assert watermarks.covers(_tweet(10, 1, 100))
+    # 投稿日時が同じ場合は ID で比較する
+    assert not watermarks.covers(_tweet(11, 1, 100))
+    assert not watermarks.covers(_tweet(3, 1, 101))
+
+
+def test_watermark_is_per_target_account() -> None:
+    watermarks = ReadWatermarks(positions={1: (100, 10)})
+
+    assert not watermarks.covers(_tweet(5, 2, 50))
+    assert not ReadWatermarks().covers(_tweet(5, 1, 50))
+
+
+def test_bounded_cache_evicts_least_recently_used() -> None:
+    cache: BoundedCache[int, str] = BoundedCache(max_entries=2)
+    cache.set(1, 'a')
+    cache.set(2, 'b')
+    assert cache.get(1) == 'a'
+
+    cache.set(3, 'c')
+    assert len(cache) == 2
+    assert cache.get(2) is None
+    assert cache.get(1) == 'a'
+    assert cache.get(3) == 'c'
+
+
+def test_unread_counts_are_recounted_only_for_changed_accounts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    states = {1: (10, None, None, 0, 0), 2: (5, None, None, 0, 0)}
+    counted_account_ids: list[list[int]] = []
+
+    async def get_states(_user_id: int, account_ids: list[int]) -> dict[int, tuple]:
+        return {account_id: states[account_id] for account_id in account_ids}
+
+    async def count(_user_id: int, account_ids: list[int]) -> dict[int, int]:
+        counted_account_ids.append(account_ids)
+        return {account_id: states[account_id][0] for account_id in account_ids}
+
+    monkeypatch.setattr(read_state, '_get_unread_count_states', get_states)
+    monkeypatch.setattr(read_state, '_count_unread_tweets_by_account', count)
+    monkeypatch.setattr(read_state, '_unread_count_cache', BoundedCache(100))
+
+    async def scenario() -> None:
+        user = SimpleNamespace(id=1, tweet_state_version=0)
+        assert await count_unread_tweets(user, [2, 1]) == {1: 10, 2: 5}
+        assert await count_unread_tweets(user, [1, 2]) == {1: 10, 2: 5}
+
+        # アカウント 1 への取り込みでは、アカウント 1 だけを数え直す
+        states[1] = (11, None, None, 0, 0)
+        assert await count_unread_tweets(user, [1, 2]) == {1: 11, 2: 5}
+
+    asyncio.run(scenario())
+    assert counted_account_ids == [[1, 2], [1]]
@@ -0,0 +1,21 @@
+from app.utils.share_dedupe import compute_dedupe_key
+
+
+def test_retweets_of_same_original_share_key() -> None:
+    first = compute_dedupe_key('1', '500', True, 'Star', 'famous post')
+    second = compute_dedupe_key('2', '500', True, 'Star', 'famous post')
+    original = compute_dedupe_key('500', None, False, None, 'famous post')
+    assert first == second == original == '500'
+
+
+def test_retweets_without_original_id_use_author_and_content() -> None:
+    first = compute_dedupe_key('1', None, True, 'Bob', 'same text')
+    second = compute_dedupe_key('2', None, True, 'bob', 'same text')
+    other = compute_dedupe_key('3', None, True, 'bob', 'other text')
+    assert first == second
+    assert first != other
+
+
+def test_plain_tweets_are_never_collapsed() -> None:
+    assert compute_dedupe_key('1', None, False, None, 'same') == '1'
+    assert compute_dedupe_key('2', None, False, None, 'same') == '2'
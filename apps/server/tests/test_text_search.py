@@ -0,0 +1,28 @@
+from app.utils.text_search import (
+    build_search_document,
+    extract_bigrams,
+    normalize_search_text,
+    parse_search_query,
+)
+
+
+def test_normalize_search_text_unifies_width_and_case() -> None:
+    assert normalize_search_text('ＥｃｈｏＢｉｒｄ　ｶﾀｶﾅ') == 'echobird カタカナ'
+
+
+def test_extract_bigrams_skips_whitespace() -> None:
+    assert extract_bigrams('東京タワー a') == ['タワ', 'ワー', '京タ', '東京']
+    assert extract_bigrams('あ') == []
+
+
+def test_build_search_document_joins_full_text() -> None:
+    search_text, bigrams = build_search_document('今日は', '今日は晴れ')
+    assert search_text == '今日は\n今日は晴れ'
+    assert '晴れ' in bigrams
+
+    search_text, _ = build_search_document('同じ本文', '同じ本文')
+    assert search_text == '同じ本文'
+
+
+def test_parse_search_query_dedupes_terms() -> None:
+    assert parse_search_query(' Python　パイソン python ') == ['python', 'パイソン']
@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import timelines
+from app.services.membership_cache import TimelineMembership, UserMembership
+from app.utils.auth import get_current_user
+
+
+def test_unread_counts_cover_the_same_accounts_as_the_tweet_list(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    membership = UserMembership(
+        active_target_account_ids=[1],
+        timelines={
+            10: TimelineMembership(
+                timeline=SimpleNamespace(id=10),
+                target_account_ids=[1, 2],
+                active_target_account_ids=[1],
+            )
+        },
+    )
+    counted_account_ids: list[int] = []
+
+    async def get_membership(_user) -> UserMembership:
+        return membership
+
+    async def count(_user, account_ids: list[int]) -> dict[int, int]:
+        counted_account_ids.extend(account_ids)
+        return dict.fromkeys(account_ids, 3)
+
+    monkeypatch.setattr(timelines, 'get_user_membership', get_membership)
+    monkeypatch.setattr(timelines, 'count_unread_tweets', count)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    try:
+        response = TestClient(app).get('/api/v1/timelines/unread-counts')
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    # 一覧 API と同じく、非アクティブなアカウント 2 の未読も数える
+    assert response.status_code == 200
+    assert response.json() == {'timelines': [{'timeline_id': 10, 'unread_count': 6}]}
+    assert sorted(counted_account_ids) == [1, 2]
@@ -0,0 +1,48 @@
+import gzip
+
+from app.services.tweet_archive import (
+    archive_object_key,
+    build_archive_document,
+    read_archive_document,
+    retention_cutoff,
+)
+
+
+def test_retention_cutoff() -> None:
+    assert retention_cutoff(1_000_000, 0) is None
+    assert retention_cutoff(1_000_000, -1) is None
+    assert retention_cutoff(10_000_000, 90) == 10_000_000 - 90 * 86400
+
+
+def test_archive_document_round_trip_groups_media_by_tweet() -> None:
+    tweets = [
+        {'id': 1, 'content': 'こんにちは', 'posted_at': 100, 'hashtags': ['a']},
+        {'id': 2, 'content': 'media', 'posted_at': 200, 'hashtags': None},
+    ]
+    media = [
+        {'id': 10, 'tweet_id': 2, 'media_key': 'k1'},
+        {'id': 11, 'tweet_id': 2, 'media_key': 'k2'},
+    ]
+
+    document = build_archive_document(tweets, media)
+    # 1 行 1 ツイートの NDJSON を gzip 圧縮したもの
+    assert len(gzip.decompress(document).decode().splitlines()) == 2
+
+    restored = read_archive_document(document)
+    assert [tweet['id'] for tweet in restored] == [1, 2]
+    assert restored[0]['content'] == 'こんにちは'
+    assert restored[0]['media'] == []
+    assert [item['media_key'] for item in restored[1]['media']] == ['k1', 'k2']
+
+
+def test_archive_document_is_deterministic() -> None:
+    tweets = [{'id': 1, 'content': 'a', 'posted_at': 100}]
+    assert build_archive_document(tweets, []) == build_archive_document(tweets, [])
+    assert read_archive_document(build_archive_document([], [])) == []
+
+
+def test_archive_object_key_is_unique_per_batch() -> None:
+    key = archive_object_key(3, 100, 200)
+    assert key.startswith('tweets/3/100-200-')
+    assert key.endswith('.ndjson.gz')
+    assert key != archive_object_key(3, 100, 200)
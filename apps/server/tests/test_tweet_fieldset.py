@@ -0,0 +1,40 @@
+import pytest
+from fastapi import HTTPException
+
+from app.routers.tweets import TWEET_RESPONSE_FIELDS, get_tweet_fieldset
+
+
+def test_default_fieldset_includes_everything() -> None:
+    fieldset = get_tweet_fieldset(include=None, fields=None)
+    assert fieldset.is_full
+    assert fieldset.media and fieldset.quoted
+    assert fieldset.is_read and fieldset.is_bookmarked
+
+
+def test_include_drops_unrequested_relations() -> None:
+    fieldset = get_tweet_fieldset(include='quoted', fields=None)
+    assert fieldset.quoted
+    assert not fieldset.media
+    assert not fieldset.is_read
+    assert not fieldset.is_bookmarked
+    assert fieldset.fields == TWEET_RESPONSE_FIELDS - {
+        'media',
+        'is_read',
+        'is_bookmarked',
+    }
+
+
+def test_fields_always_keep_id() -> None:
+    fieldset = get_tweet_fieldset(include=None, fields='content, quoted_tweet')
+    assert fieldset.fields == {'id', 'content', 'quoted_tweet'}
+    assert fieldset.quoted
+    assert not fieldset.media
+
+
+@pytest.mark.parametrize(
+    ('include', 'fields'), [('media,unknown', None), (None, 'content,password')]
+)
+def test_unknown_names_are_rejected(include: str | None, fields: str | None) -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        get_tweet_fieldset(include=include, fields=fields)
+    assert exc_info.value.status_code == 400
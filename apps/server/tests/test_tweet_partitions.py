@@ -0,0 +1,26 @@
+from datetime import date
+
+from app.services.tweet_partitions import (
+    add_months,
+    tweet_partition_bounds,
+    tweet_partition_month,
+    tweet_partition_name,
+)
+
+
+def test_partition_month_uses_utc() -> None:
+    # 2025-06-30 15:00 UTC は日本時間では 7 月だが、パーティションは UTC で区切る
+    assert tweet_partition_month(1751295600) == date(2025, 6, 1)
+    assert tweet_partition_month(1751328000) == date(2025, 7, 1)
+
+
+def test_add_months_across_years() -> None:
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+
+def test_partition_name_and_bounds() -> None:
+    month = date(2025, 12, 1)
+    assert tweet_partition_name(month) == 'tweets_p202512'
+    # 2025-12-01 00:00 UTC 〜 2026-01-01 00:00 UTC
+    assert tweet_partition_bounds(month) == (1764547200, 1767225600)
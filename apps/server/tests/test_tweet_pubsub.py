@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.routers import timelines
+from app.services.membership_cache import TimelineMembership
+from app.services.tweet_pubsub import TweetPubSub
+
+
+def test_publish_reaches_only_subscribed_accounts() -> None:
+    pubsub = TweetPubSub()
+    tweet = object()
+
+    async def scenario() -> None:
+        with pubsub.subscribe([1, 2]) as subscription:
+            pubsub.publish(3, [tweet])
+            pubsub.publish(2, [tweet])
+            notification = await subscription.get(timeout=1)
+            assert notification is not None
+            assert notification.target_account_id == 2
+            assert notification.tweets == [tweet]
+            assert await subscription.get(timeout=0.01) is None
+
+    asyncio.run(scenario())
+    assert pubsub._subscriptions == {}
+
+
+def test_slow_subscriber_overflows_instead_of_growing() -> None:
+    pubsub = TweetPubSub()
+
+    async def scenario() -> None:
+        with pubsub.subscribe([1]) as subscription:
+            for _ in range(subscription._queue.maxsize + 1):
+                pubsub.publish(1, [object()])
+            assert subscription.overflowed
+            assert subscription._queue.empty()
+
+            # 再同期後は通常の配信に戻る
+            subscription.reset_overflow()
+            pubsub.publish(1, [object()])
+            assert await subscription.get(timeout=1) is not None
+
+    asyncio.run(scenario())
+
+
+def test_timeline_stream_follows_membership_changes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pubsub = TweetPubSub()
+    user = SimpleNamespace(id=1, tweet_state_version=0)
+    states: list = []
+
+    def membership(target_account_ids: list[int]) -> TimelineMembership:
+        return TimelineMembership(
+            timeline=SimpleNamespace(id=10),
+            target_account_ids=target_account_ids,
+            active_target_account_ids=target_account_ids,
+        )
+
+    async def reload_stream_state(_user_id: int, _timeline_id: int):
+        return states[-1]
+
+    monkeypatch.setattr(timelines, 'tweet_pubsub', pubsub)
+    monkeypatch.setattr(timelines, 'TWEET_STREAM_KEEPALIVE_SECONDS', 0.01)
+    monkeypatch.setattr(timelines, '_reload_stream_state', reload_stream_state)
+
+    async def scenario() -> None:
+        states.append((user, membership([1])))
+        events = timelines._stream_timeline_events(membership([1]), user, False)
+        assert (await anext(events)).startswith('retry:')
+        assert await anext(events) == ': keepalive\n\n'
+
+        pubsub.publish(1, [SimpleNamespace(id=5, tweet_id='5', posted_at=100)])
+        assert (await anext(events)).startswith('event: tweets\n')
+
+        # アカウント構成が変わった場合は購読し直して再取得を促す
+        states.append((user, membership([1, 2])))
+        assert await anext(events) == 'event: resync\ndata: {}\n\n'
+        assert set(pubsub._subscriptions) == {1, 2}
+
+        # タイムラインが削除された場合はストリームを終了する
+        states.append(None)
+        with pytest.raises(StopAsyncIteration):
+            await anext(events)
+
+    asyncio.run(scenario())
+    assert pubsub._subscriptions == {}
@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+from app.routers.tweets import (
+    TweetFieldset,
+    TweetResponse,
+    _build_tweet_row,
+    get_tweet_fieldset,
+)
+
+
+def _make_tweet(**overrides: object) -> SimpleNamespace:
+    target_account = SimpleNamespace(
+        id=1, username='account', display_name='Account', profile_image_url=None
+    )
+    values = {
+        'id': 10,
+        'tweet_id': '1000',
+        'content': 'hello',
+        'full_text': None,
+        'lang': 'ja',
+        'likes_count': 1,
+        'retweets_count': 2,
+        'replies_count': 3,
+        'quotes_count': 4,
+        'views_count': None,
+        'bookmark_count': 0,
+        'is_retweet': False,
+        'is_quote': False,
+        'is_quoted': False,
+        'retweeted_tweet_id': None,
+        'quoted_tweet_id': None,
+        'is_reply': False,
+        'in_reply_to_tweet_id': None,
+        'in_reply_to_user_id': None,
+        'conversation_id': None,
+        'hashtags': [{'text': 'tag'}],
+        'urls': None,
+        'user_mentions': None,
+        'is_possibly_sensitive': False,
+        'has_media': True,
+        'original_author_username': 'original',
+        'original_author_display_name': None,
+        'original_author_profile_image_url': None,
+        'posted_at': 1718000000,
+        'created_at': 1718000001,
+        'updated_at': 1718000002,
+        'target_account': target_account,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_tweet_row_matches_tweet_response_schema() -> None:
+    media = [
+        {
+            'media_key': 'm1',
+            'media_type': 'photo',
+            'media_url': 'https://example.com/m1.jpg',
+            'width': 100,
+            'height': 200,
+            'alt_text': None,
+            'duration_ms': None,
+        }
+    ]
+    fieldset = TweetFieldset()
+    quoted_row = _build_tweet_row(
+        _make_tweet(id=11, is_quoted=True),
+        media=[],
+        quoted_tweet=None,
+        is_read=True,
+        is_bookmarked=False,
+        fieldset=fieldset,
+        use_original_author=True,
+    )
+    row = _build_tweet_row(
+        _make_tweet(is_quote=True, quoted_tweet_id='1001'),
+        media=media,
+        quoted_tweet=quoted_row,
+        is_read=True,
+        is_bookmarked=False,
+        fieldset=fieldset,
+    )
+
+    # 検証なしで組み立てた dict が、TweetResponse を経由した場合と同じ JSON になること
+    assert TweetResponse.model_validate(row).model_dump(mode='json') == row
+    assert row['quoted_tweet']['target_account_username'] == 'original'
+
+
+def test_tweet_row_contains_only_requested_fields() -> None:
+    fieldset = get_tweet_fieldset(include=None, fields='content,is_read')
+    row = _build_tweet_row(
+        _make_tweet(),
+        media=[],
+        quoted_tweet=None,
+        is_read=False,
+        is_bookmarked=False,
+        fieldset=fieldset,
+    )
+    assert row == {'id': 10, 'content': 'hello', 'is_read': False}
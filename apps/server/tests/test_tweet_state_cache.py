@@ -0,0 +1,79 @@
+import asyncio
+
+from app.services.tweet_state_cache import TweetIdSet, TweetStateCache
+
+
+def _make_cache(
+    data: dict[int, list[int]], max_bytes: int = 1024
+) -> tuple[TweetStateCache, list[int]]:
+    loaded_user_ids: list[int] = []
+
+    async def loader(user_id: int, _kind: str) -> list[int]:
+        loaded_user_ids.append(user_id)
+        return data.get(user_id, [])
+
+    return TweetStateCache(max_bytes=max_bytes, loader=loader), loaded_user_ids
+
+
+def test_tweet_id_set_membership() -> None:
+    tweet_ids = TweetIdSet([5, 1, 3, 3])
+    assert len(tweet_ids) == 3
+    assert 3 in tweet_ids
+    assert 2 not in tweet_ids
+
+    tweet_ids.add_many([2, 4])
+    tweet_ids.discard_many([1, 100])
+    assert [i for i in range(7) if i in tweet_ids] == [2, 3, 4, 5]
+
+
+def test_cache_loads_once_and_writes_through() -> None:
+    cache, loaded_user_ids = _make_cache({1: [10, 20]})
+
+    async def scenario() -> None:
+        assert 10 in await cache.get(1, 'read')
+        cache.mark(1, 'read', [30])
+        cache.unmark(1, 'read', [10])
+        read_ids = await cache.get(1, 'read')
+        assert 30 in read_ids
+        assert 10 not in read_ids
+
+    asyncio.run(scenario())
+    assert loaded_user_ids == [1]
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    # 1 ユーザーあたり 2 件（16 バイト）なので、上限 40 バイトでは 2 ユーザー分まで
+    cache, loaded_user_ids = _make_cache(
+        {1: [1, 2], 2: [3, 4], 3: [5, 6]}, max_bytes=40
+    )
+
+    async def scenario() -> None:
+        await cache.get(1, 'read')
+        await cache.get(2, 'read')
+        await cache.get(1, 'read')
+        await cache.get(3, 'read')  # 最も長く参照されていないユーザー 2 が破棄される
+        await cache.get(1, 'read')
+        await cache.get(2, 'read')
+
+    asyncio.run(scenario())
+    assert loaded_user_ids == [1, 2, 3, 2]
+
+
+def test_cache_skips_store_when_written_during_load() -> None:
+    cache = TweetStateCache()
+    loaded_user_ids: list[int] = []
+
+    async def loader(user_id: int, kind: str) -> list[int]:
+        loaded_user_ids.append(user_id)
+        # 読み込み中に既読化が行われたケース
+        cache.mark(user_id, kind, [99])
+        return [1]
+
+    cache._loader = loader
+
+    async def scenario() -> None:
+        await cache.get(1, 'read')
+        await cache.get(1, 'read')
+
+    asyncio.run(scenario())
+    assert loaded_user_ids == [1, 1]
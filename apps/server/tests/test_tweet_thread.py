@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+from app.routers.tweets import order_thread_tweets
+
+
+def _tweet(id: int, tweet_id: str, parent: str | None, posted_at: int):
+    return SimpleNamespace(
+        id=id, tweet_id=tweet_id, in_reply_to_tweet_id=parent, posted_at=posted_at
+    )
+
+
+def test_orders_replies_depth_first_by_posted_at() -> None:
+    root = _tweet(1, 'r', None, 100)
+    late_reply = _tweet(2, 'b', 'r', 300)
+    early_reply = _tweet(3, 'a', 'r', 200)
+    nested = _tweet(4, 'a1', 'a', 400)
+    ordered = order_thread_tweets([nested, late_reply, root, early_reply])
+    assert [(tweet.tweet_id, depth) for tweet, depth in ordered] == [
+        ('r', 0),
+        ('a', 1),
+        ('a1', 2),
+        ('b', 1),
+    ]
+
+
+def test_tweets_with_missing_parent_become_roots() -> None:
+    orphan = _tweet(1, 'x', 'not-stored', 200)
+    root = _tweet(2, 'r', None, 100)
+    ordered = order_thread_tweets([orphan, root])
+    assert [(tweet.tweet_id, depth) for tweet, depth in ordered] == [
+        ('r', 0),
+        ('x', 0),
+    ]
+
+
+def test_tweets_on_a_reply_cycle_are_not_dropped() -> None:
+    root = _tweet(1, 'r', None, 100)
+    cycle_a = _tweet(2, 'a', 'b', 300)
+    cycle_b = _tweet(3, 'b', 'a', 200)
+    ordered = order_thread_tweets([cycle_a, root, cycle_b])
+    assert [(tweet.tweet_id, depth) for tweet, depth in ordered] == [
+        ('r', 0),
+        ('b', 0),
+        ('a', 0),
+    ]